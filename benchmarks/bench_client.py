@@ -0,0 +1,397 @@
+"""
+Offline benchmarks for LeakRadarClient.
+
+Runs the client against an in-process httpx.MockTransport serving pre-encoded
+fixture payloads (1,000-item leak pages, large raw search pages, a binary export),
+so results reflect client-side cost only: request building, filter normalisation,
+JSON encoding/decoding, pagination scheduling and download plumbing.
+
+Each benchmark is timed (best of --repeat runs) and then run once more under
+tracemalloc to record its Python memory high-water mark.
+
+Usage:
+    python benchmarks/bench_client.py
+    python benchmarks/bench_client.py --quick --only decode,paginate
+    python benchmarks/bench_client.py --save baseline.json
+    python benchmarks/bench_client.py --compare baseline.json --tolerance 0.15
+
+With --compare the script exits with status 1 when a metric is worse than the
+baseline by more than the tolerance (throughput lower, time or memory higher).
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from leakradar import LeakRadarClient, __version__  # noqa: E402
+from leakradar.codecs import get_codec  # noqa: E402
+
+TLDS = ("com", "net", "org", "io", "de", "fr", "co.uk")
+SCHEMES = ("https", "http", "android")
+PORTS = (443, 80, 8080, 8443)
+
+
+def make_leak(i: int) -> Dict[str, Any]:
+    domain = f"corp{i % 997}.{TLDS[i % len(TLDS)]}"
+    host = f"login.{domain}"
+    email_domain = f"mail{i % 211}.{TLDS[(i // 7) % len(TLDS)]}"
+    return {
+        "id": f"{i:032x}",
+        "url": f"{SCHEMES[i % 3]}://{host}/auth/session?next=/account/{i % 50}",
+        "url_scheme": SCHEMES[i % 3],
+        "url_host": host,
+        "url_domain": domain,
+        "url_tld": TLDS[i % len(TLDS)],
+        "url_port": PORTS[i % len(PORTS)],
+        "username": f"user{i}@{email_domain}",
+        "password": "p" + "*" * (6 + i % 8) + str(i % 10),
+        "password_strength": ("weak", "medium", "strong")[i % 3],
+        "is_email": True,
+        "email_domain": email_domain,
+        "email_host": email_domain,
+        "email_tld": TLDS[(i // 7) % len(TLDS)],
+        "added_at": f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}T{i % 24:02d}:{i % 60:02d}:00Z",
+        "unlocked": bool(i % 2),
+    }
+
+
+def make_raw_hit(i: int) -> Dict[str, Any]:
+    line = f"user{i}@example{i % 313}.com:hunter{i % 97}:https://app{i % 31}.example.org/login\n"
+    return {
+        "container_id": 1000 + i % 17,
+        "entry_path": f"dumps/{i % 40}/combolist_{i % 400}.txt",
+        "file_name": f"combolist_{i % 400}.txt",
+        "ext": "txt",
+        "category": "combolist",
+        "offset": i * 4096,
+        "snippet": line * 24,
+    }
+
+
+class Fixtures:
+    """Pre-encoded response bodies, so the mock server costs as little as possible."""
+
+    def __init__(self, page_size: int, pages: int, raw_hits: int, export_mib: int):
+        self.page_size = page_size
+        self.pages = pages
+        self.total = page_size * pages
+        self.leak_pages: Dict[int, bytes] = {}
+        leaks = [make_leak(i) for i in range(page_size)]
+        for page in range(1, pages + 1):
+            body = {"items": leaks, "total": self.total, "page": page, "page_size": page_size}
+            self.leak_pages[page] = json.dumps(body).encode()
+        self.small = json.dumps({"items": [make_leak(0)], "total": 1, "page": 1, "page_size": 100}).encode()
+        self.stats = json.dumps({"leaks": 123456789, "domains": 987654, "updated_at": "2025-01-01T00:00:00Z"}).encode()
+        self.raw = json.dumps({"items": [make_raw_hit(i) for i in range(raw_hits)], "total": raw_hits}).encode()
+        block = bytes(range(256)) * 4096
+        self.export = block * (export_mib * 1024 * 1024 // len(block))
+
+
+def make_transport(fx: Fixtures, latency: float) -> httpx.MockTransport:
+    json_headers = {"content-type": "application/json"}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if latency:
+            await asyncio.sleep(latency)
+        path = request.url.path
+        if path == "/stats":
+            return httpx.Response(200, content=fx.stats, headers=json_headers)
+        if path == "/search/advanced":
+            page = int(request.url.params.get("page", "1"))
+            size = int(request.url.params.get("page_size", "100"))
+            body = fx.leak_pages.get(page, b'{"items":[],"total":0}') if size == fx.page_size else fx.small
+            return httpx.Response(200, content=body, headers=json_headers)
+        if path == "/search/raw":
+            return httpx.Response(200, content=fx.raw, headers=json_headers)
+        if path == "/exports/file.zip":
+            return httpx.Response(200, content=fx.export, headers={"content-type": "application/zip"})
+        return httpx.Response(404, content=b'{"detail":"not found"}', headers=json_headers)
+
+    return httpx.MockTransport(handler)
+
+
+Benchmark = Callable[[LeakRadarClient, Fixtures, argparse.Namespace], Awaitable[Dict[str, float]]]
+BENCHMARKS: Dict[str, Benchmark] = {}
+MIN_LATENCY_MS: Dict[str, float] = {}
+
+
+def benchmark(name: str, min_latency_ms: float = 0.0) -> Callable[[Benchmark], Benchmark]:
+    """Register a benchmark; ``min_latency_ms`` floors the simulated latency for it."""
+
+    def register(func: Benchmark) -> Benchmark:
+        BENCHMARKS[name] = func
+        MIN_LATENCY_MS[name] = min_latency_ms
+        return func
+
+    return register
+
+
+async def _bounded(count: int, concurrency: int, call: Callable[[], Awaitable[Any]]) -> None:
+    remaining = count
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await call()
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+@benchmark("request_overhead")
+async def bench_request_overhead(client: LeakRadarClient, fx: Fixtures, args: argparse.Namespace) -> Dict[str, float]:
+    """Small GETs through the full _request pipeline."""
+    count = args.requests
+    started = time.perf_counter()
+    await _bounded(count, args.concurrency, client.get_stats)
+    elapsed = time.perf_counter() - started
+    return {"requests_per_s": count / elapsed, "wall_s": elapsed}
+
+
+@benchmark("filter_build")
+async def bench_filter_build(client: LeakRadarClient, fx: Fixtures, args: argparse.Namespace) -> Dict[str, float]:
+    """search_advanced with many filters: _clean, _normalize_leak_filters and body encoding."""
+    filters = {
+        "username": [f"user{i}@example.com" for i in range(20)],
+        "url_domain": [f"corp{i}.com" for i in range(20)],
+        "url_scheme": "https",
+        "url_port": [443, 8443],
+        "url_tld_not": "ru",
+        "email_domain": "example.com",
+        "email_tld": ["com", "net"],
+        "password_strength": "weak",
+        "added_from": "2024-01-01",
+        "force_and": True,
+    }
+
+    async def call() -> Any:
+        return await client.search_advanced(page_size=100, **filters)
+
+    count = args.requests
+    started = time.perf_counter()
+    await _bounded(count, args.concurrency, call)
+    elapsed = time.perf_counter() - started
+    return {"requests_per_s": count / elapsed, "wall_s": elapsed}
+
+
+@benchmark("decode")
+async def bench_decode(client: LeakRadarClient, fx: Fixtures, args: argparse.Namespace) -> Dict[str, float]:
+    """Decode full 1,000-item leak pages."""
+    pages = args.decode_pages
+    body_bytes = len(fx.leak_pages[1])
+    started = time.perf_counter()
+    for page in range(pages):
+        result = await client.search_advanced(page=1 + page % fx.pages, page_size=fx.page_size, url_domain="corp1.com")
+        assert len(result["items"]) == fx.page_size
+    elapsed = time.perf_counter() - started
+    return {
+        "items_per_s": pages * fx.page_size / elapsed,
+        "mib_per_s": pages * body_bytes / elapsed / 2 ** 20,
+        "wall_s": elapsed,
+    }
+
+
+@benchmark("paginate", min_latency_ms=5.0)
+async def bench_paginate(client: LeakRadarClient, fx: Fixtures, args: argparse.Namespace) -> Dict[str, float]:
+    """Walk every page with iter_search_advanced: no read-ahead, prefetch and concurrent fan-out.
+
+    Runs with at least 5 ms simulated latency, since overlap is what read-ahead buys.
+    """
+    results: Dict[str, float] = {}
+    for label, options in (
+        ("sequential", {"prefetch": 0}),
+        ("prefetch", {"prefetch": 2}),
+        ("fan_out", {"concurrency": 4}),
+    ):
+        started = time.perf_counter()
+        count = 0
+        async for _ in client.iter_search_advanced(page_size=fx.page_size, url_domain="corp1.com", **options):
+            count += 1
+        assert count == fx.total, count
+        results[f"{label}_wall_s"] = time.perf_counter() - started
+    return results
+
+
+@benchmark("raw_search")
+async def bench_raw_search(client: LeakRadarClient, fx: Fixtures, args: argparse.Namespace) -> Dict[str, float]:
+    """One large raw_search page, buffered and then streamed item by item."""
+    started = time.perf_counter()
+    result = await client.raw_search(q="hunter", page_size=len(fx.raw))
+    buffered = time.perf_counter() - started
+    count = len(result["items"])
+    del result
+
+    started = time.perf_counter()
+    streamed_count = 0
+    async for _ in client.stream_raw_search(q="hunter"):
+        streamed_count += 1
+    streamed = time.perf_counter() - started
+    assert streamed_count == count
+    return {
+        "buffered_items_per_s": count / buffered,
+        "streamed_items_per_s": count / streamed,
+        "mib_per_s": len(fx.raw) / buffered / 2 ** 20,
+    }
+
+
+@benchmark("export_download")
+async def bench_export_download(client: LeakRadarClient, fx: Fixtures, args: argparse.Namespace) -> Dict[str, float]:
+    """Binary export: buffered through _request, then streamed to a temporary file."""
+    size = len(fx.export)
+    started = time.perf_counter()
+    body = await client._request("GET", "/exports/file.zip")
+    buffered = time.perf_counter() - started
+    assert len(body) == size
+    del body
+
+    with tempfile.TemporaryDirectory() as tmp:
+        started = time.perf_counter()
+        result = await client.download_export_to("/exports/file.zip", os.path.join(tmp, "export.zip"))
+        streamed = time.perf_counter() - started
+    assert result["bytes"] == size
+    return {"buffered_mib_per_s": size / buffered / 2 ** 20, "streamed_mib_per_s": size / streamed / 2 ** 20}
+
+
+def make_client(fx: Fixtures, args: argparse.Namespace, latency_ms: float = 0.0) -> LeakRadarClient:
+    return LeakRadarClient(
+        token="benchmark",
+        transport=make_transport(fx, latency_ms / 1000.0),
+        json_codec=args.codec,
+        coalesce=False,
+        limits=httpx.Limits(max_connections=args.concurrency),
+    )
+
+
+async def run_one(name: str, fx: Fixtures, args: argparse.Namespace) -> Dict[str, float]:
+    func = BENCHMARKS[name]
+    latency_ms = max(args.latency, MIN_LATENCY_MS[name])
+    best: Optional[Dict[str, float]] = None
+    for _ in range(args.repeat):
+        gc.collect()
+        async with make_client(fx, args, latency_ms) as client:
+            metrics = await func(client, fx, args)
+        if best is None:
+            best = metrics
+        else:
+            best = {key: _better(key, best[key], value) for key, value in metrics.items()}
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        async with make_client(fx, args, latency_ms) as client:
+            await func(client, fx, args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert best is not None
+    best["peak_kib"] = peak / 1024
+    return best
+
+
+def _higher_is_better(metric: str) -> bool:
+    return metric.endswith("_per_s")
+
+
+def _better(metric: str, a: float, b: float) -> float:
+    return max(a, b) if _higher_is_better(metric) else min(a, b)
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float) -> List[str]:
+    """Return one line per metric that regressed beyond ``tolerance`` (a fraction)."""
+    regressions = []
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            base = baseline.get(name, {}).get(metric)
+            if not base:
+                continue
+            change = (value - base) / base
+            worse = -change if _higher_is_better(metric) else change
+            if worse > tolerance:
+                regressions.append(f"{name}.{metric}: {base:.4g} -> {value:.4g} ({change:+.1%})")
+    return regressions
+
+
+def print_table(results: Dict[str, Dict[str, float]], baseline: Optional[Dict[str, Dict[str, float]]]) -> None:
+    for name, metrics in results.items():
+        print(name)
+        for metric, value in metrics.items():
+            line = f"  {metric:<24} {value:>14.2f}"
+            base = (baseline or {}).get(name, {}).get(metric)
+            if base:
+                line += f"   (baseline {base:.2f}, {(value - base) / base:+.1%})"
+            print(line)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--only", help="Comma-separated benchmark names: " + ", ".join(BENCHMARKS))
+    parser.add_argument("--quick", action="store_true", help="Smaller workloads for a fast smoke run.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark (best is kept).")
+    parser.add_argument("--codec", default=None, help="JSON codec: orjson, msgspec, ujson or json (default: fastest).")
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated server latency per request, in ms.")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent requests in throughput benchmarks.")
+    parser.add_argument("--save", metavar="FILE", help="Write results as JSON.")
+    parser.add_argument("--compare", metavar="FILE", help="Compare against results saved with --save.")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed regression as a fraction (default 0.15).")
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.requests, args.decode_pages, args.pages, args.raw_hits, args.export_mib = 300, 5, 4, 1000, 4
+    else:
+        args.requests, args.decode_pages, args.pages, args.raw_hits, args.export_mib = 3000, 30, 20, 10000, 64
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    names = [n.strip() for n in args.only.split(",")] if args.only else list(BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        print(f"Unknown benchmark(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    fx = Fixtures(page_size=1000, pages=args.pages, raw_hits=args.raw_hits, export_mib=args.export_mib)
+    results = {name: asyncio.run(run_one(name, fx, args)) for name in names}
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            baseline = json.load(fh)["results"]
+    print_table(results, baseline)
+
+    if args.save:
+        meta = {
+            "leakradar": __version__,
+            "python": platform.python_version(),
+            "httpx": httpx.__version__,
+            "codec": get_codec(args.codec).name,
+            "quick": args.quick,
+            "latency_ms": args.latency,
+        }
+        with open(args.save, "w", encoding="utf-8") as fh:
+            json.dump({"meta": meta, "results": results}, fh, indent=2, sort_keys=True)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\nRegressions beyond {args.tolerance:.0%}:")
+            for line in regressions:
+                print("  " + line)
+            return 1
+        print(f"\nNo regressions beyond {args.tolerance:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
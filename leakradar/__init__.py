@@ -12,9 +12,26 @@ from .client import (
     ConflictError,
     PaymentRequiredError,
 )
+from .cache import MemoryCache, ResponseCache, SQLiteCache
+from .codecs import JSONCodec
+from .columnar import ColumnBatch, ColumnarBuilder
+from .errors import ChecksumMismatchError, GoneError, PasswordRangeTruncatedError
+from .exports import ExportJob, ExportPipeline
+from .local_index import UnlockedIndex
+from .metrics import HistogramAggregator, OpenTelemetryHooks, PrometheusHooks, RequestEvent, RequestHooks
+from .models import DomainRow, ExportEntry, Leak, RawHit, Record
+from .passwords import PasswordChecker
+from .ratelimit import RateLimiter, TokenBucket
+from .retry import RetryPolicy
+from .runs import NotificationRunSync, RunCheckpoint, RunSyncReport
+from .sweep import DomainSweep, SweepReport, SweepResult, SweepSnapshot
+from .sync import LeakRadarSyncClient
+from .tasks import TaskTimeoutError, TaskWaiter
+from .unlock import BulkUnlocker, UnlockJournal, UnlockReport
 
 __all__ = [
     "LeakRadarClient",
+    "LeakRadarSyncClient",
     "LeakRadarAPIError",
     "UnauthorizedError",
     "ForbiddenError",
@@ -24,6 +41,44 @@ __all__ = [
     "ValidationError",
     "ConflictError",
     "PaymentRequiredError",
+    "GoneError",
+    "ChecksumMismatchError",
+    "PasswordRangeTruncatedError",
+    "BulkUnlocker",
+    "ColumnBatch",
+    "ColumnarBuilder",
+    "DomainRow",
+    "DomainSweep",
+    "ExportEntry",
+    "ExportJob",
+    "ExportPipeline",
+    "HistogramAggregator",
+    "JSONCodec",
+    "Leak",
+    "MemoryCache",
+    "NotificationRunSync",
+    "OpenTelemetryHooks",
+    "PasswordChecker",
+    "PrometheusHooks",
+    "RateLimiter",
+    "RawHit",
+    "Record",
+    "RequestEvent",
+    "RequestHooks",
+    "ResponseCache",
+    "SQLiteCache",
+    "RetryPolicy",
+    "RunCheckpoint",
+    "RunSyncReport",
+    "SweepReport",
+    "SweepResult",
+    "SweepSnapshot",
+    "TaskTimeoutError",
+    "TaskWaiter",
+    "TokenBucket",
+    "UnlockedIndex",
+    "UnlockJournal",
+    "UnlockReport",
     "__version__",
 ]
 
@@ -0,0 +1,51 @@
+"""Bounded-concurrency helpers shared by the bulk helpers."""
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+async def map_unordered(
+    func: Callable[[T], Awaitable[Any]],
+    items: Iterable[T],
+    concurrency: int,
+    return_exceptions: bool = False,
+) -> AsyncIterator[Tuple[T, Any]]:
+    """
+    Run ``func(item)`` for every item with at most ``concurrency`` calls in flight.
+
+    Yields ``(item, result)`` pairs in completion order. ``items`` is consumed lazily, so
+    it may be a large generator. With ``return_exceptions`` a failing call yields its
+    exception as the result instead of aborting the iteration.
+    """
+    iterator = iter(items)
+    pending: Dict["asyncio.Future[Any]", T] = {}
+
+    def top_up() -> None:
+        while len(pending) < max(1, concurrency):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            pending[asyncio.ensure_future(func(item))] = item
+
+    try:
+        top_up()
+        while pending:
+            done, _ = await asyncio.wait(list(pending), return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                item = pending.pop(task)
+                try:
+                    result = task.result()
+                except Exception as exc:
+                    if not return_exceptions:
+                        raise
+                    result = exc
+                yield item, result
+            top_up()
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
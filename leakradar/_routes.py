@@ -0,0 +1,122 @@
+"""Endpoint metadata shared by the request pipeline."""
+
+import functools
+import re
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# POST endpoints that only read data (filters travel in the body) and are safe to replay.
+READ_ONLY_POSTS = frozenset(
+    {
+        "/search/advanced",
+        "/search/email",
+        "/search/raw",
+        "/search/raw/export/preview",
+        "/search/domains/locked-exists",
+        "/search/emails/locked-exists",
+        "/container/tree/resolve_path",
+    }
+)
+
+
+def is_read_only(method: str, endpoint: str) -> bool:
+    """Return True when a request has no side effects on the server."""
+    method = method.upper()
+    if method in SAFE_METHODS:
+        return True
+    return method == "POST" and endpoint.split("?", 1)[0] in READ_ONLY_POSTS
+
+
+# Templated API paths, used to label per-endpoint metrics without unbounded cardinality.
+ROUTE_TEMPLATES = (
+    "/container/file_info",
+    "/container/subfolders",
+    "/container/tree",
+    "/container/tree/resolve_path",
+    "/exports",
+    "/notification_methods",
+    "/notification_methods/test",
+    "/notification_methods/{method_id}",
+    "/notification_methods/{method_id}/test-with-data",
+    "/notification_runs",
+    "/notification_runs/{run_id}/export",
+    "/notification_runs/{run_id}/leaks",
+    "/notification_runs/{run_id}/leaks/unlock",
+    "/notifications",
+    "/notifications/bulk",
+    "/notifications/stats",
+    "/notifications/{notification_id}",
+    "/notifications/{notification_id}/active",
+    "/password-range",
+    "/profile",
+    "/profile/raw/downloads",
+    "/profile/raw/downloads/{download_id}/file",
+    "/profile/team",
+    "/profile/team/invitations",
+    "/profile/team/invitations/{invitation_id}/resend",
+    "/profile/team/invitations/{invitation_id}/revoke",
+    "/profile/team/members/{member_id}",
+    "/profile/unlocked",
+    "/profile/unlocked/advanced",
+    "/profile/unlocked/advanced/export",
+    "/profile/unlocked/export",
+    "/profile/unlocked/list-tasks/{task_id}",
+    "/profile/unlocked/lists",
+    "/profile/unlocked/lists/bulk-assign",
+    "/profile/unlocked/lists/{list_id}",
+    "/profile/unlocked/lists/{list_id}/clear",
+    "/profile/unlocked/{leak_id}/comment",
+    "/profile/unlocked/{leak_id}/list",
+    "/raw/download",
+    "/raw/download/preview",
+    "/raw/files",
+    "/search/advanced",
+    "/search/advanced/export",
+    "/search/advanced/export_urls",
+    "/search/advanced/unlock",
+    "/search/advanced/unlock/task",
+    "/search/domain/{domain}",
+    "/search/domain/{domain}/customers",
+    "/search/domain/{domain}/employees",
+    "/search/domain/{domain}/report/pdf",
+    "/search/domain/{domain}/subdomains",
+    "/search/domain/{domain}/subdomains/export",
+    "/search/domain/{domain}/third_parties",
+    "/search/domain/{domain}/urls",
+    "/search/domain/{domain}/urls/export",
+    "/search/domain/{domain}/{leak_type}/export",
+    "/search/domain/{domain}/{leak_type}/unlock",
+    "/search/domain/{domain}/{leak_type}/unlock/task",
+    "/search/domains/locked-exists",
+    "/search/email",
+    "/search/email/export",
+    "/search/email/unlock",
+    "/search/email/unlock/task",
+    "/search/emails/locked-exists",
+    "/search/raw",
+    "/search/raw/export",
+    "/search/raw/export/preview",
+    "/search/raw/part",
+    "/search/raw/parts",
+    "/stats",
+    "/tasks/{task_id}",
+    "/unlock",
+)
+
+_PARAM = re.compile(r"\{[^/]+\}")
+
+# Templates with fewer placeholders win, so "/notifications/stats" beats "/notifications/{notification_id}".
+_COMPILED = sorted(
+    ((re.compile("^" + _PARAM.sub("[^/]+", re.escape(t).replace(r"\{", "{").replace(r"\}", "}")) + "$"), t) for t in ROUTE_TEMPLATES),
+    key=lambda pair: pair[1].count("{"),
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def route_template(path: str) -> str:
+    """Map a concrete API path to its template, e.g. /search/domain/a.com/employees -> /search/domain/{domain}/employees."""
+    path = path.split("?", 1)[0]
+    for pattern, template in _COMPILED:
+        if pattern.match(path):
+            return template
+    return path
@@ -0,0 +1,70 @@
+"""Input normalisation, chunking and result merging for bulk helpers."""
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+def normalize_domain(domain: str) -> str:
+    """Lower-case, strip whitespace and the trailing dot, and IDNA-encode a domain."""
+    domain = domain.strip().lower().rstrip(".")
+    try:
+        return domain.encode("idna").decode("ascii")
+    except UnicodeError:
+        return domain
+
+
+def normalize_email(email: str) -> str:
+    """Lower-case and strip an email address."""
+    return email.strip().lower()
+
+
+def unique(values: Iterable[str], normalize: Optional[Callable[[str], str]] = None) -> Iterator[str]:
+    """Yield normalised, non-empty values once each, in first-seen order."""
+    seen = set()
+    for value in values:
+        if normalize is not None:
+            value = normalize(value)
+        if value and value not in seen:
+            seen.add(value)
+            yield value
+
+
+def chunked(values: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Split an iterable into lists of at most ``size`` items, lazily."""
+    chunk: List[T] = []
+    for value in values:
+        chunk.append(value)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def exists_results(response: Any, key_field: str, requested: Sequence[str]) -> Dict[str, Any]:
+    """
+    Index a locked-exists response by input value.
+
+    Accepts a mapping keyed by input (top level or under ``results``/``items``/``<key_field>s``)
+    or a list of records carrying ``key_field``.
+    """
+    wanted = set(requested)
+    container: Any = response
+    if isinstance(response, dict):
+        for key in ("results", "items", key_field + "s", "data"):
+            if isinstance(response.get(key), (dict, list)):
+                container = response[key]
+                break
+    if isinstance(container, dict):
+        return {str(k).lower(): v for k, v in container.items() if str(k).lower() in wanted}
+    if isinstance(container, list):
+        indexed: Dict[str, Any] = {}
+        for record in container:
+            if isinstance(record, dict) and record.get(key_field) is not None:
+                indexed[str(record[key_field]).lower()] = record
+        return indexed
+    return {}
+
+
+__all__ = ["chunked", "exists_results", "normalize_domain", "normalize_email", "unique"]
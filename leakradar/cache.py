@@ -0,0 +1,410 @@
+"""Opt-in response caching with per-endpoint TTLs and HTTP revalidation."""
+
+import abc
+import asyncio
+import fnmatch
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import httpx
+
+# Response headers kept with a cached body.
+_KEPT_HEADERS = ("content-type", "etag", "last-modified")
+
+
+async def _in_thread(func: Callable[..., Any], *args: Any) -> Any:
+    return await asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args))
+
+
+class CacheEntry:
+    """A cached response body plus the metadata needed to serve and revalidate it."""
+
+    __slots__ = ("path", "status_code", "headers", "content", "expires_at")
+
+    def __init__(self, path: str, status_code: int, headers: Dict[str, str], content: bytes, expires_at: float):
+        self.path = path
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.expires_at = expires_at
+
+    @classmethod
+    def from_response(cls, path: str, response: httpx.Response, ttl: float) -> "CacheEntry":
+        headers = {name: response.headers[name] for name in _KEPT_HEADERS if name in response.headers}
+        return cls(path, response.status_code, headers, response.content, time.time() + ttl)
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get("etag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get("last-modified")
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this entry."""
+        headers: Dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_response(self) -> httpx.Response:
+        return httpx.Response(self.status_code, headers=self.headers, content=self.content)
+
+
+class ResponseCache(abc.ABC):
+    """
+    Caching policy shared by all cache backends.
+
+    Read-only requests whose path matches a pattern in ``ttls`` (first match wins) are
+    cached for that many seconds; other paths fall back to ``default_ttl`` (None: not
+    cached). A successful mutating request invalidates every entry matched by the
+    patterns of each rule in ``invalidations`` that matches its path, or, when no rule
+    matches, everything under the same top-level path segment.
+
+    Subclasses implement storage: ``get``, ``set``, ``invalidate`` and ``clear``. The
+    client calls the ``aget`` / ``aset`` / ``ainvalidate`` variants, which run the
+    storage methods inline; backends doing blocking I/O override them.
+
+    :param ttls: Mapping of path glob pattern to TTL seconds (defaults to DEFAULT_TTLS).
+    :param default_ttl: TTL for read-only paths matching no pattern.
+    :param invalidations: Sequence of (mutation path pattern, cached path patterns to drop).
+    """
+
+    DEFAULT_TTLS: Dict[str, float] = {
+        "/stats": 300,
+        "/profile": 60,
+        "/profile/unlocked/lists": 60,
+        "/profile/team": 60,
+        "/search/domain/*": 300,
+        "/container/*": 600,
+        "/raw/files": 300,
+        "/notification_methods": 300,
+        "/notifications": 60,
+        "/password-range": 3600,
+    }
+
+    DEFAULT_INVALIDATIONS: Sequence[Tuple[str, Sequence[str]]] = (
+        ("/profile*", ("/profile*",)),
+        ("/unlock", ("/profile*", "/search/*")),
+        ("/search/*/unlock*", ("/profile*", "/search/*")),
+        ("/notification_runs/*/unlock", ("/profile*", "/search/*", "/notification_runs*")),
+        ("*/export*", ("/exports*", "/profile")),
+        ("/raw/download*", ("/raw*", "/profile*")),
+    )
+
+    def __init__(
+        self,
+        ttls: Optional[Mapping[str, float]] = None,
+        default_ttl: Optional[float] = None,
+        invalidations: Optional[Sequence[Tuple[str, Sequence[str]]]] = None,
+    ):
+        self.ttls = dict(self.DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.invalidations = list(self.DEFAULT_INVALIDATIONS if invalidations is None else invalidations)
+
+    # Policy
+
+    def ttl_for(self, path: str) -> Optional[float]:
+        """Seconds a response for ``path`` stays fresh, or None if it is not cached."""
+        for pattern, ttl in self.ttls.items():
+            if fnmatch.fnmatchcase(path, pattern):
+                return ttl
+        return self.default_ttl
+
+    def invalidated_by(self, path: str) -> List[str]:
+        """Patterns of cached paths made stale by a successful mutation of ``path``."""
+        patterns: List[str] = []
+        for rule, targets in self.invalidations:
+            if fnmatch.fnmatchcase(path, rule):
+                patterns.extend(t for t in targets if t not in patterns)
+        if not patterns:
+            segment = path.strip("/").split("/", 1)[0]
+            patterns.append(f"/{segment}*")
+        return patterns
+
+    @staticmethod
+    def make_key(
+        method: str,
+        path: str,
+        params: Optional[Mapping[str, Any]],
+        body: Optional[bytes],
+        headers: Mapping[str, str],
+    ) -> str:
+        """Stable key over method, path, canonical params, body and representation-relevant headers."""
+        h = hashlib.sha256()
+        h.update(method.upper().encode())
+        h.update(b"\0" + path.encode("utf-8"))
+        for name, value in sorted((params or {}).items()):
+            h.update(b"\0" + f"{name}={value!r}".encode("utf-8"))
+        h.update(b"\0" + (body or b""))
+        for name in ("authorization", "accept"):
+            value = next((v for k, v in headers.items() if k.lower() == name), "")
+            h.update(b"\0" + value.encode("utf-8"))
+        return h.hexdigest()
+
+    # Storage
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry stored under ``key`` (fresh or revalidatable), or None."""
+
+    @abc.abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Store ``entry`` under ``key``, evicting as needed."""
+
+    @abc.abstractmethod
+    def invalidate(self, patterns: Iterable[str]) -> None:
+        """Drop every entry whose path matches one of ``patterns``."""
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Drop every entry."""
+
+    async def aget(self, key: str) -> Optional[CacheEntry]:
+        return self.get(key)
+
+    async def aset(self, key: str, entry: CacheEntry) -> None:
+        self.set(key, entry)
+
+    async def ainvalidate(self, patterns: Iterable[str]) -> None:
+        self.invalidate(patterns)
+
+
+class MemoryCache(ResponseCache):
+    """
+    In-process LRU response cache.
+
+    Expired entries that carry an ETag or Last-Modified are kept (until evicted) so they
+    can be revalidated with a conditional request instead of refetched.
+
+    :param max_entries: Maximum number of cached responses.
+    :param max_bytes: Maximum total size of cached bodies.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttls: Optional[Mapping[str, float]] = None,
+        default_ttl: Optional[float] = None,
+        invalidations: Optional[Sequence[Tuple[str, Sequence[str]]]] = None,
+    ):
+        super().__init__(ttls=ttls, default_ttl=default_ttl, invalidations=invalidations)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if not entry.fresh and not entry.validators():
+                self._pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                self._pop(next(iter(self._entries)))
+
+    def invalidate(self, patterns: Iterable[str]) -> None:
+        patterns = list(patterns)
+        with self._lock:
+            stale = [k for k, e in self._entries.items() if any(fnmatch.fnmatchcase(e.path, p) for p in patterns)]
+            for key in stale:
+                self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+class SQLiteCache(ResponseCache):
+    """
+    On-disk response cache in a SQLite database, shareable by several processes.
+
+    The database runs in WAL mode so readers never block the single writer, and each
+    process (and thread) opens its own connection. The client's lookups and writes run
+    in the default executor so disk I/O and lock waits never stall the event loop. Entries are evicted least recently
+    used first once ``max_entries`` or ``max_bytes`` is exceeded.
+
+    :param path: Database file; created if missing.
+    :param max_entries: Maximum number of cached responses.
+    :param max_bytes: Maximum total size of cached bodies.
+    :param busy_timeout: Seconds to wait for a lock held by another process.
+    """
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS responses ("
+        " key TEXT PRIMARY KEY,"
+        " path TEXT NOT NULL,"
+        " status INTEGER NOT NULL,"
+        " headers TEXT NOT NULL,"
+        " content BLOB NOT NULL,"
+        " size INTEGER NOT NULL,"
+        " revalidatable INTEGER NOT NULL,"
+        " expires_at REAL NOT NULL,"
+        " accessed_at REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed_at)",
+        # Running totals kept by triggers so size checks stay O(1).
+        "CREATE TABLE IF NOT EXISTS totals (id INTEGER PRIMARY KEY CHECK (id = 0), entries INTEGER NOT NULL, bytes INTEGER NOT NULL)",
+        "INSERT OR IGNORE INTO totals VALUES (0, 0, 0)",
+        "CREATE TRIGGER IF NOT EXISTS responses_added AFTER INSERT ON responses BEGIN"
+        " UPDATE totals SET entries = entries + 1, bytes = bytes + NEW.size WHERE id = 0; END",
+        "CREATE TRIGGER IF NOT EXISTS responses_removed AFTER DELETE ON responses BEGIN"
+        " UPDATE totals SET entries = entries - 1, bytes = bytes - OLD.size WHERE id = 0; END",
+    )
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 100_000,
+        max_bytes: int = 512 * 1024 * 1024,
+        busy_timeout: float = 10.0,
+        ttls: Optional[Mapping[str, float]] = None,
+        default_ttl: Optional[float] = None,
+        invalidations: Optional[Sequence[Tuple[str, Sequence[str]]]] = None,
+    ):
+        super().__init__(ttls=ttls, default_ttl=default_ttl, invalidations=invalidations)
+        self.path = os.fspath(path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        conn = self._connect()
+        for statement in self._SCHEMA:
+            conn.execute(statement)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, reopening it after a fork."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT path, status, headers, content, expires_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        entry = CacheEntry(row[0], row[1], json.loads(row[2]), bytes(row[3]), row[4])
+        if not entry.fresh and not entry.validators():
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            return None
+        conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        if entry.size > self.max_bytes:
+            return
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # DELETE + INSERT rather than INSERT OR REPLACE so the totals triggers fire.
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            conn.execute(
+                "INSERT INTO responses (key, path, status, headers, content, size, revalidatable, expires_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    entry.path,
+                    entry.status_code,
+                    json.dumps(entry.headers),
+                    entry.content,
+                    entry.size,
+                    1 if entry.validators() else 0,
+                    entry.expires_at,
+                    time.time(),
+                ),
+            )
+            self._evict(conn)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    async def aget(self, key: str) -> Optional[CacheEntry]:
+        return await _in_thread(self.get, key)
+
+    async def aset(self, key: str, entry: CacheEntry) -> None:
+        await _in_thread(self.set, key, entry)
+
+    async def ainvalidate(self, patterns: Iterable[str]) -> None:
+        await _in_thread(self.invalidate, list(patterns))
+
+    def _evict(self, conn: sqlite3.Connection, batch: int = 64) -> None:
+        """Delete dead entries first, then least recently used ones, until within limits."""
+        while True:
+            entries, total = conn.execute("SELECT entries, bytes FROM totals WHERE id = 0").fetchone()
+            if entries <= self.max_entries and total <= self.max_bytes:
+                return
+            conn.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses"
+                " ORDER BY (expires_at < ? AND revalidatable = 0) DESC, accessed_at LIMIT ?)",
+                (time.time(), batch),
+            )
+
+    def invalidate(self, patterns: Iterable[str]) -> None:
+        # SQLite GLOB shares fnmatch's *, ? and [...] syntax (case-sensitive, like fnmatchcase).
+        conn = self._connect()
+        for pattern in patterns:
+            conn.execute("DELETE FROM responses WHERE path GLOB ?", (pattern,))
+
+    def clear(self) -> None:
+        self._connect().execute("DELETE FROM responses")
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT entries FROM totals WHERE id = 0").fetchone()[0]
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+__all__ = ["CacheEntry", "MemoryCache", "ResponseCache", "SQLiteCache"]
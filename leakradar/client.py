@@ -1,55 +1,41 @@
+import asyncio
+import functools
+import os
+import time
 import httpx
-from typing import Any, Dict, Optional, List, Union, Mapping
-
-try:
-    import ujson as _json
-except Exception:
-    import json as _json
-
-
-class LeakRadarAPIError(Exception):
-    """Base exception for API-related errors."""
-
-    def __init__(self, status_code: int, detail: str):
-        self.status_code = status_code
-        self.detail = detail
-        super().__init__(f"API Error {status_code}: {detail}")
-
-
-class UnauthorizedError(LeakRadarAPIError):
-    """Raised when the user is not authorized to access a resource."""
-
-
-class ForbiddenError(LeakRadarAPIError):
-    """Raised when the user does not have permission (forbidden)."""
-
-
-class BadRequestError(LeakRadarAPIError):
-    """Raised when the request is invalid."""
-
-
-class TooManyRequestsError(LeakRadarAPIError):
-    """Raised when rate limits are exceeded."""
-
-
-class NotFoundError(LeakRadarAPIError):
-    """Raised when the requested resource is not found."""
-
-
-class ValidationError(LeakRadarAPIError):
-    """Raised when the request fails parameter validation."""
-
-
-class ConflictError(LeakRadarAPIError):
-    """Raised on conflict (e.g., duplicate resource)."""
-
-
-class PaymentRequiredError(LeakRadarAPIError):
-    """Raised when an action requires more quota (e.g., raw GB)."""
-
-
-class GoneError(LeakRadarAPIError):
-    """Raised when a resource is no longer available (e.g., expired raw download)."""
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, Callable, Container, Dict, Iterable, Optional, List, Sequence, Tuple, Type, Union, Mapping
+
+from ._concurrency import map_unordered
+from ._routes import is_read_only
+from .bulk import chunked, exists_results, normalize_domain, normalize_email, unique
+from .cache import CacheEntry, ResponseCache
+from .codecs import JSONCodec, get_codec
+from .download import DEFAULT_CHUNK_SIZE, DownloadTarget, ProgressCallback, parallel_download, stream_download
+from .errors import (
+    BadRequestError,
+    ConflictError,
+    ForbiddenError,
+    GoneError,
+    LeakRadarAPIError,
+    NotFoundError,
+    PaymentRequiredError,
+    TooManyRequestsError,
+    UnauthorizedError,
+    ValidationError,
+)
+from .exports import export_url_of
+from .metrics import RequestEvent, RequestHooks, current_event
+from .models import DomainRow, ExportEntry, Leak, RawHit, Record
+from .pagination import iter_items
+from .passwords import PasswordChecker
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+from .runs import NotificationRunSync, RunSink, RunSyncReport
+from .streaming import JSONItemScanner
+from .sweep import DomainSweep, SweepReport, SweepSink
+from .tasks import CompletionCallback, TaskRef, TaskWaiter
+from .unlock import BulkUnlocker, UnlockReport
 
 
 def _is_binary_content_type(ct: str) -> bool:
@@ -67,6 +53,16 @@ def _is_binary_content_type(ct: str) -> bool:
     }
 
 
+class _Flight:
+    """An in-flight request shared by concurrent identical callers."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Future[httpx.Response]"):
+        self.task = task
+        self.waiters = 0
+
+
 class LeakRadarClient:
     """
     Asynchronous client for the LeakRadar.io API.
@@ -75,9 +71,17 @@ class LeakRadarClient:
     - Auth via Bearer Token
     - Custom User-Agent
     - Robust error handling
-    - Optional ujson encoding/decoding for JSON
+    - Pluggable JSON codec (orjson, msgspec, ujson or stdlib), bytes in and out
     - Binary-safe downloads (CSV/TXT/PDF/ZIP)
-    - No automatic retries by default
+    - Optional client-side rate limiting (token buckets per endpoint group)
+    - Optional response cache with per-endpoint TTLs and ETag revalidation
+    - Concurrent identical read-only requests coalesced into one HTTP call
+    - Instrumentation hooks with per-endpoint latency, bytes, status and retries
+    - Optional typed results: compact slotted records instead of dicts
+    - Resumable chunked bulk unlocks
+    - Checkpointed delta sync of notification runs
+    - Multi-domain report sweeps with cheap change pre-filtering
+    - No automatic retries by default (opt in with a RetryPolicy)
     """
 
     BASE_URL = "https://api.leakradar.io"
@@ -113,27 +117,92 @@ class LeakRadarClient:
         self,
         token: Optional[str] = None,
         user_agent: str = "LeakRadar-Python-Client/0.1.6",
-        timeout: float = 30.0,
+        timeout: Union[float, httpx.Timeout] = 30.0,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        json_codec: Union[None, str, JSONCodec] = None,
+        cache: Optional[ResponseCache] = None,
+        limits: Optional[httpx.Limits] = None,
+        http2: bool = False,
+        keepalive_expiry: Optional[float] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        download_transport: Optional[httpx.AsyncBaseTransport] = None,
+        coalesce: bool = True,
+        hooks: Optional[Sequence[RequestHooks]] = None,
+        typed_results: bool = False,
     ):
         """
         Initialize the client.
 
         :param token: Bearer token for authenticated endpoints.
         :param user_agent: Custom User-Agent to identify usage.
-        :param timeout: Request timeout in seconds.
+        :param timeout: Request timeout in seconds, or an httpx.Timeout with separate connect/read/write/pool values.
+        :param rate_limiter: Optional RateLimiter every API call waits on (may be shared between clients).
+        :param retry: Optional RetryPolicy for transient failures (429/5xx, timeouts).
+        :param json_codec: "orjson", "msgspec", "ujson", "json" or a JSONCodec; defaults to the fastest installed.
+        :param cache: Optional ResponseCache (MemoryCache, or SQLiteCache to share across processes) for read-only calls.
+        :param limits: Connection pool limits (httpx.Limits); size max_connections to your fan-out concurrency.
+        :param http2: Negotiate HTTP/2 to multiplex concurrent requests over one connection (needs ``httpx[http2]``).
+        :param keepalive_expiry: Seconds an idle pooled connection is kept alive (overrides limits).
+        :param transport: Custom httpx transport for API calls (e.g. a shared pool or a mock for tests);
+            owned by the caller and not closed by aclose().
+        :param http_client: Existing httpx.AsyncClient for API calls, shared with other code; its base_url must
+            point at the API and it is not closed by aclose().
+        :param download_transport: Custom httpx transport for presigned download URLs (pass ``transport``
+            again to route them through it); owned by the caller. Defaults to a separate pool.
+        :param coalesce: Share one HTTP call between concurrent identical read-only requests.
+        :param hooks: RequestHooks notified on start, end and error of every API call
+            (e.g. HistogramAggregator, PrometheusHooks, OpenTelemetryHooks).
+        :param typed_results: Make iter_* and stream_* yield slotted records (Leak, DomainRow, RawHit,
+            ExportEntry) instead of dicts; streamed records decode lazily on first access.
         """
         self.token = token
         self.user_agent = user_agent
-
-        self._client = httpx.AsyncClient(
-            base_url=self.BASE_URL,
-            headers=self._base_headers(),
-            timeout=timeout,
-        )
-        self._anon_client = httpx.AsyncClient(
-            headers={"User-Agent": self.user_agent, "Accept": "*/*"},
-            timeout=timeout,
-        )
+        self.rate_limiter = rate_limiter
+        self.retry = retry
+        self.json_codec = get_codec(json_codec)
+        self.cache = cache
+        self.coalesce = coalesce
+        self.hooks: List[RequestHooks] = list(hooks or ())
+        self.typed_results = typed_results
+        self._inflight: Dict[str, _Flight] = {}
+
+        if keepalive_expiry is not None:
+            base = limits or httpx.Limits()
+            limits = httpx.Limits(
+                max_connections=base.max_connections,
+                max_keepalive_connections=base.max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            )
+        self._http_options: Dict[str, Any] = {"timeout": timeout, "http2": http2}
+        if limits is not None:
+            self._http_options["limits"] = limits
+        self._download_transport = download_transport
+
+        if http_client is not None:
+            if not str(http_client.base_url).strip("/"):
+                raise ValueError("http_client must have base_url set to the LeakRadar API")
+            self._client = http_client
+            self._owns_client = False
+        else:
+            self._client = httpx.AsyncClient(
+                base_url=self.BASE_URL, headers=self._base_headers(), transport=transport, **self._http_options
+            )
+            # Closing an httpx client closes its transport, which belongs to the caller when given.
+            self._owns_client = transport is None
+        self._anon: Optional[httpx.AsyncClient] = None
+
+    @property
+    def _anon_client(self) -> httpx.AsyncClient:
+        """Unauthenticated client for presigned download URLs, created on first use."""
+        if self._anon is None:
+            self._anon = httpx.AsyncClient(
+                headers={"User-Agent": self.user_agent, "Accept": "*/*"},
+                transport=self._download_transport,
+                **self._http_options,
+            )
+        return self._anon
 
     def _base_headers(self) -> Dict[str, str]:
         return {
@@ -154,9 +223,11 @@ class LeakRadarClient:
         await self.aclose()
 
     async def aclose(self):
-        """Close the underlying HTTP clients."""
-        await self._client.aclose()
-        await self._anon_client.aclose()
+        """Close the underlying HTTP clients (an http_client, transport or download_transport passed in is left open)."""
+        if self._owns_client:
+            await self._client.aclose()
+        if self._anon is not None and self._download_transport is None:
+            await self._anon.aclose()
 
     @staticmethod
     def _clean(params: Optional[Mapping[str, Any]]) -> Optional[Dict[str, Any]]:
@@ -185,9 +256,12 @@ class LeakRadarClient:
                 filters[key] = cls._as_list(filters[key])
         return filters
 
-    @staticmethod
-    def _encode_json(payload: Any) -> bytes:
-        return _json.dumps(payload).encode("utf-8")
+    def _converter(self, model: Type[Record]) -> Optional[Callable[[Dict[str, Any]], Record]]:
+        """Item converter for iter_* when typed results are enabled."""
+        return model.from_dict if self.typed_results else None
+
+    def _encode_json(self, payload: Any) -> bytes:
+        return self.json_codec.dumps(payload)
 
     async def _request(
         self,
@@ -202,9 +276,66 @@ class LeakRadarClient:
         """
         Low-level request wrapper with error handling and smart content handling.
 
-        - Returns dict/list for JSON responses (decoded via ujson if available).
+        - Returns dict/list for JSON responses (decoded from bytes by the configured JSON codec).
         - Returns raw bytes for CSV/TXT/PDF/ZIP/octet-stream.
         """
+        req_headers, content = self._prepare(json, headers)
+        params = self._clean(params)
+
+        if not self.hooks:
+            response = await self._fetch_shared(
+                method, endpoint, params=params, content=content, headers=req_headers, follow_redirects=follow_redirects
+            )
+            return await self._decode(response)
+
+        event = RequestEvent(method, endpoint, len(content) if content else 0)
+        token = current_event.set(event)
+        self._emit("on_request_start", event)
+        try:
+            response = await self._fetch_shared(
+                method, endpoint, params=params, content=content, headers=req_headers, follow_redirects=follow_redirects
+            )
+            event.status = response.status_code
+            event.response_bytes = len(response.content)
+            received = time.perf_counter()
+            event.latency = received - event.started
+            result = await self._decode(response)
+            event.decode_time = time.perf_counter() - received
+        except BaseException as exc:
+            if not event.latency:
+                event.latency = time.perf_counter() - event.started
+            event.error = exc
+            self._emit("on_request_error", event)
+            raise
+        finally:
+            current_event.reset(token)
+        self._emit("on_request_end", event)
+        return result
+
+    def _emit(self, name: str, event: RequestEvent) -> None:
+        for hook in self.hooks:
+            getattr(hook, name)(event)
+
+    async def _decode(self, response: httpx.Response) -> Any:
+        """Raise for error statuses, else return the body as JSON, bytes or text."""
+        if response.is_error:
+            await self._handle_error(response)
+
+        content_type = response.headers.get("content-type", "")
+        if _is_binary_content_type(content_type):
+            return response.content
+
+        body = response.content
+        if not body:
+            return ""
+
+        try:
+            return self.json_codec.loads(body)
+        except Exception:
+            return response.text
+
+    def _prepare(self, json: Optional[Any], headers: Optional[Dict[str, str]]) -> Tuple[Dict[str, str], Optional[bytes]]:
+        """Build request headers and the encoded JSON body."""
         req_headers = self._default_headers()
         if headers:
             req_headers.update(headers)
@@ -213,41 +344,265 @@ class LeakRadarClient:
         if json is not None:
             content = self._encode_json(json)
             req_headers.setdefault("Content-Type", "application/json")
+        return req_headers, content
 
-        response = await self._client.request(
-            method,
-            endpoint,
-            params=self._clean(params),
-            content=content,
-            headers=req_headers,
-            follow_redirects=follow_redirects,
-        )
+    async def _fetch_shared(
+        self,
+        method: str,
+        endpoint: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        content: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        follow_redirects: bool = False,
+    ) -> httpx.Response:
+        """
+        Single-flight wrapper around _fetch for read-only requests.
 
-        if response.is_error:
-            await self._handle_error(response)
+        Concurrent calls with the same method, path, params, body and auth share one HTTP
+        call; each caller decodes the shared response itself. A cancelled caller only
+        cancels the underlying call when no other caller is still waiting for it.
+        """
+        if not self.coalesce or not is_read_only(method, endpoint):
+            return await self._fetch(
+                method, endpoint, params=params, content=content, headers=headers, follow_redirects=follow_redirects
+            )
+
+        key = ResponseCache.make_key(method, endpoint, params, content, headers or {})
+        flight = self._inflight.get(key)
+        if flight is None:
+            task = asyncio.ensure_future(
+                self._fetch(method, endpoint, params=params, content=content, headers=headers, follow_redirects=follow_redirects)
+            )
+            flight = self._inflight[key] = _Flight(task)
+
+            def forget(_: "asyncio.Future[httpx.Response]", key: str = key, flight: _Flight = flight) -> None:
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+
+            task.add_done_callback(forget)
+
+        else:
+            event = current_event.get()
+            if event is not None:
+                event.coalesced = True
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    async def _fetch(
+        self,
+        method: str,
+        endpoint: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        content: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        follow_redirects: bool = False,
+    ) -> httpx.Response:
+        """
+        Obtain a response for _request, going through the response cache when one is configured.
 
-        content_type = response.headers.get("content-type", "")
-        if _is_binary_content_type(content_type):
-            return response.content
+        Fresh cache entries are served without a request; stale ones with validators are
+        revalidated with If-None-Match / If-Modified-Since. Successful mutations invalidate
+        the cached paths they affect.
+        """
+        cache = self.cache
+        read_only = is_read_only(method, endpoint)
+        ttl = cache.ttl_for(endpoint) if cache is not None and read_only else None
+        if cache is None or not ttl:
+            response = await self._send(
+                method, endpoint, params=params, content=content, headers=headers, follow_redirects=follow_redirects
+            )
+            if cache is not None and not read_only and not response.is_error:
+                await cache.ainvalidate(cache.invalidated_by(endpoint))
+            return response
+
+        key = cache.make_key(method, endpoint, params, content, headers or {})
+        entry = await cache.aget(key)
+        if entry is not None and entry.fresh:
+            event = current_event.get()
+            if event is not None:
+                event.cached = True
+            return entry.to_response()
+
+        req_headers = dict(headers or {})
+        if entry is not None:
+            req_headers.update(entry.validators())
+        response = await self._send(
+            method, endpoint, params=params, content=content, headers=req_headers, follow_redirects=follow_redirects
+        )
+        if response.status_code == 304 and entry is not None:
+            refreshed = CacheEntry(entry.path, entry.status_code, entry.headers, entry.content, time.time() + ttl)
+            await cache.aset(key, refreshed)
+            return refreshed.to_response()
+        if response.status_code == 200:
+            await cache.aset(key, CacheEntry.from_response(endpoint, response, ttl))
+        return response
+
+    async def _stream_items(
+        self,
+        method: str,
+        endpoint: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Any] = None,
+        headers: Optional[Dict[str, str]] = None,
+        key: str = "items",
+        model: Optional[Type[Record]] = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Streaming counterpart of _request for list-shaped JSON responses.
 
-        text = response.text
-        if not text:
-            return ""
+        Yields the elements of the top-level list, or of the ``key`` list of a top-level
+        object, decoding each one as soon as its bytes have arrived. With typed results
+        enabled, elements are wrapped undecoded in ``model`` records that decode on first access.
+        """
+        req_headers, content = self._prepare(json, headers)
+        event = RequestEvent(method, endpoint, len(content) if content else 0, streamed=True) if self.hooks else None
+        token = current_event.set(event)
+        if event is not None:
+            self._emit("on_request_start", event)
+        try:
+            response = await self._send(
+                method,
+                endpoint,
+                params=self._clean(params),
+                content=content,
+                headers=req_headers,
+                stream=True,
+            )
+        except BaseException as exc:
+            if event is not None:
+                event.latency = time.perf_counter() - event.started
+                event.error = exc
+                self._emit("on_request_error", event)
+            raise
+        finally:
+            current_event.reset(token)
+
+        loads = self.json_codec.loads
+        if model is not None and self.typed_results:
+            # Lazy records keep the raw bytes and decode on first access.
+            wrap = functools.partial(model.from_json, loads=loads)
+
+            def scan(scanner: JSONItemScanner, chunk: bytes) -> List[Any]:
+                return [wrap(raw) for raw in scanner.feed(chunk)]
+
+        else:
+
+            def scan(scanner: JSONItemScanner, chunk: bytes) -> List[Any]:
+                return scanner.feed_items(chunk, loads)
 
         try:
-            return _json.loads(text)
-        except Exception:
-            return text
+            if event is not None:
+                event.status = response.status_code
+            if response.is_error:
+                await response.aread()
+                if event is not None:
+                    event.response_bytes = len(response.content)
+                await self._handle_error(response)
+            if self.cache is not None and not is_read_only(method, endpoint):
+                await self.cache.ainvalidate(self.cache.invalidated_by(endpoint))
+
+            scanner = JSONItemScanner(key)
+            async for chunk in response.aiter_bytes():
+                if event is None:
+                    for item in scan(scanner, chunk):
+                        yield item
+                else:
+                    event.response_bytes += len(chunk)
+                    started = time.perf_counter()
+                    items = scan(scanner, chunk)
+                    event.decode_time += time.perf_counter() - started
+                    for item in items:
+                        yield item
+                if scanner.finished:
+                    break
+        except GeneratorExit:
+            # The consumer stopped early; that is a normal end of the call.
+            raise
+        except BaseException as exc:
+            if event is not None:
+                event.latency = time.perf_counter() - event.started
+                event.error = exc
+                self._emit("on_request_error", event)
+                event = None
+            raise
+        finally:
+            await response.aclose()
+            if event is not None:
+                event.latency = time.perf_counter() - event.started
+                self._emit("on_request_end", event)
+
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        content: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        follow_redirects: bool = False,
+        stream: bool = False,
+    ) -> httpx.Response:
+        """
+        Send an API request, honouring the client-side rate limiter and retry policy.
+
+        Returns the last response; transport errors that are not retried propagate.
+        With stream=True the body is left unread and the caller must close the response.
+        """
+        limiter = self.rate_limiter
+        policy = self.retry
+        attempt = 0
+        slept = 0.0
+
+        while True:
+            if limiter is not None:
+                await limiter.acquire(endpoint)
+
+            request = self._client.build_request(method, endpoint, params=params, content=content, headers=headers)
+            try:
+                response = await self._client.send(request, stream=stream, follow_redirects=follow_redirects)
+            except httpx.TransportError as exc:
+                if policy is None or not policy.should_retry_exception(method, endpoint, exc, attempt):
+                    raise
+                delay = policy.delay(attempt)
+                if delay is None or (policy.budget is not None and slept + delay > policy.budget):
+                    raise
+            else:
+                if limiter is not None:
+                    limiter.observe(endpoint, response.status_code, response.headers)
+                if policy is None or not policy.should_retry_status(method, endpoint, response.status_code, attempt):
+                    return response
+                delay = policy.delay(attempt, response.headers)
+                if delay is None or (policy.budget is not None and slept + delay > policy.budget):
+                    return response
+                await response.aclose()
+
+            await asyncio.sleep(delay)
+            slept += delay
+            attempt += 1
+            event = current_event.get()
+            if event is not None:
+                event.retries = attempt
 
     async def _handle_error(self, response: httpx.Response):
         detail = ""
         try:
-            text = response.text
+            raw = response.content
             try:
-                body = _json.loads(text) if text else {}
+                body = self.json_codec.loads(raw) if raw else {}
             except Exception:
                 body = {}
-            detail = body.get("detail", "") or text
+            detail = body.get("detail", "") or response.text
         except Exception:
             detail = response.text
 
@@ -292,6 +647,63 @@ class LeakRadarClient:
         """Get background task status by /tasks/{task_id}."""
         return await self._request("GET", f"/tasks/{task_id}")
 
+    def _task_waiter(self, kind: str, **options: Any) -> TaskWaiter:
+        if kind == "task":
+            poll = self.get_task_status
+        elif kind == "list":
+            poll = self.get_unlocked_list_task
+        else:
+            raise ValueError('kind must be "task" or "list"')
+        return TaskWaiter(poll, **options)
+
+    async def wait_for_task(
+        self,
+        task: TaskRef,
+        kind: str = "task",
+        timeout: Optional[float] = None,
+        initial_interval: float = 1.0,
+        max_interval: float = 30.0,
+    ) -> Dict[str, Any]:
+        """
+        Poll a background task until it finishes and return its final status.
+
+        :param task: Task ID or the dict returned by a queue_* call.
+        :param kind: "task" for /tasks (unlock tasks) or "list" for unlocked-list tasks.
+        :param timeout: Seconds before TaskTimeoutError is raised (None waits forever).
+        """
+        waiter = self._task_waiter(kind, timeout=timeout, initial_interval=initial_interval, max_interval=max_interval)
+        return await waiter.wait(task)
+
+    def wait_for_tasks(
+        self,
+        tasks: Iterable[TaskRef],
+        kind: str = "task",
+        timeout: Optional[float] = None,
+        initial_interval: float = 1.0,
+        max_interval: float = 30.0,
+        max_polls_per_second: float = 5.0,
+        concurrency: int = 8,
+        on_complete: Optional[CompletionCallback] = None,
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Wait for many background tasks with one scheduler; yields (task_id, status) as each finishes.
+
+        Each task backs off independently between polls while all polls share a global
+        max_polls_per_second cap.
+
+        :param on_complete: Optional callback (sync or async) called as on_complete(task_id, status).
+        :param timeout: Overall deadline; TaskTimeoutError lists the tasks still pending.
+        """
+        waiter = self._task_waiter(
+            kind,
+            timeout=timeout,
+            initial_interval=initial_interval,
+            max_interval=max_interval,
+            max_polls_per_second=max_polls_per_second,
+            concurrency=concurrency,
+        )
+        return waiter.iter_completed(tasks, on_complete=on_complete)
+
     async def password_range(
         self,
         prefix: str,
@@ -308,6 +720,30 @@ class LeakRadarClient:
         params = self._clean({"prefix": prefix, "limit": limit, "suffix_only": suffix_only})
         return await self._request("GET", "/password-range", params=params)
 
+    async def check_passwords(
+        self,
+        passwords: Optional[Sequence[str]] = None,
+        sha1_hashes: Optional[Iterable[str]] = None,
+        concurrency: int = 8,
+        executor: Optional[Executor] = None,
+    ) -> Dict[str, int]:
+        """
+        Bulk k-anonymity check of passwords or precomputed SHA-1 hashes.
+
+        Each 5-character prefix is queried once, with bounded concurrency, and matched locally.
+        Use PasswordChecker directly to keep its per-prefix cache across batches.
+
+        :param passwords: Plaintext passwords (hashed locally, never sent).
+        :param sha1_hashes: SHA-1 hex digests, used when passwords is None.
+        :param executor: Optional ProcessPoolExecutor for hashing large batches.
+        :return: Mapping of password (or upper-cased hash) to leak count; 0 means not found.
+        :raises PasswordRangeTruncatedError: A prefix has more hashes than the server returns.
+        """
+        checker = PasswordChecker(self, concurrency=concurrency, executor=executor)
+        if passwords is not None:
+            return await checker.check(passwords)
+        return await checker.check_hashes(sha1_hashes or [])
+
     # -------------------------
     # Search (Advanced) - POST (OpenAPI v1.0.0)
     # -------------------------
@@ -391,6 +827,33 @@ class LeakRadarClient:
         filters = self._normalize_leak_filters(filters)
         return await self._request("POST", "/search/advanced", params=params, json=filters)
 
+    def iter_search_advanced(
+        self,
+        page: int = 1,
+        page_size: int = 100,
+        prefetch: int = 1,
+        max_pages: Optional[int] = None,
+        concurrency: int = 1,
+        ordered: bool = True,
+        **filters: Any,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over every leak matching advanced filters, page by page.
+
+        The next page is fetched in the background while the current one is consumed.
+        Filters are the keyword arguments of search_advanced.
+
+        :param prefetch: Number of pages to keep in flight ahead of the consumer.
+        :param max_pages: Stop after this many pages.
+        :param concurrency: Once the first page reports a total, fetch this many pages at once.
+        :param ordered: With concurrency > 1, deliver pages in order (True) or as they complete (False).
+        """
+        fetch = functools.partial(self.search_advanced, **filters)
+        return iter_items(
+            fetch, page=page, page_size=page_size, prefetch=prefetch, max_pages=max_pages, concurrency=concurrency, ordered=ordered,
+            convert=self._converter(Leak)
+        )
+
     async def unlock_all_advanced(
         self,
         filters: Dict[str, Any],
@@ -410,6 +873,26 @@ class LeakRadarClient:
         filters = self._normalize_leak_filters(dict(filters or {}))
         return await self._request("POST", "/search/advanced/unlock", params=params, json=filters)
 
+    def stream_unlock_all_advanced(
+        self,
+        filters: Dict[str, Any],
+        max_leaks: Optional[int] = None,
+        list_id: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of unlock_all_advanced: yields unlocked leaks as they are decoded.
+
+        The unlock request is only sent once iteration starts.
+        """
+        params: Dict[str, Any] = {}
+        if max_leaks is not None:
+            params["max"] = max_leaks
+        if list_id is not None:
+            params["list_id"] = list_id
+
+        filters = self._normalize_leak_filters(dict(filters or {}))
+        return self._stream_items("POST", "/search/advanced/unlock", params=params, json=filters, model=Leak)
+
     async def queue_advanced_unlock_task(
         self,
         filters: Dict[str, Any],
@@ -474,6 +957,25 @@ class LeakRadarClient:
         params = self._clean({"page": page, "page_size": page_size, "search": search, "is_email": is_email})
         return await self._request("GET", f"/search/domain/{domain}/customers", params=params)
 
+    def iter_domain_customers(
+        self,
+        domain: str,
+        page: int = 1,
+        page_size: int = 100,
+        search: Optional[str] = None,
+        is_email: Optional[bool] = None,
+        prefetch: int = 1,
+        max_pages: Optional[int] = None,
+        concurrency: int = 1,
+        ordered: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all customers leaks of a domain, prefetching the next page."""
+        fetch = functools.partial(self.get_domain_customers, domain, search=search, is_email=is_email)
+        return iter_items(
+            fetch, page=page, page_size=page_size, prefetch=prefetch, max_pages=max_pages, concurrency=concurrency, ordered=ordered,
+            convert=self._converter(DomainRow)
+        )
+
     async def get_domain_employees(
         self,
         domain: str,
@@ -485,6 +987,25 @@ class LeakRadarClient:
         params = self._clean({"page": page, "page_size": page_size, "search": search, "is_email": is_email})
         return await self._request("GET", f"/search/domain/{domain}/employees", params=params)
 
+    def iter_domain_employees(
+        self,
+        domain: str,
+        page: int = 1,
+        page_size: int = 100,
+        search: Optional[str] = None,
+        is_email: Optional[bool] = None,
+        prefetch: int = 1,
+        max_pages: Optional[int] = None,
+        concurrency: int = 1,
+        ordered: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all employees leaks of a domain, prefetching the next page."""
+        fetch = functools.partial(self.get_domain_employees, domain, search=search, is_email=is_email)
+        return iter_items(
+            fetch, page=page, page_size=page_size, prefetch=prefetch, max_pages=max_pages, concurrency=concurrency, ordered=ordered,
+            convert=self._converter(DomainRow)
+        )
+
     async def get_domain_third_parties(
         self,
         domain: str,
@@ -496,6 +1017,25 @@ class LeakRadarClient:
         params = self._clean({"page": page, "page_size": page_size, "search": search, "is_email": is_email})
         return await self._request("GET", f"/search/domain/{domain}/third_parties", params=params)
 
+    def iter_domain_third_parties(
+        self,
+        domain: str,
+        page: int = 1,
+        page_size: int = 100,
+        search: Optional[str] = None,
+        is_email: Optional[bool] = None,
+        prefetch: int = 1,
+        max_pages: Optional[int] = None,
+        concurrency: int = 1,
+        ordered: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all third-parties leaks of a domain, prefetching the next page."""
+        fetch = functools.partial(self.get_domain_third_parties, domain, search=search, is_email=is_email)
+        return iter_items(
+            fetch, page=page, page_size=page_size, prefetch=prefetch, max_pages=max_pages, concurrency=concurrency, ordered=ordered,
+            convert=self._converter(DomainRow)
+        )
+
     async def get_domain_subdomains(
         self,
         domain: str,
@@ -506,6 +1046,24 @@ class LeakRadarClient:
         params = self._clean({"page": page, "page_size": page_size, "search": search})
         return await self._request("GET", f"/search/domain/{domain}/subdomains", params=params)
 
+    def iter_domain_subdomains(
+        self,
+        domain: str,
+        page: int = 1,
+        page_size: int = 100,
+        search: Optional[str] = None,
+        prefetch: int = 1,
+        max_pages: Optional[int] = None,
+        concurrency: int = 1,
+        ordered: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all subdomains of a domain, prefetching the next page."""
+        fetch = functools.partial(self.get_domain_subdomains, domain, search=search)
+        return iter_items(
+            fetch, page=page, page_size=page_size, prefetch=prefetch, max_pages=max_pages, concurrency=concurrency, ordered=ordered,
+            convert=self._converter(DomainRow)
+        )
+
     async def export_domain_subdomains(
         self,
         domain: str,
@@ -532,6 +1090,24 @@ class LeakRadarClient:
         params = self._clean({"page": page, "page_size": page_size, "search": search})
         return await self._request("GET", f"/search/domain/{domain}/urls", params=params)
 
+    def iter_domain_urls(
+        self,
+        domain: str,
+        page: int = 1,
+        page_size: int = 100,
+        search: Optional[str] = None,
+        prefetch: int = 1,
+        max_pages: Optional[int] = None,
+        concurrency: int = 1,
+        ordered: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all URLs of a domain, prefetching the next page."""
+        fetch = functools.partial(self.get_domain_urls, domain, search=search)
+        return iter_items(
+            fetch, page=page, page_size=page_size, prefetch=prefetch, max_pages=max_pages, concurrency=concurrency, ordered=ordered,
+            convert=self._converter(DomainRow)
+        )
+
     async def export_domain_urls(
         self,
         domain: str,
@@ -615,6 +1191,62 @@ class LeakRadarClient:
             payload["include_counts"] = True
         return await self._request("POST", "/search/domains/locked-exists", json=payload)
 
+    async def domains_locked_exists_bulk(
+        self,
+        domains: Iterable[str],
+        categories: Optional[List[str]] = None,
+        include_counts: bool = False,
+        chunk_size: int = 100,
+        concurrency: int = 4,
+    ) -> Dict[str, Any]:
+        """
+        domains_locked_exists for any number of domains.
+
+        Domains are normalised (lower-case, no trailing dot, IDNA) and deduplicated, split into
+        chunks of chunk_size, checked concurrently and merged.
+
+        :return: Mapping of normalised domain to its per-domain result.
+        """
+        async def check(chunk: List[str]) -> Any:
+            return await self.domains_locked_exists(chunk, categories=categories, include_counts=include_counts)
+
+        merged: Dict[str, Any] = {}
+        batches = chunked(unique(domains, normalize_domain), chunk_size)
+        async for chunk, response in map_unordered(check, batches, concurrency):
+            merged.update(exists_results(response, "domain", chunk))
+        return merged
+
+    async def sweep_domain_reports(
+        self,
+        domains: Iterable[str],
+        snapshot: Optional[str] = None,
+        sink: Optional[SweepSink] = None,
+        categories: Optional[List[str]] = None,
+        exists_concurrency: int = 4,
+        light_concurrency: int = 16,
+        full_concurrency: int = 4,
+        tolerance: float = 0.05,
+    ) -> SweepReport:
+        """
+        Domain reports for any number of domains, full reports only where something changed.
+
+        Domains go through chunked domains_locked_exists calls, then light reports, and get a
+        full report only when their counts differ from the snapshot file of the previous sweep
+        (light-report counts by more than the relative tolerance, as light reports are sampled).
+        The stages run concurrently with their own bounds; each domain's SweepResult is passed
+        to sink as soon as it is known. See DomainSweep.
+        """
+        sweeper = DomainSweep(
+            self,
+            snapshot,
+            categories=categories,
+            exists_concurrency=exists_concurrency,
+            light_concurrency=light_concurrency,
+            full_concurrency=full_concurrency,
+            tolerance=tolerance,
+        )
+        return await sweeper.run(domains, sink)
+
     # -------------------------
     # Search (Email)
     # -------------------------
@@ -631,6 +1263,25 @@ class LeakRadarClient:
         data = self._clean({"email": email, "search": search, "is_email": is_email}) or {"email": email}
         return await self._request("POST", "/search/email", params=params, json=data)
 
+    def iter_search_email(
+        self,
+        email: str,
+        page: int = 1,
+        page_size: int = 100,
+        search: Optional[str] = None,
+        is_email: Optional[bool] = None,
+        prefetch: int = 1,
+        max_pages: Optional[int] = None,
+        concurrency: int = 1,
+        ordered: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all leaks of an email, prefetching the next page."""
+        fetch = functools.partial(self.search_email, email, search=search, is_email=is_email)
+        return iter_items(
+            fetch, page=page, page_size=page_size, prefetch=prefetch, max_pages=max_pages, concurrency=concurrency, ordered=ordered,
+            convert=self._converter(Leak)
+        )
+
     async def export_email_leaks(
         self,
         email: str,
@@ -680,6 +1331,30 @@ class LeakRadarClient:
             payload["include_counts"] = True
         return await self._request("POST", "/search/emails/locked-exists", json=payload)
 
+    async def emails_locked_exists_bulk(
+        self,
+        emails: Iterable[str],
+        include_counts: bool = False,
+        chunk_size: int = 100,
+        concurrency: int = 4,
+    ) -> Dict[str, Any]:
+        """
+        emails_locked_exists for any number of emails.
+
+        Emails are normalised (stripped, lower-case) and deduplicated, split into chunks of
+        chunk_size, checked concurrently and merged.
+
+        :return: Mapping of normalised email to its per-email result.
+        """
+        async def check(chunk: List[str]) -> Any:
+            return await self.emails_locked_exists(chunk, include_counts=include_counts)
+
+        merged: Dict[str, Any] = {}
+        batches = chunked(unique(emails, normalize_email), chunk_size)
+        async for chunk, response in map_unordered(check, batches, concurrency):
+            merged.update(exists_results(response, "email", chunk))
+        return merged
+
     # -------------------------
     # Unlocked leaks (profile)
     # -------------------------
@@ -698,6 +1373,43 @@ class LeakRadarClient:
         )
         return await self._request("GET", "/profile/unlocked", params=params)
 
+    def stream_unlocked_leaks(
+        self,
+        page: int = 1,
+        page_size: int = 100,
+        search: Optional[str] = None,
+        is_email: Optional[bool] = None,
+        list_id: Optional[int] = None,
+        list_none: Optional[bool] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Streaming variant of get_unlocked_leaks: yields the page's items as they are decoded."""
+        params = self._clean(
+            {"page": page, "page_size": page_size, "search": search, "is_email": is_email, "list_id": list_id, "list_none": list_none}
+        )
+        return self._stream_items("GET", "/profile/unlocked", params=params, model=Leak)
+
+    def iter_unlocked_leaks(
+        self,
+        page: int = 1,
+        page_size: int = 100,
+        search: Optional[str] = None,
+        is_email: Optional[bool] = None,
+        list_id: Optional[int] = None,
+        list_none: Optional[bool] = None,
+        prefetch: int = 1,
+        max_pages: Optional[int] = None,
+        concurrency: int = 1,
+        ordered: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all unlocked leaks, prefetching the next page."""
+        fetch = functools.partial(
+            self.get_unlocked_leaks, search=search, is_email=is_email, list_id=list_id, list_none=list_none
+        )
+        return iter_items(
+            fetch, page=page, page_size=page_size, prefetch=prefetch, max_pages=max_pages, concurrency=concurrency, ordered=ordered,
+            convert=self._converter(Leak)
+        )
+
     async def export_unlocked_leaks(
         self,
         search: Optional[str] = None,
@@ -724,6 +1436,26 @@ class LeakRadarClient:
         params = self._clean({**(base or {}), **filters})
         return await self._request("GET", "/profile/unlocked/advanced", params=params)
 
+    def iter_unlocked_advanced(
+        self,
+        page: int = 1,
+        page_size: int = 100,
+        search: Optional[str] = None,
+        list_id: Optional[int] = None,
+        list_none: Optional[bool] = None,
+        prefetch: int = 1,
+        max_pages: Optional[int] = None,
+        concurrency: int = 1,
+        ordered: bool = True,
+        **filters: Any,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all unlocked leaks matching advanced filters, prefetching the next page."""
+        fetch = functools.partial(self.get_unlocked_advanced, search=search, list_id=list_id, list_none=list_none, **filters)
+        return iter_items(
+            fetch, page=page, page_size=page_size, prefetch=prefetch, max_pages=max_pages, concurrency=concurrency, ordered=ordered,
+            convert=self._converter(Leak)
+        )
+
     async def export_unlocked_advanced(
         self,
         format: Optional[str] = None,
@@ -801,6 +1533,28 @@ class LeakRadarClient:
             data["target_list_id"] = target_list_id
         return await self._request("POST", "/unlock", json=data)
 
+    async def unlock_specific_leaks_bulk(
+        self,
+        leak_ids: Iterable[str],
+        target_list_id: Optional[int] = None,
+        chunk_size: int = 1000,
+        concurrency: int = 4,
+        skip: Optional[Container[str]] = None,
+        journal: Optional[str] = None,
+    ) -> UnlockReport:
+        """
+        unlock_specific_leaks for any number of IDs.
+
+        IDs are deduplicated, filtered against skip (IDs known to be unlocked) and the journal,
+        unlocked in chunks of chunk_size with concurrency requests in flight, and bad chunks are
+        bisected to isolate failing IDs. Pass a journal path to make the run resumable.
+        See BulkUnlocker for the filter-based variants that switch to queued unlock tasks.
+        """
+        unlocker = BulkUnlocker(
+            self, chunk_size=chunk_size, concurrency=concurrency, target_list_id=target_list_id, skip=skip, journal=journal
+        )
+        return await unlocker.run(leak_ids)
+
     # -------------------------
     # Exports
     # -------------------------
@@ -808,6 +1562,48 @@ class LeakRadarClient:
     async def list_exports(self, page: int = 1, page_size: int = 20) -> Dict[str, Any]:
         return await self._request("GET", "/exports", params={"page": page, "page_size": page_size})
 
+    async def download_export_to(
+        self,
+        export: Union[str, Mapping[str, Any]],
+        dest: DownloadTarget,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        progress: Optional[ProgressCallback] = None,
+        max_resumes: int = 5,
+    ) -> Dict[str, Any]:
+        """
+        Stream a finished export's artifact to a path, file-like object or async sink.
+
+        :param export: A list_exports entry (its download URL is used) or the URL itself.
+            API-relative URLs are fetched with the bearer token; absolute third-party URLs without it.
+        :return: {"bytes": ..., "sha256": ..., "resumes": ...}
+        """
+        url = export if isinstance(export, str) else export_url_of(export)
+        if not url:
+            raise ValueError("Export has no download URL yet.")
+
+        if url.startswith("/") or httpx.URL(url).host == httpx.URL(self.BASE_URL).host:
+            client, headers = self._client, self._default_headers()
+        else:
+            client, headers = self._anon_client, None
+        return await stream_download(
+            client, url, dest, chunk_size=chunk_size, progress=progress, max_resumes=max_resumes, headers=headers
+        )
+
+    def iter_exports(
+        self,
+        page: int = 1,
+        page_size: int = 20,
+        prefetch: int = 1,
+        max_pages: Optional[int] = None,
+        concurrency: int = 1,
+        ordered: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all exports, prefetching the next page."""
+        return iter_items(
+            self.list_exports, page=page, page_size=page_size, prefetch=prefetch, max_pages=max_pages, concurrency=concurrency, ordered=ordered,
+            convert=self._converter(ExportEntry)
+        )
+
     # -------------------------
     # Notification methods / notifications / runs
     # -------------------------
@@ -855,6 +1651,20 @@ class LeakRadarClient:
     async def list_notification_runs(self, page: int = 1, page_size: int = 20) -> Dict[str, Any]:
         return await self._request("GET", "/notification_runs", params={"page": page, "page_size": page_size})
 
+    def iter_notification_runs(
+        self,
+        page: int = 1,
+        page_size: int = 20,
+        prefetch: int = 1,
+        max_pages: Optional[int] = None,
+        concurrency: int = 1,
+        ordered: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all notification runs, prefetching the next page."""
+        return iter_items(
+            self.list_notification_runs, page=page, page_size=page_size, prefetch=prefetch, max_pages=max_pages, concurrency=concurrency, ordered=ordered
+        )
+
     async def notification_run_leaks(
         self,
         run_id: int,
@@ -866,6 +1676,25 @@ class LeakRadarClient:
         params = self._clean({"page": page, "page_size": page_size, "search": search, "is_email": is_email})
         return await self._request("GET", f"/notification_runs/{run_id}/leaks", params=params)
 
+    def iter_notification_run_leaks(
+        self,
+        run_id: int,
+        page: int = 1,
+        page_size: int = 100,
+        search: Optional[str] = None,
+        is_email: Optional[bool] = None,
+        prefetch: int = 1,
+        max_pages: Optional[int] = None,
+        concurrency: int = 1,
+        ordered: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all leaks of a notification run, prefetching the next page."""
+        fetch = functools.partial(self.notification_run_leaks, run_id, search=search, is_email=is_email)
+        return iter_items(
+            fetch, page=page, page_size=page_size, prefetch=prefetch, max_pages=max_pages, concurrency=concurrency, ordered=ordered,
+            convert=self._converter(Leak)
+        )
+
     async def unlock_notification_run_leaks(
         self,
         run_id: int,
@@ -886,6 +1715,28 @@ class LeakRadarClient:
         params = self._clean({"search": search, "is_email": is_email, "format": format})
         return await self._request("GET", f"/notification_runs/{run_id}/export", params=params)
 
+    async def sync_notification_runs(
+        self,
+        checkpoint: str,
+        sink: RunSink,
+        page_size: int = 100,
+        concurrency: int = 4,
+        backfill: bool = True,
+        search: Optional[str] = None,
+        is_email: Optional[bool] = None,
+    ) -> RunSyncReport:
+        """
+        Deliver the leaks of notification runs not ingested yet to sink(run_id, leaks).
+
+        Progress (highest run ID, per-run page) is kept in the checkpoint file, so a poll
+        lists only runs above the last one seen and fetches only undelivered leak pages,
+        concurrency runs at a time. Call it on every monitoring cycle; see NotificationRunSync.
+        """
+        syncer = NotificationRunSync(
+            self, checkpoint, sink, page_size=page_size, concurrency=concurrency, backfill=backfill, search=search, is_email=is_email
+        )
+        return await syncer.poll()
+
     # -------------------------
     # Raw search / containers / downloads
     # -------------------------
@@ -906,6 +1757,48 @@ class LeakRadarClient:
         payload = self._clean({"q": q, "container_id": container_id, "exts": exts, "categories": categories, "file_name": file_name}) or {}
         return await self._request("POST", "/search/raw", params=params, json=payload)
 
+    def stream_raw_search(
+        self,
+        q: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 10,
+        container_id: Optional[int] = None,
+        exts: Optional[List[str]] = None,
+        categories: Optional[List[str]] = None,
+        file_name: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Streaming variant of raw_search: yields the page's hits as they are decoded."""
+        if not any([q, container_id, exts, categories, file_name]):
+            raise ValueError("At least one of q, container_id, exts, categories, file_name must be provided.")
+        params = {"page": page, "page_size": page_size}
+        payload = self._clean({"q": q, "container_id": container_id, "exts": exts, "categories": categories, "file_name": file_name}) or {}
+        return self._stream_items("POST", "/search/raw", params=params, json=payload, model=RawHit)
+
+    def iter_raw_search(
+        self,
+        q: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 10,
+        container_id: Optional[int] = None,
+        exts: Optional[List[str]] = None,
+        categories: Optional[List[str]] = None,
+        file_name: Optional[str] = None,
+        prefetch: int = 1,
+        max_pages: Optional[int] = None,
+        concurrency: int = 1,
+        ordered: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all raw search hits, prefetching the next page."""
+        if not any([q, container_id, exts, categories, file_name]):
+            raise ValueError("At least one of q, container_id, exts, categories, file_name must be provided.")
+        fetch = functools.partial(
+            self.raw_search, q=q, container_id=container_id, exts=exts, categories=categories, file_name=file_name
+        )
+        return iter_items(
+            fetch, page=page, page_size=page_size, prefetch=prefetch, max_pages=max_pages, concurrency=concurrency, ordered=ordered,
+            convert=self._converter(RawHit)
+        )
+
     async def raw_export_preview(
         self,
         export: str,
@@ -993,10 +1886,24 @@ class LeakRadarClient:
     async def list_raw_downloads(self, page: int = 1, page_size: int = 20) -> Dict[str, Any]:
         return await self._request("GET", "/profile/raw/downloads", params={"page": page, "page_size": page_size})
 
+    def iter_raw_downloads(
+        self,
+        page: int = 1,
+        page_size: int = 20,
+        prefetch: int = 1,
+        max_pages: Optional[int] = None,
+        concurrency: int = 1,
+        ordered: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all raw downloads of the profile, prefetching the next page."""
+        return iter_items(
+            self.list_raw_downloads, page=page, page_size=page_size, prefetch=prefetch, max_pages=max_pages, concurrency=concurrency, ordered=ordered
+        )
+
     async def get_raw_download_url(self, download_id: int, token: Optional[str] = None) -> str:
         params = self._clean({"token": token})
         req_headers = self._default_headers()
-        response = await self._client.request(
+        response = await self._send(
             "POST",
             f"/profile/raw/downloads/{download_id}/file",
             params=params,
@@ -1013,9 +1920,9 @@ class LeakRadarClient:
             return url
 
         ct = response.headers.get("content-type", "")
-        if ct.startswith("application/json") and response.text:
+        if ct.startswith("application/json") and response.content:
             try:
-                body = _json.loads(response.text)
+                body = self.json_codec.loads(response.content)
                 if isinstance(body, dict) and isinstance(body.get("url"), str):
                     return body["url"]
             except Exception:
@@ -1030,6 +1937,84 @@ class LeakRadarClient:
             raise LeakRadarAPIError(resp.status_code, resp.text or "Raw file download failed.")
         return resp.content
 
+    async def _raw_download_sha256(self, download_id: int, max_pages: int = 3) -> Optional[str]:
+        """
+        Expected SHA-256 of a raw download: sha256_original of its entry in the recent
+        downloads, else from raw_download_preview of its container_id/entry_path.
+        None when neither is available.
+        """
+        try:
+            async for entry in self.iter_raw_downloads(page_size=100, max_pages=max_pages):
+                if not isinstance(entry, dict) or str(entry.get("id")) != str(download_id):
+                    continue
+                digest = entry.get("sha256_original")
+                if isinstance(digest, str) and digest:
+                    return digest
+                if entry.get("container_id") is None or not entry.get("entry_path"):
+                    return None
+                preview = await self.raw_download_preview(container_id=entry["container_id"], entry_path=entry["entry_path"])
+                digest = preview.get("sha256_original") if isinstance(preview, dict) else None
+                return digest if isinstance(digest, str) and digest else None
+        except LeakRadarAPIError:
+            return None
+        return None
+
+    async def download_raw_file_to(
+        self,
+        download_id: int,
+        dest: DownloadTarget,
+        token: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        progress: Optional[ProgressCallback] = None,
+        max_resumes: int = 5,
+        sha256_original: Optional[str] = None,
+        connections: int = 1,
+        verify: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Stream a raw file to disk (or any sink) without buffering it in memory.
+
+        Dropped connections are resumed with HTTP Range requests.
+
+        :param dest: Path, file-like object (sync or async write) or async callable receiving chunks.
+        :param progress: Optional progress(received, total) callback, sync or async.
+        :param max_resumes: Reconnect attempts after a dropped connection (per range).
+        :param sha256_original: Expected SHA-256; verified after download.
+        :param connections: With a path dest, fetch up to this many byte ranges concurrently
+            into a preallocated file (falls back to one stream if ranges are unsupported).
+        :param verify: Without sha256_original, look the expected digest up from the download's
+            entry or the raw download preview and verify against it when found.
+        :return: {"bytes": ..., "sha256": ..., "resumes": ..., "verified": whether a digest was checked}
+        """
+        url = await self.get_raw_download_url(download_id=download_id, token=token)
+        if sha256_original is None and verify:
+            sha256_original = await self._raw_download_sha256(download_id)
+        if connections > 1:
+            if not isinstance(dest, (str, os.PathLike)):
+                raise TypeError("connections > 1 requires dest to be a filesystem path")
+            result = await parallel_download(
+                self._anon_client,
+                url,
+                dest,
+                connections=connections,
+                chunk_size=chunk_size,
+                progress=progress,
+                max_resumes=max_resumes,
+                sha256=sha256_original,
+            )
+        else:
+            result = await stream_download(
+                self._anon_client,
+                url,
+                dest,
+                chunk_size=chunk_size,
+                progress=progress,
+                max_resumes=max_resumes,
+                sha256=sha256_original,
+            )
+        result["verified"] = sha256_original is not None
+        return result
+
     # -------------------------
     # Team
     # -------------------------
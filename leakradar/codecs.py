@@ -0,0 +1,113 @@
+"""Pluggable JSON codecs working directly on bytes."""
+
+import json as _stdlib_json
+from typing import Any, Callable, Dict, Optional, Union
+
+
+class JSONCodec:
+    """
+    JSON codec interface: ``loads`` accepts bytes (or str), ``dumps`` returns UTF-8 bytes.
+
+    Subclass it to plug in another JSON library via ``LeakRadarClient(json_codec=...)``.
+    """
+
+    name = "json"
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return _stdlib_json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return _stdlib_json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.name!r}>"
+
+
+class StdlibCodec(JSONCodec):
+    """The standard library ``json`` module."""
+
+
+class OrjsonCodec(JSONCodec):
+    """``orjson``: the fastest option, natively bytes-in/bytes-out."""
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self.loads = orjson.loads  # type: ignore[method-assign]
+        self.dumps = orjson.dumps  # type: ignore[method-assign]
+
+
+class MsgspecCodec(JSONCodec):
+    """``msgspec.json`` with reusable encoder/decoder instances."""
+
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+
+        self.loads = msgspec.json.Decoder().decode  # type: ignore[method-assign]
+        self.dumps = msgspec.json.Encoder().encode  # type: ignore[method-assign]
+
+
+class UjsonCodec(JSONCodec):
+    """``ujson``: decodes bytes directly; encodes to str, then UTF-8."""
+
+    name = "ujson"
+
+    def __init__(self):
+        import ujson
+
+        self._ujson = ujson
+        self.loads = ujson.loads  # type: ignore[method-assign]
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._ujson.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+_CODECS: Dict[str, Callable[[], JSONCodec]] = {
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+    "ujson": UjsonCodec,
+    "json": StdlibCodec,
+}
+
+# Preference order when no codec is requested explicitly.
+_PREFERRED = ("orjson", "msgspec", "ujson", "json")
+
+_default: Optional[JSONCodec] = None
+
+
+def default_codec() -> JSONCodec:
+    """Return the fastest codec available in this environment (cached)."""
+    global _default
+    if _default is None:
+        for name in _PREFERRED:
+            try:
+                _default = _CODECS[name]()
+                break
+            except ImportError:
+                continue
+    return _default  # type: ignore[return-value]
+
+
+def get_codec(codec: Union[None, str, JSONCodec] = None) -> JSONCodec:
+    """
+    Resolve a codec specification.
+
+    :param codec: None for the fastest available, a name ("orjson", "msgspec", "ujson", "json"),
+        or a JSONCodec instance.
+    """
+    if codec is None:
+        return default_codec()
+    if isinstance(codec, JSONCodec):
+        return codec
+    try:
+        factory = _CODECS[codec]
+    except KeyError:
+        raise ValueError(f"Unknown JSON codec {codec!r}; expected one of {sorted(_CODECS)}") from None
+    return factory()
+
+
+__all__ = ["JSONCodec", "MsgspecCodec", "OrjsonCodec", "StdlibCodec", "UjsonCodec", "default_codec", "get_codec"]
@@ -0,0 +1,463 @@
+"""Columnar accumulation of result rows: dictionary-encoded strings and typed arrays."""
+
+import math
+from array import array
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from .models import Record
+from .pagination import page_items
+
+INT_NULL = -(2 ** 63)
+"""Stored in integer columns for missing values."""
+
+TIMESTAMP_COLUMNS = frozenset({"added_at", "unlocked_at", "created_at", "completed_at", "expires_at"})
+"""Columns parsed from ISO 8601 strings into float epoch seconds by default."""
+
+
+def parse_timestamp(value: Any) -> float:
+    """Parse an ISO 8601 timestamp (naive values are UTC) or epoch number into epoch seconds; NaN if unparseable."""
+    if value is None:
+        return math.nan
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if not isinstance(value, str):
+        return math.nan
+    text = value.strip()
+    if text.endswith(("Z", "z")):
+        text = text[:-1] + "+00:00"
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return math.nan
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class Column:
+    """One column: ``append`` a Python value, ``__getitem__`` reads one back."""
+
+    kind = "object"
+
+    def __init__(self):
+        self.values: List[Any] = []
+
+    def append(self, value: Any) -> bool:
+        """Store ``value``; return False when it does not fit this column's type."""
+        self.values.append(value)
+        return True
+
+    def append_null(self) -> None:
+        self.values.append(None)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index: int) -> Any:
+        return self.values[index]
+
+    def to_pylist(self) -> List[Any]:
+        return list(self.values)
+
+
+class DictionaryColumn(Column):
+    """Strings stored as int32 codes into a list of distinct values (code -1 is null)."""
+
+    kind = "dictionary"
+
+    def __init__(self):
+        self.codes = array("i")
+        self.dictionary: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def append(self, value: Any) -> bool:
+        if value is None:
+            self.codes.append(-1)
+            return True
+        if value.__class__ is not str:
+            return False
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.dictionary)
+            self.dictionary.append(value)
+        self.codes.append(code)
+        return True
+
+    def append_null(self) -> None:
+        self.codes.append(-1)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> Optional[str]:
+        code = self.codes[index]
+        return self.dictionary[code] if code >= 0 else None
+
+    def to_pylist(self) -> List[Any]:
+        dictionary = self.dictionary
+        return [dictionary[code] if code >= 0 else None for code in self.codes]
+
+
+class IntColumn(Column):
+    """Integers in an ``array('q')``; missing values are :data:`INT_NULL`."""
+
+    kind = "int"
+
+    def __init__(self):
+        self.data = array("q")
+
+    def append(self, value: Any) -> bool:
+        if value is None:
+            self.data.append(INT_NULL)
+            return True
+        if value.__class__ is not int:
+            return False
+        self.data.append(value)
+        return True
+
+    def append_null(self) -> None:
+        self.data.append(INT_NULL)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index: int) -> Optional[int]:
+        value = self.data[index]
+        return None if value == INT_NULL else value
+
+    def to_pylist(self) -> List[Any]:
+        return [None if value == INT_NULL else value for value in self.data]
+
+
+class FloatColumn(IntColumn):
+    """Floats in an ``array('d')``; missing values are NaN."""
+
+    kind = "float"
+
+    def __init__(self):
+        self.data = array("d")
+
+    def append(self, value: Any) -> bool:
+        if value is None:
+            self.data.append(math.nan)
+            return True
+        if value.__class__ not in (float, int):
+            return False
+        self.data.append(value)
+        return True
+
+    def append_null(self) -> None:
+        self.data.append(math.nan)
+
+    def __getitem__(self, index: int) -> Optional[float]:
+        value = self.data[index]
+        return None if value != value else value
+
+    def to_pylist(self) -> List[Any]:
+        return [None if value != value else value for value in self.data]
+
+
+class TimestampColumn(FloatColumn):
+    """ISO 8601 timestamps as float epoch seconds in an ``array('d')``; NaN is missing."""
+
+    kind = "timestamp"
+
+    def append(self, value: Any) -> bool:
+        self.data.append(parse_timestamp(value))
+        return True
+
+
+class BoolColumn(IntColumn):
+    """Booleans in an ``array('b')``: 1, 0, or -1 for missing."""
+
+    kind = "bool"
+
+    def __init__(self):
+        self.data = array("b")
+
+    def append(self, value: Any) -> bool:
+        if value is None:
+            self.data.append(-1)
+            return True
+        if value.__class__ is not bool:
+            return False
+        self.data.append(1 if value else 0)
+        return True
+
+    def append_null(self) -> None:
+        self.data.append(-1)
+
+    def __getitem__(self, index: int) -> Optional[bool]:
+        value = self.data[index]
+        return None if value < 0 else bool(value)
+
+    def to_pylist(self) -> List[Any]:
+        return [None if value < 0 else bool(value) for value in self.data]
+
+
+_KINDS = {
+    "object": Column,
+    "dictionary": DictionaryColumn,
+    "int": IntColumn,
+    "float": FloatColumn,
+    "timestamp": TimestampColumn,
+    "bool": BoolColumn,
+}
+
+
+def _infer(value: Any) -> str:
+    if value.__class__ is str:
+        return "dictionary"
+    if value.__class__ is bool:
+        return "bool"
+    if value.__class__ is int:
+        return "int"
+    if value.__class__ is float:
+        return "float"
+    return "object"
+
+
+class ColumnBatch:
+    """
+    A table of equally long columns.
+
+    String columns are dictionary-encoded (:class:`DictionaryColumn`), numbers,
+    booleans and timestamps live in typed ``array`` columns, anything else (lists,
+    nested objects, mixed types) in plain list columns.
+    """
+
+    def __init__(self, columns: Dict[str, Column], num_rows: int):
+        self.columns = columns
+        self.num_rows = num_rows
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self.columns)
+
+    def column(self, name: str) -> Column:
+        return self.columns[name]
+
+    def to_pylist(self, name: str) -> List[Any]:
+        """Decode one column back to Python values."""
+        return self.columns[name].to_pylist()
+
+    def rows(self) -> Iterable[Dict[str, Any]]:
+        """Iterate rows as dicts (missing values omitted)."""
+        decoded = {name: column.to_pylist() for name, column in self.columns.items()}
+        for index in range(self.num_rows):
+            yield {name: values[index] for name, values in decoded.items() if values[index] is not None}
+
+    def value_counts(self, name: str) -> Dict[Any, int]:
+        """Count rows per distinct value of a column (nulls under None)."""
+        column = self.columns[name]
+        if isinstance(column, DictionaryColumn):
+            dictionary = column.dictionary
+            return {dictionary[code] if code >= 0 else None: count for code, count in Counter(column.codes).items()}
+        return dict(Counter(column.to_pylist()))
+
+    def group_indices(self, name: str) -> Dict[Any, array]:
+        """Map each distinct value of a column to the row indices holding it."""
+        column = self.columns[name]
+        groups: Dict[Any, array] = {}
+        if isinstance(column, DictionaryColumn):
+            by_code: Dict[int, array] = {}
+            for index, code in enumerate(column.codes):
+                rows = by_code.get(code)
+                if rows is None:
+                    rows = by_code[code] = array("l")
+                rows.append(index)
+            for code, rows in by_code.items():
+                groups[column.dictionary[code] if code >= 0 else None] = rows
+            return groups
+        for index, value in enumerate(column.to_pylist()):
+            groups.setdefault(value, array("l")).append(index)
+        return groups
+
+    def to_numpy(self, decode: bool = False) -> Dict[str, Any]:
+        """
+        Columns as NumPy arrays (requires ``numpy``).
+
+        Dictionary columns become their int32 codes, or object arrays of strings with
+        ``decode=True``. Integer columns keep :data:`INT_NULL` for missing values, float
+        and timestamp columns NaN, boolean columns -1.
+        """
+        try:
+            import numpy as np
+        except ImportError as exc:
+            raise ImportError("ColumnBatch.to_numpy requires numpy (pip install numpy)") from exc
+
+        out: Dict[str, Any] = {}
+        for name, column in self.columns.items():
+            if isinstance(column, DictionaryColumn):
+                codes = np.frombuffer(column.codes, dtype=np.int32).copy()
+                if decode:
+                    categories = np.array(column.dictionary + [None], dtype=object)
+                    out[name] = categories[codes]
+                else:
+                    out[name] = codes
+            elif isinstance(column, IntColumn):
+                out[name] = np.frombuffer(column.data, dtype=np.dtype(column.data.typecode)).copy()
+            else:
+                out[name] = np.array(column.values, dtype=object)
+        return out
+
+    def categories(self, name: str) -> List[str]:
+        """Distinct values of a dictionary column, indexed by code."""
+        column = self.columns[name]
+        if not isinstance(column, DictionaryColumn):
+            raise TypeError(f"Column {name!r} is not dictionary-encoded")
+        return list(column.dictionary)
+
+    def to_arrow(self) -> Any:
+        """Convert to a ``pyarrow.Table`` (requires ``pyarrow``); string columns become dictionary arrays."""
+        try:
+            import pyarrow as pa
+        except ImportError as exc:
+            raise ImportError("ColumnBatch.to_arrow requires pyarrow (pip install pyarrow)") from exc
+
+        arrays = []
+        for column in self.columns.values():
+            if isinstance(column, DictionaryColumn):
+                indices = pa.array([code if code >= 0 else None for code in column.codes], type=pa.int32())
+                arrays.append(pa.DictionaryArray.from_arrays(indices, pa.array(column.dictionary, type=pa.string())))
+            elif isinstance(column, TimestampColumn):
+                micros = [None if v != v else int(v * 1_000_000) for v in column.data]
+                arrays.append(pa.array(micros, type=pa.timestamp("us", tz="UTC")))
+            else:
+                arrays.append(pa.array(column.to_pylist()))
+        return pa.Table.from_arrays(arrays, names=list(self.columns))
+
+
+class ColumnarBuilder:
+    """
+    Accumulate result rows (dicts or records) into a :class:`ColumnBatch`.
+
+    Column types are inferred from the first non-null value; names in ``timestamps``
+    are parsed into epoch seconds, and ``types`` forces a kind per column
+    ("dictionary", "int", "float", "timestamp", "bool" or "object"). A value that does
+    not fit its column's type turns that column into a plain object column. Keys
+    that appear mid-stream get a new column backfilled with nulls.
+
+    :param columns: Only keep these keys (default: every key seen).
+    :param types: Column kind overrides.
+    :param timestamps: Columns parsed as ISO 8601 timestamps.
+    """
+
+    def __init__(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        types: Optional[Mapping[str, str]] = None,
+        timestamps: Iterable[str] = TIMESTAMP_COLUMNS,
+    ):
+        self._only = frozenset(columns) if columns is not None else None
+        self._types = dict(types or {})
+        for name in timestamps:
+            self._types.setdefault(name, "timestamp")
+        for kind in self._types.values():
+            if kind not in _KINDS:
+                raise ValueError(f"Unknown column kind {kind!r}; expected one of {sorted(_KINDS)}")
+        self._columns: Dict[str, Column] = {}
+        self._pending: Dict[str, int] = {}
+        self.num_rows = 0
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def _new_column(self, name: str, value: Any) -> Optional[Column]:
+        kind = self._types.get(name)
+        if kind is None:
+            if value is None:
+                return None
+            kind = _infer(value)
+        column = _KINDS[kind]()
+        for _ in range(self.num_rows):
+            column.append_null()
+        self._columns[name] = column
+        return column
+
+    def _promote(self, name: str) -> Column:
+        column = Column()
+        column.values = self._columns[name].to_pylist()
+        self._columns[name] = column
+        return column
+
+    def append(self, row: Any) -> None:
+        """Add one row (a dict, a Record, or a page's item)."""
+        if isinstance(row, Record):
+            row = row.to_dict()
+        columns = self._columns
+        only = self._only
+        for name, value in row.items():
+            if only is not None and name not in only:
+                continue
+            column = columns.get(name)
+            if column is None:
+                column = self._new_column(name, value)
+                if column is None:
+                    continue  # only nulls so far; the column is created on its first value
+            if not column.append(value):
+                self._promote(name).append(value)
+        self.num_rows += 1
+        for column in columns.values():
+            if len(column) < self.num_rows:
+                column.append_null()
+
+    def extend(self, rows: Iterable[Any]) -> None:
+        for row in rows:
+            self.append(row)
+
+    def add_page(self, page: Any) -> None:
+        """Add every item of a paginated response (``{"items": [...]}`` or a bare list)."""
+        self.extend(page_items(page))
+
+    def build(self) -> ColumnBatch:
+        """Return the accumulated batch and start a new, empty one."""
+        batch = ColumnBatch(self._columns, self.num_rows)
+        self._columns = {}
+        self.num_rows = 0
+        return batch
+
+
+async def collect_columns(items: AsyncIterable[Any], **options: Any) -> ColumnBatch:
+    """
+    Drain an async iterator of rows (e.g. ``client.iter_search_advanced(...)``) into one batch.
+
+    Keyword arguments are passed to :class:`ColumnarBuilder`.
+    """
+    builder = ColumnarBuilder(**options)
+    async for item in items:
+        builder.append(item)
+    return builder.build()
+
+
+async def iter_column_batches(items: AsyncIterable[Any], batch_size: int = 50_000, **options: Any) -> AsyncIterator[ColumnBatch]:
+    """Yield :class:`ColumnBatch` objects of up to ``batch_size`` rows from an async iterator of rows."""
+    builder = ColumnarBuilder(**options)
+    async for item in items:
+        builder.append(item)
+        if builder.num_rows >= batch_size:
+            yield builder.build()
+    if builder.num_rows:
+        yield builder.build()
+
+
+__all__ = [
+    "INT_NULL",
+    "TIMESTAMP_COLUMNS",
+    "BoolColumn",
+    "Column",
+    "ColumnBatch",
+    "ColumnarBuilder",
+    "DictionaryColumn",
+    "FloatColumn",
+    "IntColumn",
+    "TimestampColumn",
+    "collect_columns",
+    "iter_column_batches",
+    "parse_timestamp",
+]
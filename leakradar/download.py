@@ -0,0 +1,321 @@
+"""Streaming, resumable downloads of raw files to disk or arbitrary sinks."""
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import os
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+import httpx
+
+from .errors import ChecksumMismatchError, LeakRadarAPIError
+
+ProgressCallback = Callable[[int, Optional[int]], Any]
+"""Called as ``progress(bytes_received, total_bytes_or_None)``; may be sync or async."""
+
+DownloadTarget = Union[str, "os.PathLike[str]", Any, Callable[[bytes], Awaitable[Any]]]
+"""A filesystem path, a (sync or async) file-like object with ``write``, or an async callable."""
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+async def _maybe_await(value: Any) -> Any:
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+async def _in_thread(func: Callable[..., Any], *args: Any) -> Any:
+    """Run blocking file I/O in the default executor so the event loop keeps serving other requests."""
+    return await asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args))
+
+
+def _write_at(f: Any, position: int, data: bytes) -> None:
+    f.seek(position)
+    f.write(data)
+
+
+def _rewind(f: Any) -> None:
+    f.seek(0)
+    f.truncate()
+
+
+def _preallocate(path: Union[str, "os.PathLike[str]"], size: int) -> None:
+    with open(path, "wb") as f:
+        f.truncate(size)
+
+
+class _Sink:
+    """
+    Uniform async writer over paths, file-like objects and async callables.
+
+    Files opened from a path are written from the default executor; caller-supplied
+    objects are written as given.
+    """
+
+    def __init__(self, target: DownloadTarget):
+        self._owned = None
+        self._path = None
+        if isinstance(target, (str, os.PathLike)):
+            self._path = target
+            self._write: Any = None
+            self._file: Any = None
+        elif hasattr(target, "write"):
+            self._write = target.write
+            self._file = target
+        elif callable(target):
+            self._write = target
+            self._file = None
+        else:
+            raise TypeError("dest must be a path, a file-like object with write(), or an async callable")
+
+    @property
+    def can_restart(self) -> bool:
+        f = self._file
+        if f is None or not hasattr(f, "seek") or not hasattr(f, "truncate"):
+            return False
+        seekable = getattr(f, "seekable", None)
+        return bool(seekable()) if callable(seekable) else True
+
+    async def open(self) -> None:
+        if self._path is not None and self._owned is None:
+            self._owned = await _in_thread(open, self._path, "wb")
+            self._file = self._owned
+
+    async def write(self, data: bytes) -> None:
+        if self._owned is not None:
+            await _in_thread(self._owned.write, data)
+        else:
+            await _maybe_await(self._write(data))
+
+    async def restart(self) -> None:
+        if self._owned is not None:
+            await _in_thread(_rewind, self._owned)
+            return
+        await _maybe_await(self._file.seek(0))
+        await _maybe_await(self._file.truncate())
+
+    async def close(self) -> None:
+        if self._owned is not None:
+            await _in_thread(self._owned.close)
+
+
+def _content_length(response: httpx.Response, offset: int) -> Optional[int]:
+    """Total object size from Content-Range (206) or Content-Length (200)."""
+    content_range = response.headers.get("content-range", "")
+    if "/" in content_range:
+        size = content_range.rsplit("/", 1)[1].strip()
+        if size.isdigit():
+            return int(size)
+    length = response.headers.get("content-length")
+    if length and length.isdigit():
+        return int(length) + (offset if response.status_code == 206 else 0)
+    return None
+
+
+async def stream_download(
+    client: httpx.AsyncClient,
+    url: str,
+    dest: DownloadTarget,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Optional[ProgressCallback] = None,
+    max_resumes: int = 5,
+    sha256: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """
+    Stream ``url`` into ``dest`` chunk by chunk, resuming with HTTP Range after a dropped connection.
+
+    If the server ignores the Range header on resume, the download restarts from zero when
+    ``dest`` can be rewound and fails otherwise.
+
+    :param client: HTTP client used for the transfer (presigned URLs need no auth).
+    :param url: Absolute URL to download.
+    :param dest: Path, file-like object (sync or async ``write``) or async callable receiving chunks.
+    :param chunk_size: Size of the chunks handed to ``dest``.
+    :param progress: Optional ``progress(received, total)`` callback, sync or async.
+    :param max_resumes: How many times to reconnect after a transport error.
+    :param sha256: Expected SHA-256 hex digest; raises ChecksumMismatchError on mismatch.
+    :param headers: Extra request headers.
+    :return: ``{"bytes": ..., "sha256": ..., "resumes": ...}``
+    """
+    sink = _Sink(dest)
+    hasher = hashlib.sha256()
+    received = 0
+    total: Optional[int] = None
+    resumes = 0
+    status = 0
+
+    try:
+        await sink.open()
+        while True:
+            req_headers = {"Accept-Encoding": "identity"}
+            req_headers.update(headers or {})
+            if received:
+                req_headers["Range"] = f"bytes={received}-"
+            try:
+                async with client.stream("GET", url, headers=req_headers, follow_redirects=True) as resp:
+                    status = resp.status_code
+                    if status == 416 and total is not None and received >= total:
+                        break
+                    if status >= 400:
+                        await resp.aread()
+                        raise LeakRadarAPIError(status, resp.text or "Raw file download failed.")
+                    if received and status != 206:
+                        if not sink.can_restart:
+                            raise LeakRadarAPIError(status, "Server ignored Range request; cannot rewind destination to resume.")
+                        await sink.restart()
+                        hasher = hashlib.sha256()
+                        received = 0
+                    if total is None:
+                        total = _content_length(resp, received)
+                    async for chunk in resp.aiter_bytes(chunk_size):
+                        await sink.write(chunk)
+                        hasher.update(chunk)
+                        received += len(chunk)
+                        if progress is not None:
+                            await _maybe_await(progress(received, total))
+                break
+            except httpx.TransportError:
+                if resumes >= max_resumes:
+                    raise
+                resumes += 1
+                await asyncio.sleep(min(0.25 * (2 ** resumes), 8.0))
+    finally:
+        await sink.close()
+
+    if total is not None and received != total:
+        raise LeakRadarAPIError(status, f"Incomplete download: received {received} of {total} bytes.")
+    digest = hasher.hexdigest()
+    if sha256 and digest != sha256.strip().lower():
+        raise ChecksumMismatchError(status, f"SHA-256 mismatch: expected {sha256}, got {digest}.")
+    return {"bytes": received, "sha256": digest, "resumes": resumes}
+
+
+def _sha256_file(path: Union[str, "os.PathLike[str]"], chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+async def _probe_size(client: httpx.AsyncClient, url: str) -> Optional[int]:
+    """Return the object size if the server honours byte ranges, else None."""
+    headers = {"Range": "bytes=0-0", "Accept-Encoding": "identity"}
+    async with client.stream("GET", url, headers=headers, follow_redirects=True) as resp:
+        if resp.status_code >= 400:
+            await resp.aread()
+            raise LeakRadarAPIError(resp.status_code, resp.text or "Raw file download failed.")
+        if resp.status_code != 206:
+            return None
+        return _content_length(resp, 0)
+
+
+async def _fetch_range(
+    client: httpx.AsyncClient,
+    url: str,
+    path: Union[str, "os.PathLike[str]"],
+    start: int,
+    end: int,
+    chunk_size: int,
+    max_resumes: int,
+    on_bytes: Callable[[int], Awaitable[None]],
+) -> int:
+    """Download bytes ``start..end`` (inclusive) into the same offsets of ``path``. Returns resumes used."""
+    position = start
+    resumes = 0
+    f = await _in_thread(open, path, "r+b")
+    try:
+        while position <= end:
+            headers = {"Range": f"bytes={position}-{end}", "Accept-Encoding": "identity"}
+            try:
+                async with client.stream("GET", url, headers=headers, follow_redirects=True) as resp:
+                    if resp.status_code != 206:
+                        await resp.aread()
+                        raise LeakRadarAPIError(resp.status_code, resp.text or "Ranged download failed.")
+                    async for chunk in resp.aiter_bytes(chunk_size):
+                        chunk = chunk[: end + 1 - position]
+                        await _in_thread(_write_at, f, position, chunk)
+                        position += len(chunk)
+                        await on_bytes(len(chunk))
+                if position <= end:
+                    raise httpx.ReadError("Range response ended early")
+            except httpx.TransportError:
+                if resumes >= max_resumes:
+                    raise
+                resumes += 1
+                await asyncio.sleep(min(0.25 * (2 ** resumes), 8.0))
+    finally:
+        await _in_thread(f.close)
+    return resumes
+
+
+async def parallel_download(
+    client: httpx.AsyncClient,
+    url: str,
+    path: Union[str, "os.PathLike[str]"],
+    *,
+    connections: int = 4,
+    min_part_size: int = 8 * DEFAULT_CHUNK_SIZE,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Optional[ProgressCallback] = None,
+    max_resumes: int = 5,
+    sha256: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Download ``url`` into ``path`` over up to ``connections`` concurrent byte ranges.
+
+    The file is preallocated and each range is written at its own offset, so parts can
+    finish in any order. Falls back to :func:`stream_download` when the server does not
+    honour Range requests or the object is smaller than two parts.
+
+    :param min_part_size: Smallest range worth its own connection.
+    :return: ``{"bytes": ..., "sha256": ..., "resumes": ..., "parts": ...}``; ``sha256`` is
+        only computed when an expected digest is given.
+    """
+    size = await _probe_size(client, url)
+    parts = 0 if size is None else min(connections, size // max(1, min_part_size))
+    if size is None or parts < 2:
+        result = await stream_download(
+            client, url, path, chunk_size=chunk_size, progress=progress, max_resumes=max_resumes, sha256=sha256
+        )
+        result["parts"] = 1
+        return result
+
+    await _in_thread(_preallocate, path, size)
+
+    received = 0
+
+    async def on_bytes(n: int) -> None:
+        nonlocal received
+        received += n
+        if progress is not None:
+            await _maybe_await(progress(received, size))
+
+    part_size = -(-size // parts)
+    tasks = [
+        asyncio.ensure_future(
+            _fetch_range(client, url, path, start, min(start + part_size, size) - 1, chunk_size, max_resumes, on_bytes)
+        )
+        for start in range(0, size, part_size)
+    ]
+    try:
+        resumes = sum(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    digest = None
+    if sha256:
+        digest = await _in_thread(_sha256_file, path)
+        if digest != sha256.strip().lower():
+            raise ChecksumMismatchError(206, f"SHA-256 mismatch: expected {sha256}, got {digest}.")
+    return {"bytes": received, "sha256": digest, "resumes": resumes, "parts": len(tasks)}
+
+
+__all__ = ["DownloadTarget", "ProgressCallback", "parallel_download", "stream_download"]
@@ -0,0 +1,58 @@
+"""Exception hierarchy for LeakRadar API errors."""
+
+
+class LeakRadarAPIError(Exception):
+    """Base exception for API-related errors."""
+
+    def __init__(self, status_code: int, detail: str):
+        self.status_code = status_code
+        self.detail = detail
+        super().__init__(f"API Error {status_code}: {detail}")
+
+
+class UnauthorizedError(LeakRadarAPIError):
+    """Raised when the user is not authorized to access a resource."""
+
+
+class ForbiddenError(LeakRadarAPIError):
+    """Raised when the user does not have permission (forbidden)."""
+
+
+class BadRequestError(LeakRadarAPIError):
+    """Raised when the request is invalid."""
+
+
+class TooManyRequestsError(LeakRadarAPIError):
+    """Raised when rate limits are exceeded."""
+
+
+class NotFoundError(LeakRadarAPIError):
+    """Raised when the requested resource is not found."""
+
+
+class ValidationError(LeakRadarAPIError):
+    """Raised when the request fails parameter validation."""
+
+
+class ConflictError(LeakRadarAPIError):
+    """Raised on conflict (e.g., duplicate resource)."""
+
+
+class PaymentRequiredError(LeakRadarAPIError):
+    """Raised when an action requires more quota (e.g., raw GB)."""
+
+
+class GoneError(LeakRadarAPIError):
+    """Raised when a resource is no longer available (e.g., expired raw download)."""
+
+
+class ChecksumMismatchError(LeakRadarAPIError):
+    """Raised when a downloaded file does not match its expected SHA-256."""
+
+
+class PasswordRangeTruncatedError(LeakRadarAPIError):
+    """Raised when a password range response holds fewer hashes than the prefix has."""
+
+    def __init__(self, status_code: int, detail: str, prefix: str = ""):
+        self.prefix = prefix
+        super().__init__(status_code, detail)
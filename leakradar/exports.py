@@ -0,0 +1,245 @@
+"""Queue exports, detect readiness with one shared poll, and stream artifacts to disk."""
+
+import asyncio
+import os
+import re
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Dict, List, Mapping, Optional, Set, Tuple
+
+from ._concurrency import map_unordered
+from .pagination import page_count, page_items, served_page_size
+from .tasks import FAILURE_STATES, SUCCESS_STATES, TaskTimeoutError, task_state
+
+if TYPE_CHECKING:
+    from .client import LeakRadarClient
+
+_URL_KEYS = ("download_url", "url", "file_url", "link")
+_UNSAFE = re.compile(r"[^A-Za-z0-9._-]+")
+# Complete scans an export may be missing from before its job fails.
+_MAX_MISSES = 3
+
+
+def export_id_of(response: Any) -> Optional[str]:
+    """Extract the export ID from an export_* response (``export_id``/``id``, possibly under ``export``)."""
+    if not isinstance(response, Mapping):
+        return None
+    for key in ("export_id", "id"):
+        if response.get(key) is not None:
+            return str(response[key])
+    nested = response.get("export")
+    return export_id_of(nested) if isinstance(nested, Mapping) else None
+
+
+def export_url_of(entry: Mapping[str, Any]) -> Optional[str]:
+    """Return the artifact URL of a list_exports entry, if it has one."""
+    for key in _URL_KEYS:
+        value = entry.get(key)
+        if isinstance(value, str) and value:
+            return value
+    return None
+
+
+class ExportJob:
+    """State of one export flowing through an ExportPipeline."""
+
+    __slots__ = ("name", "export_id", "state", "entry", "path", "bytes", "error", "misses")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.export_id: Optional[str] = None
+        self.state = "queued"
+        self.entry: Optional[Dict[str, Any]] = None
+        self.path: Optional[str] = None
+        self.bytes = 0
+        self.error: Optional[BaseException] = None
+        self.misses = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.state == "downloaded"
+
+    def __repr__(self) -> str:
+        return f"<ExportJob {self.name!r} id={self.export_id} state={self.state}>"
+
+
+class ExportPipeline:
+    """
+    Queue many exports, wait for them with one shared list_exports poll, and download each when ready.
+
+    Every poll cycle pages through list_exports (newest first) once for all pending
+    exports, instead of polling each export separately. The scan stops once every
+    pending export has been seen or, with numeric export IDs, once the listing goes
+    past the oldest pending one. An export missing from several complete scans fails
+    its job. The poll interval grows by ``backoff`` while nothing changes and resets
+    when an export finishes. Artifacts are streamed to ``dest_dir`` as soon as they
+    are ready, named after the export ID and the server's file name.
+
+    :param client: LeakRadarClient.
+    :param dest_dir: Directory receiving the artifacts (created if missing).
+    :param scan_pages: Optional cap on list_exports pages per scan (None: no cap).
+    :param queue_concurrency: Export requests queued at once.
+    :param download_concurrency: Artifacts downloaded at once.
+    :param timeout: Overall deadline in seconds; TaskTimeoutError lists unfinished exports.
+    """
+
+    def __init__(
+        self,
+        client: "LeakRadarClient",
+        dest_dir: str,
+        poll_interval: float = 5.0,
+        max_poll_interval: float = 60.0,
+        backoff: float = 1.5,
+        scan_pages: Optional[int] = None,
+        page_size: int = 100,
+        queue_concurrency: int = 4,
+        download_concurrency: int = 4,
+        timeout: Optional[float] = None,
+    ):
+        self.client = client
+        self.dest_dir = dest_dir
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.backoff = backoff
+        self.scan_pages = scan_pages
+        self.page_size = page_size
+        self.queue_concurrency = queue_concurrency
+        self.download_concurrency = download_concurrency
+        self.timeout = timeout
+
+    def _path_for(self, job: ExportJob, entry: Mapping[str, Any]) -> str:
+        # Prefixed with the export ID: the server may reuse one file name for several exports.
+        file_name = entry.get("file_name") or entry.get("filename")
+        if isinstance(file_name, str) and file_name:
+            file_name = f"{job.export_id}-{os.path.basename(file_name)}"
+        else:
+            extension = entry.get("format") or "csv"
+            file_name = f"{job.name}-{job.export_id}.{extension}"
+        return os.path.join(self.dest_dir, _UNSAFE.sub("_", file_name))
+
+    async def _scan(self, pending: Dict[str, ExportJob]) -> Tuple[List[Mapping[str, Any]], Set[str]]:
+        """
+        One shared poll. Return the list_exports entries of pending exports that finished,
+        and the IDs of pending exports absent from a complete scan (empty when the scan
+        stopped at ``scan_pages``).
+        """
+        finished = []
+        seen: Set[str] = set()
+        numeric = [int(export_id) for export_id in pending if export_id.isdigit()]
+        oldest = min(numeric) if len(numeric) == len(pending) else None
+        served: Optional[int] = None
+        page = 1
+        while len(seen) < len(pending):
+            if self.scan_pages is not None and page > self.scan_pages:
+                return finished, set()
+            result = await self.client.list_exports(page=page, page_size=self.page_size)
+            entries = page_items(result)
+            if not entries:
+                break
+            passed = False
+            for entry in entries:
+                export_id = export_id_of(entry)
+                if export_id in pending:
+                    seen.add(export_id)
+                    state = task_state(entry)
+                    if state in FAILURE_STATES or (state in SUCCESS_STATES and export_url_of(entry)):
+                        finished.append(entry)
+                elif oldest is not None and export_id is not None and export_id.isdigit() and int(export_id) < oldest:
+                    passed = True
+            if served is None:
+                served = served_page_size(result)
+            count = page_count(result, served)
+            if passed or (count is not None and page >= count) or (count is None and len(entries) < (served or 0)):
+                break
+            page += 1
+        return finished, set(pending) - seen
+
+    async def _download(self, job: ExportJob, entry: Mapping[str, Any]) -> ExportJob:
+        job.entry = dict(entry)
+        if task_state(entry) in FAILURE_STATES:
+            job.state = "failed"
+            return job
+        job.path = self._path_for(job, entry)
+        try:
+            result = await self.client.download_export_to(entry, job.path)
+        except Exception as exc:
+            job.state = "error"
+            job.error = exc
+            return job
+        job.bytes = result["bytes"]
+        job.state = "downloaded"
+        return job
+
+    async def run(self, exports: Mapping[str, Callable[[], Awaitable[Any]]]) -> AsyncIterator[ExportJob]:
+        """
+        Queue every export and yield each ExportJob as it is downloaded or fails.
+
+        :param exports: Mapping of a job name to a zero-argument coroutine function that queues
+            the export, e.g. ``{"tesla.com": functools.partial(client.export_domain_leaks, "tesla.com", "employees")}``.
+        """
+        os.makedirs(self.dest_dir, exist_ok=True)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout if self.timeout is not None else None
+        pending: Dict[str, ExportJob] = {}
+
+        async def queue(name: str) -> Any:
+            return await exports[name]()
+
+        async for name, response in map_unordered(queue, list(exports), self.queue_concurrency, return_exceptions=True):
+            job = ExportJob(name)
+            if isinstance(response, BaseException):
+                job.state, job.error = "error", response
+                yield job
+                continue
+            job.export_id = export_id_of(response)
+            if job.export_id is None:
+                job.state, job.error = "error", ValueError(f"No export id in {response!r}")
+                yield job
+                continue
+            pending[job.export_id] = job
+
+        semaphore = asyncio.Semaphore(self.download_concurrency)
+        downloads: Dict["asyncio.Future[ExportJob]", str] = {}
+
+        async def download(job: ExportJob, entry: Mapping[str, Any]) -> ExportJob:
+            async with semaphore:
+                return await self._download(job, entry)
+
+        interval = self.poll_interval
+        next_scan = loop.time()
+        try:
+            while pending or downloads:
+                if pending and deadline is not None and loop.time() >= deadline:
+                    raise TaskTimeoutError(list(pending))
+                if pending and loop.time() >= next_scan:
+                    ready, missing = await self._scan(pending)
+                    for entry in ready:
+                        job = pending.pop(export_id_of(entry))  # type: ignore[arg-type]
+                        job.state = "downloading"
+                        downloads[asyncio.ensure_future(download(job, entry))] = job.export_id  # type: ignore[assignment]
+                    for job in pending.values():
+                        job.misses = job.misses + 1 if job.export_id in missing else 0
+                    for export_id in [export_id for export_id, job in pending.items() if job.misses >= _MAX_MISSES]:
+                        job = pending.pop(export_id)
+                        job.state = "error"
+                        job.error = LookupError(f"Export {export_id} not found in list_exports")
+                        yield job
+                    interval = self.poll_interval if ready else min(self.max_poll_interval, interval * self.backoff)
+                    next_scan = loop.time() + interval
+
+                wait = max(0.0, next_scan - loop.time()) if pending else None
+                if deadline is not None and wait is not None:
+                    wait = max(0.0, min(wait, deadline - loop.time()))
+                if downloads:
+                    done, _ = await asyncio.wait(list(downloads), timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+                    for future in done:
+                        del downloads[future]
+                        yield future.result()
+                else:
+                    await asyncio.sleep(wait or 0)
+        finally:
+            for future in downloads:
+                future.cancel()
+            if downloads:
+                await asyncio.gather(*downloads, return_exceptions=True)
+
+
+__all__ = ["ExportJob", "ExportPipeline", "export_id_of", "export_url_of"]
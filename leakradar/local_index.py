@@ -0,0 +1,484 @@
+"""Local SQLite/FTS5 replica of the account's unlocked leaks, kept current by delta syncs."""
+
+import asyncio
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from .models import Leak
+from .pagination import page_count, page_items, served_page_size
+
+if TYPE_CHECKING:
+    from .client import LeakRadarClient
+
+# Columns copied out of the JSON document for filtering; values are lower-cased.
+_INDEXED = ("username", "url", "url_domain", "email_domain")
+# IDs per ``IN (...)`` query, below SQLite's historical limit of 999 bound parameters.
+_IN_BATCH = 500
+
+
+async def _in_thread(func: Callable[..., Any], *args: Any) -> Any:
+    return await asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args))
+
+
+def _fts_phrase(text: str) -> str:
+    """Quote user text as one FTS5 phrase, so operators in it are not interpreted."""
+    return '"' + text.replace('"', '""') + '"'
+
+
+class UnlockedIndex:
+    """
+    Local replica of ``/profile/unlocked`` in a SQLite database with an FTS5 index.
+
+    :meth:`sync` does a full pull the first time; later calls fetch pages newest-first
+    and stop at the first leak already in the index, so a poll costs one or two
+    requests. Pulling everything again with ``full=True`` also drops leaks that are no
+    longer unlocked and refreshes list/comment changes made outside this index.
+
+    :meth:`search` answers email, domain, list, comment and free-text queries locally.
+    The mutation helpers (:meth:`set_list`, :meth:`bulk_assign`, :meth:`set_comment`, ...)
+    call the API and apply the same change to the replica. Database work of the async
+    methods runs in the default executor, so it never blocks the event loop.
+
+    Delta sync relies on the endpoint listing the newest unlocks first. Its page ends
+    are judged from the response, since the server may serve fewer items per page than
+    ``page_size``.
+
+    :param client: LeakRadarClient.
+    :param path: Database file; created if missing.
+    :param page_size: Page size used while syncing.
+    :param concurrency: Pages fetched at once during a full pull.
+    :param max_delta_pages: A delta sync reading more pages than this falls back to a full pull.
+    :param task_timeout: Seconds to wait for unlocked-list tasks started by the list helpers.
+    """
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS leaks ("
+        " rowid INTEGER PRIMARY KEY,"
+        " id TEXT NOT NULL UNIQUE,"
+        " username TEXT, url TEXT, url_domain TEXT, email_domain TEXT,"
+        " list_id INTEGER, comment TEXT, unlocked_at TEXT,"
+        " generation INTEGER NOT NULL,"
+        " data TEXT NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS leaks_username ON leaks(username)",
+        "CREATE INDEX IF NOT EXISTS leaks_url_domain ON leaks(url_domain)",
+        "CREATE INDEX IF NOT EXISTS leaks_email_domain ON leaks(email_domain)",
+        "CREATE INDEX IF NOT EXISTS leaks_list ON leaks(list_id)",
+        "CREATE VIRTUAL TABLE IF NOT EXISTS leaks_fts USING fts5("
+        " username, url, url_domain, email_domain, comment, content='leaks', content_rowid='rowid')",
+        "CREATE TRIGGER IF NOT EXISTS leaks_ai AFTER INSERT ON leaks BEGIN"
+        " INSERT INTO leaks_fts(rowid, username, url, url_domain, email_domain, comment)"
+        " VALUES (NEW.rowid, NEW.username, NEW.url, NEW.url_domain, NEW.email_domain, NEW.comment); END",
+        "CREATE TRIGGER IF NOT EXISTS leaks_ad AFTER DELETE ON leaks BEGIN"
+        " INSERT INTO leaks_fts(leaks_fts, rowid, username, url, url_domain, email_domain, comment)"
+        " VALUES ('delete', OLD.rowid, OLD.username, OLD.url, OLD.url_domain, OLD.email_domain, OLD.comment); END",
+        "CREATE TRIGGER IF NOT EXISTS leaks_au AFTER UPDATE OF username, url, url_domain, email_domain, comment ON leaks BEGIN"
+        " INSERT INTO leaks_fts(leaks_fts, rowid, username, url, url_domain, email_domain, comment)"
+        " VALUES ('delete', OLD.rowid, OLD.username, OLD.url, OLD.url_domain, OLD.email_domain, OLD.comment);"
+        " INSERT INTO leaks_fts(rowid, username, url, url_domain, email_domain, comment)"
+        " VALUES (NEW.rowid, NEW.username, NEW.url, NEW.url_domain, NEW.email_domain, NEW.comment); END",
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    )
+
+    _UPSERT = (
+        "INSERT INTO leaks (id, username, url, url_domain, email_domain, list_id, comment, unlocked_at, generation, data)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+        " ON CONFLICT(id) DO UPDATE SET username = excluded.username, url = excluded.url,"
+        " url_domain = excluded.url_domain, email_domain = excluded.email_domain, list_id = excluded.list_id,"
+        " comment = excluded.comment, unlocked_at = excluded.unlocked_at, generation = excluded.generation,"
+        " data = excluded.data"
+    )
+
+    def __init__(
+        self,
+        client: "LeakRadarClient",
+        path: str,
+        page_size: int = 1000,
+        concurrency: int = 4,
+        max_delta_pages: int = 50,
+        task_timeout: Optional[float] = None,
+        busy_timeout: float = 10.0,
+    ):
+        self.client = client
+        self.path = os.fspath(path)
+        self.page_size = page_size
+        self.concurrency = concurrency
+        self.max_delta_pages = max_delta_pages
+        self.task_timeout = task_timeout
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        conn = self._connect()
+        for statement in self._SCHEMA:
+            conn.execute(statement)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, reopening it after a fork."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # -- metadata ---------------------------------------------------------
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._connect().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, conn: sqlite3.Connection, key: str, value: Any) -> None:
+        conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, str(value)))
+
+    @property
+    def last_sync(self) -> Optional[float]:
+        """Epoch time of the last successful sync, or None if the index was never synced."""
+        value = self._meta("last_sync")
+        return float(value) if value is not None else None
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM leaks").fetchone()[0]
+
+    # -- writing ----------------------------------------------------------
+
+    @staticmethod
+    def _row(leak: Mapping[str, Any], generation: int) -> Tuple[Any, ...]:
+        def lower(key: str) -> Optional[str]:
+            value = leak.get(key)
+            return value.lower() if isinstance(value, str) else None
+
+        return (
+            str(leak["id"]),
+            *(lower(key) for key in _INDEXED),
+            leak.get("list_id"),
+            leak.get("comment"),
+            leak.get("unlocked_at"),
+            generation,
+            json.dumps(leak, separators=(",", ":"), ensure_ascii=False),
+        )
+
+    def _store(self, leaks: Iterable[Any], generation: int) -> int:
+        rows = []
+        for leak in leaks:
+            if not isinstance(leak, Mapping):
+                leak = leak.to_dict()
+            if leak.get("id") is not None:
+                rows.append(self._row(leak, generation))
+        if rows:
+            conn = self._connect()
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(self._UPSERT, rows)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def _known_ids(self, ids: Sequence[str]) -> Set[str]:
+        """The subset of ``ids`` already in the index."""
+        conn = self._connect()
+        known: Set[str] = set()
+        for start in range(0, len(ids), _IN_BATCH):
+            batch = list(ids[start:start + _IN_BATCH])
+            marks = ",".join("?" * len(batch))
+            known.update(row[0] for row in conn.execute(f"SELECT id FROM leaks WHERE id IN ({marks})", batch))
+        return known
+
+    def _store_new(self, items: Sequence[Mapping[str, Any]], generation: int) -> Tuple[int, bool]:
+        """Store the leaks of a newest-first page up to the first known one; return (stored, known reached)."""
+        known = self._known_ids([str(item["id"]) for item in items])
+        new = []
+        for item in items:
+            if str(item["id"]) in known:
+                return self._store(new, generation), True
+            new.append(item)
+        return self._store(new, generation), False
+
+    def _finish_sync(self, generation: Optional[int] = None) -> int:
+        """Record a finished sync; after a full pull (``generation``) drop the leaks it did not see."""
+        conn = self._connect()
+        conn.execute("BEGIN")
+        try:
+            removed = 0
+            if generation is not None:
+                removed = conn.execute("DELETE FROM leaks WHERE generation < ?", (generation,)).rowcount
+                self._set_meta(conn, "generation", generation)
+            self._set_meta(conn, "last_sync", time.time())
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return removed
+
+    def _generation(self) -> int:
+        return int(self._meta("generation") or 0)
+
+    # -- syncing ----------------------------------------------------------
+
+    async def sync(self, full: bool = False) -> Dict[str, Any]:
+        """
+        Bring the replica up to date: a full pull the first time (or with ``full=True``),
+        otherwise a delta sync of the unlocks added since the last one.
+
+        :return: ``{"mode": "full"|"delta", "fetched": ..., "pages": ..., "removed": ...}``
+        """
+        if full or await _in_thread(self._meta, "last_sync") is None:
+            return await self._full_sync()
+        result = await self._delta_sync()
+        if result is None:
+            return await self._full_sync()
+        return result
+
+    async def _full_sync(self) -> Dict[str, Any]:
+        generation = await _in_thread(self._generation) + 1
+        fetched = pages = 0
+        batch: List[Any] = []
+        async for leak in self.client.iter_unlocked_leaks(page_size=self.page_size, concurrency=self.concurrency):
+            batch.append(leak)
+            if len(batch) >= self.page_size:
+                fetched += await _in_thread(self._store, batch, generation)
+                pages += 1
+                batch = []
+        if batch:
+            fetched += await _in_thread(self._store, batch, generation)
+            pages += 1
+
+        removed = await _in_thread(self._finish_sync, generation)
+        return {"mode": "full", "fetched": fetched, "pages": pages, "removed": removed}
+
+    async def _delta_sync(self) -> Optional[Dict[str, Any]]:
+        """Fetch newest-first pages until a known leak shows up; None when a full pull is needed."""
+        generation = await _in_thread(self._generation)
+        fetched = 0
+        served: Optional[int] = None
+        page = 1
+        while True:
+            if page > self.max_delta_pages:
+                return None
+            result = await self.client.get_unlocked_leaks(page=page, page_size=self.page_size)
+            raw = page_items(result)
+            items = [item for item in raw if isinstance(item, Mapping) and item.get("id") is not None]
+            stored, reached = await _in_thread(self._store_new, items, generation)
+            fetched += stored
+            if served is None:
+                served = served_page_size(result)
+            count = page_count(result, served)
+            if reached or not raw or (count is not None and page >= count) or (count is None and len(raw) < (served or 0)):
+                break
+            page += 1
+
+        await _in_thread(self._finish_sync)
+        return {"mode": "delta", "fetched": fetched, "pages": page, "removed": 0}
+
+    # -- querying ---------------------------------------------------------
+
+    async def search(
+        self,
+        text: Optional[str] = None,
+        email: Optional[str] = None,
+        domain: Optional[str] = None,
+        list_id: Optional[int] = None,
+        list_none: bool = False,
+        comment: Optional[str] = None,
+        limit: Optional[int] = 100,
+        offset: int = 0,
+    ) -> List[Any]:
+        """
+        Query the replica; all given criteria must match. Newest unlocks first.
+
+        :param text: Free text matched as a phrase against username, URL, domains and comment.
+        :param email: Exact username/email (case-insensitive).
+        :param domain: URL domain or email domain (case-insensitive).
+        :param list_id: Only leaks filed under this unlocked list.
+        :param list_none: Only leaks in no list.
+        :param comment: Phrase matched against comments only.
+        :return: Leak dicts (Leak records when the client has typed_results enabled).
+        """
+        clauses: List[str] = []
+        args: List[Any] = []
+        match = []
+        if text:
+            match.append(_fts_phrase(text))
+        if comment:
+            match.append("comment : " + _fts_phrase(comment))
+        if match:
+            clauses.append("rowid IN (SELECT rowid FROM leaks_fts WHERE leaks_fts MATCH ?)")
+            args.append(" AND ".join(match))
+        if email:
+            clauses.append("username = ?")
+            args.append(email.strip().lower())
+        if domain:
+            clauses.append("(url_domain = ? OR email_domain = ?)")
+            args.extend([domain.strip().lower()] * 2)
+        if list_id is not None:
+            clauses.append("list_id = ?")
+            args.append(list_id)
+        if list_none:
+            clauses.append("list_id IS NULL")
+
+        sql = "SELECT data, list_id, comment FROM leaks"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY unlocked_at DESC, rowid DESC"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            args.extend([limit, offset])
+
+        return await _in_thread(self._select, sql, args, getattr(self.client, "typed_results", False))
+
+    def _select(self, sql: str, args: Sequence[Any], typed: bool) -> List[Any]:
+        out: List[Any] = []
+        for data, row_list, row_comment in self._connect().execute(sql, list(args)):
+            leak = json.loads(data)
+            leak["list_id"] = row_list
+            leak["comment"] = row_comment
+            out.append(Leak.from_dict(leak) if typed else leak)
+        return out
+
+    async def list_counts(self) -> Dict[Optional[int], int]:
+        """Number of leaks per unlocked list (None for leaks in no list)."""
+        return await _in_thread(self._list_counts)
+
+    def _list_counts(self) -> Dict[Optional[int], int]:
+        rows = self._connect().execute("SELECT list_id, COUNT(*) FROM leaks GROUP BY list_id")
+        return {list_id: count for list_id, count in rows}
+
+    # -- mutations mirrored locally --------------------------------------
+
+    async def _update(self, sql: str, args: Sequence[Any]) -> int:
+        return await _in_thread(self._execute, sql, args)
+
+    def _execute(self, sql: str, args: Sequence[Any]) -> int:
+        return self._connect().execute(sql, list(args)).rowcount
+
+    async def _settle(self, result: Any) -> Any:
+        """Wait for an unlocked-list task when the API answered with one instead of applying at once."""
+        if isinstance(result, dict) and result.get("task_id") is not None:
+            await self.client.wait_for_task(result, kind="list", timeout=self.task_timeout)
+        return result
+
+    async def set_list(self, leak_id: str, list_id: Optional[int]) -> Any:
+        """set_unlocked_leak_list, applied to the replica as well."""
+        result = await self.client.set_unlocked_leak_list(leak_id, list_id)
+        await self._update("UPDATE leaks SET list_id = ? WHERE id = ?", (list_id, str(leak_id)))
+        return result
+
+    async def set_comment(self, leak_id: str, comment: str) -> Any:
+        """upsert_unlocked_leak_comment, applied to the replica as well."""
+        result = await self.client.upsert_unlocked_leak_comment(leak_id, comment)
+        await self._update("UPDATE leaks SET comment = ? WHERE id = ?", (comment, str(leak_id)))
+        return result
+
+    async def delete_comment(self, leak_id: str) -> Any:
+        """delete_unlocked_leak_comment, applied to the replica as well."""
+        result = await self.client.delete_unlocked_leak_comment(leak_id)
+        await self._update("UPDATE leaks SET comment = NULL WHERE id = ?", (str(leak_id),))
+        return result
+
+    async def clear_list(self, list_id: int) -> Any:
+        """clear_unlocked_list, applied to the replica as well."""
+        result = await self._settle(await self.client.clear_unlocked_list(list_id))
+        await self._update("UPDATE leaks SET list_id = NULL WHERE list_id = ?", (list_id,))
+        return result
+
+    async def delete_list(self, list_id: int) -> Any:
+        """delete_unlocked_list; its leaks are left in no list locally."""
+        result = await self._settle(await self.client.delete_unlocked_list(list_id))
+        await self._update("UPDATE leaks SET list_id = NULL WHERE list_id = ?", (list_id,))
+        return result
+
+    async def bulk_assign(
+        self,
+        target_list_id: Optional[int],
+        filters: Optional[Dict[str, Any]] = None,
+        search: Optional[str] = None,
+        is_email: Optional[bool] = None,
+        list_id_filter: Optional[int] = None,
+        list_none: Optional[bool] = None,
+    ) -> Dict[str, Any]:
+        """
+        bulk_assign_unlocked_list, mirrored in the replica.
+
+        Selections by list (``list_id_filter`` / ``list_none``) are applied locally as-is.
+        Selections by ``search``, ``filters`` or ``is_email`` follow server-side matching
+        rules, so the target list's membership is re-read from the API instead.
+        """
+        result = await self._settle(
+            await self.client.bulk_assign_unlocked_list(
+                target_list_id,
+                filters=filters,
+                search=search,
+                is_email=is_email,
+                list_id_filter=list_id_filter,
+                list_none=list_none,
+            )
+        )
+        if search is None and not filters and is_email is None:
+            if list_none:
+                await self._update("UPDATE leaks SET list_id = ? WHERE list_id IS NULL", (target_list_id,))
+            elif list_id_filter is not None:
+                await self._update("UPDATE leaks SET list_id = ? WHERE list_id = ?", (target_list_id, list_id_filter))
+            else:
+                await self._update("UPDATE leaks SET list_id = ?", (target_list_id,))
+        else:
+            await self.refresh_list(target_list_id)
+        return result
+
+    async def refresh_list(self, list_id: Optional[int]) -> int:
+        """
+        Re-read one list's members from the API (``None``: the leaks in no list) and
+        update the replica. Leaks the index still has in ``list_id`` but the API no
+        longer lists there are moved out of it. Returns the member count.
+        """
+        if list_id is None:
+            options: Dict[str, Any] = {"list_none": True}
+        else:
+            options = {"list_id": list_id}
+        generation = await _in_thread(self._generation)
+        members: List[str] = []
+        batch: List[Any] = []
+        async for leak in self.client.iter_unlocked_leaks(page_size=self.page_size, concurrency=self.concurrency, **options):
+            batch.append(leak)
+            if len(batch) >= self.page_size:
+                await _in_thread(self._store, batch, generation)
+                members.extend(str(item["id"]) for item in batch)
+                batch = []
+        if batch:
+            await _in_thread(self._store, batch, generation)
+            members.extend(str(item["id"]) for item in batch)
+
+        if list_id is not None:
+            await _in_thread(self._drop_non_members, list_id, members)
+        return len(members)
+
+    def _drop_non_members(self, list_id: int, members: Sequence[str]) -> None:
+        """Move out of ``list_id`` the leaks that are not in ``members``."""
+        conn = self._connect()
+        conn.execute("BEGIN")
+        try:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS members (id TEXT PRIMARY KEY)")
+            conn.execute("DELETE FROM members")
+            conn.executemany("INSERT OR IGNORE INTO members VALUES (?)", [(leak_id,) for leak_id in members])
+            conn.execute(
+                "UPDATE leaks SET list_id = NULL WHERE list_id = ? AND id NOT IN (SELECT id FROM members)", (list_id,)
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+
+__all__ = ["UnlockedIndex"]
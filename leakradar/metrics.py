@@ -0,0 +1,367 @@
+"""Request instrumentation: hook interface, latency histograms and metrics adapters."""
+
+import bisect
+import math
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ._routes import route_template
+
+
+class RequestEvent:
+    """
+    One API call as seen by the hooks.
+
+    ``endpoint`` is the route template (``/search/domain/{domain}/employees``), ``path``
+    the concrete path. ``latency`` covers rate limiting, retries and the transfer up to
+    the full body (for streamed calls, until the body is exhausted, so it includes the
+    consumer's time between items); ``decode_time`` is spent turning the body into
+    Python objects.
+    Times are in seconds. ``status`` stays None when no response was received.
+    ``cached`` marks responses served from the response cache, ``coalesced`` callers
+    that shared another caller's in-flight HTTP call. ``data`` is free for hooks to
+    keep per-request state in (spans, timers).
+    """
+
+    __slots__ = (
+        "method",
+        "endpoint",
+        "path",
+        "status",
+        "started",
+        "latency",
+        "decode_time",
+        "request_bytes",
+        "response_bytes",
+        "retries",
+        "cached",
+        "coalesced",
+        "streamed",
+        "error",
+        "data",
+    )
+
+    def __init__(self, method: str, path: str, request_bytes: int = 0, streamed: bool = False):
+        self.method = method.upper()
+        self.path = path
+        self.endpoint = route_template(path)
+        self.status: Optional[int] = None
+        self.started = time.perf_counter()
+        self.latency = 0.0
+        self.decode_time = 0.0
+        self.request_bytes = request_bytes
+        self.response_bytes = 0
+        self.retries = 0
+        self.cached = False
+        self.coalesced = False
+        self.streamed = streamed
+        self.error: Optional[BaseException] = None
+        self.data: Dict[str, Any] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"<RequestEvent {self.method} {self.endpoint} status={self.status} "
+            f"latency={self.latency * 1000:.1f}ms retries={self.retries}>"
+        )
+
+
+# The event of the API call running in the current task; _send records retries on it.
+current_event = ContextVar("leakradar_request_event", default=None)  # type: ContextVar[Optional[RequestEvent]]
+
+
+class RequestHooks:
+    """
+    Instrumentation interface for ``LeakRadarClient(hooks=[...])``.
+
+    Every instrumented call fires ``on_request_start`` and then exactly one of
+    ``on_request_end`` (a response was received and decoded) or ``on_request_error``
+    (transport error, API error status, decode failure or cancellation). Hooks run
+    inline on the event loop, so keep them cheap; exceptions they raise propagate.
+    """
+
+    def on_request_start(self, event: RequestEvent) -> None:
+        pass
+
+    def on_request_end(self, event: RequestEvent) -> None:
+        pass
+
+    def on_request_error(self, event: RequestEvent) -> None:
+        pass
+
+
+def _log_bounds(low: float, high: float, per_doubling: int) -> List[float]:
+    count = int(math.ceil(math.log2(high / low) * per_doubling))
+    return [low * 2 ** (i / per_doubling) for i in range(count + 1)]
+
+
+class Histogram:
+    """
+    Log-bucketed histogram for positive values such as latencies.
+
+    Bucket bounds grow geometrically (``per_doubling`` buckets per doubling), so the
+    relative error of a quantile is bounded (about 9% with the default of 4) over the
+    whole range; values above ``high`` fall into one overflow bucket.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "sum", "min", "max")
+
+    def __init__(self, low: float = 0.0005, high: float = 120.0, per_doubling: int = 4):
+        self.bounds = _log_bounds(low, high, per_doubling)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Estimate the ``q`` quantile (0..1), interpolating inside the bucket; 0.0 when empty."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            if bucket and seen + bucket >= rank:
+                lower = self.bounds[index - 1] if index > 0 else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else self.max
+                value = lower + (upper - lower) * ((rank - seen) / bucket)
+                return min(max(value, self.min), self.max)
+            seen += bucket
+        return self.max
+
+
+class _Series:
+    __slots__ = ("latency", "decode", "statuses", "errors", "retries", "cached", "coalesced", "bytes_in", "bytes_out")
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.decode = Histogram()
+        self.statuses: Dict[Optional[int], int] = {}
+        self.errors = 0
+        self.retries = 0
+        self.cached = 0
+        self.coalesced = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+
+class HistogramAggregator(RequestHooks):
+    """
+    In-process per-endpoint statistics: latency and decode-time histograms, status
+    counts, errors, retries, cache hits and byte totals, keyed by (method, endpoint template).
+
+    >>> stats = HistogramAggregator()
+    >>> client = LeakRadarClient(token, hooks=[stats])
+    >>> ...
+    >>> stats.quantile("GET", "/search/domain/{domain}/employees", 0.99)
+    """
+
+    DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+
+    def __init__(self):
+        self._series: Dict[Tuple[str, str], _Series] = {}
+
+    def _record(self, event: RequestEvent) -> None:
+        key = (event.method, event.endpoint)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _Series()
+        series.latency.record(event.latency)
+        series.decode.record(event.decode_time)
+        series.statuses[event.status] = series.statuses.get(event.status, 0) + 1
+        series.retries += event.retries
+        series.cached += event.cached
+        series.coalesced += event.coalesced
+        series.bytes_in += event.response_bytes
+        series.bytes_out += event.request_bytes
+        if event.error is not None:
+            series.errors += 1
+
+    on_request_end = _record
+    on_request_error = _record
+
+    def keys(self) -> List[Tuple[str, str]]:
+        """The (method, endpoint) pairs seen so far."""
+        return sorted(self._series)
+
+    def histogram(self, method: str, endpoint: str) -> Optional[Histogram]:
+        """Latency histogram of one endpoint, or None if it was never called."""
+        series = self._series.get((method.upper(), endpoint))
+        return series.latency if series is not None else None
+
+    def quantile(self, method: str, endpoint: str, q: float) -> float:
+        """Latency quantile in seconds for one endpoint (0.0 if it was never called)."""
+        histogram = self.histogram(method, endpoint)
+        return histogram.quantile(q) if histogram is not None else 0.0
+
+    def summary(self, quantiles: Sequence[float] = DEFAULT_QUANTILES) -> List[Dict[str, Any]]:
+        """One row per endpoint with counts, latency/decode quantiles (seconds) and byte totals."""
+        rows = []
+        for (method, endpoint), series in sorted(self._series.items()):
+            row: Dict[str, Any] = {
+                "method": method,
+                "endpoint": endpoint,
+                "count": series.latency.count,
+                "errors": series.errors,
+                "retries": series.retries,
+                "cached": series.cached,
+                "coalesced": series.coalesced,
+                "statuses": dict(series.statuses),
+                "bytes_in": series.bytes_in,
+                "bytes_out": series.bytes_out,
+                "latency_mean": series.latency.mean,
+                "latency_max": series.latency.max,
+                "decode_mean": series.decode.mean,
+            }
+            for q in quantiles:
+                label = f"p{q * 100:g}"
+                row[f"latency_{label}"] = series.latency.quantile(q)
+                row[f"decode_{label}"] = series.decode.quantile(q)
+            rows.append(row)
+        return rows
+
+    def reset(self) -> None:
+        self._series.clear()
+
+
+def _status_label(event: RequestEvent) -> str:
+    if event.status is not None:
+        return str(event.status)
+    return type(event.error).__name__ if event.error is not None else "none"
+
+
+class PrometheusHooks(RequestHooks):
+    """
+    Export request metrics with ``prometheus_client`` (``pip install leakradar[prometheus]``).
+
+    Registers ``<namespace>_request_duration_seconds`` and ``<namespace>_decode_duration_seconds``
+    histograms, plus ``<namespace>_request_bytes_total``, ``<namespace>_response_bytes_total``
+    and ``<namespace>_retries_total`` counters, labelled by method, endpoint template and status.
+    """
+
+    def __init__(self, registry: Any = None, namespace: str = "leakradar", buckets: Optional[Iterable[float]] = None):
+        try:
+            import prometheus_client
+        except ImportError as exc:
+            raise ImportError("PrometheusHooks requires prometheus_client (pip install prometheus-client)") from exc
+
+        options: Dict[str, Any] = {"namespace": namespace}
+        if registry is not None:
+            options["registry"] = registry
+        histogram_options = dict(options)
+        if buckets is not None:
+            histogram_options["buckets"] = tuple(buckets)
+        labels = ("method", "endpoint", "status")
+        self.duration = prometheus_client.Histogram(
+            "request_duration_seconds", "LeakRadar API request latency", labels, **histogram_options
+        )
+        self.decode = prometheus_client.Histogram(
+            "decode_duration_seconds", "LeakRadar API response decode time", labels, **histogram_options
+        )
+        self.request_bytes = prometheus_client.Counter(
+            "request_bytes", "LeakRadar API request body bytes", labels, **options
+        )
+        self.response_bytes = prometheus_client.Counter(
+            "response_bytes", "LeakRadar API response body bytes", labels, **options
+        )
+        self.retries = prometheus_client.Counter("retries", "LeakRadar API request retries", labels, **options)
+
+    def _record(self, event: RequestEvent) -> None:
+        labels = (event.method, event.endpoint, _status_label(event))
+        self.duration.labels(*labels).observe(event.latency)
+        self.decode.labels(*labels).observe(event.decode_time)
+        self.request_bytes.labels(*labels).inc(event.request_bytes)
+        self.response_bytes.labels(*labels).inc(event.response_bytes)
+        if event.retries:
+            self.retries.labels(*labels).inc(event.retries)
+
+    on_request_end = _record
+    on_request_error = _record
+
+
+class OpenTelemetryHooks(RequestHooks):
+    """
+    Record request metrics, and optionally spans, with the OpenTelemetry API
+    (``pip install leakradar[opentelemetry]``).
+
+    Instruments are ``leakradar.client.duration`` and ``leakradar.client.decode_duration``
+    histograms (seconds) and ``leakradar.client.request.size`` / ``leakradar.client.response.size``
+    / ``leakradar.client.retries`` counters, with ``http.request.method``, ``http.route``
+    and ``http.response.status_code`` attributes. With ``traces=True`` each call also
+    gets a client span.
+    """
+
+    def __init__(self, meter_provider: Any = None, tracer_provider: Any = None, traces: bool = False):
+        try:
+            from opentelemetry import metrics, trace
+        except ImportError as exc:
+            raise ImportError("OpenTelemetryHooks requires opentelemetry-api (pip install opentelemetry-api)") from exc
+
+        from . import __version__
+
+        meter = metrics.get_meter("leakradar", __version__, meter_provider=meter_provider)
+        self.duration = meter.create_histogram("leakradar.client.duration", unit="s", description="API request latency")
+        self.decode = meter.create_histogram(
+            "leakradar.client.decode_duration", unit="s", description="API response decode time"
+        )
+        self.request_size = meter.create_counter("leakradar.client.request.size", unit="By")
+        self.response_size = meter.create_counter("leakradar.client.response.size", unit="By")
+        self.retries = meter.create_counter("leakradar.client.retries")
+        self._trace = trace
+        self._tracer = trace.get_tracer("leakradar", __version__, tracer_provider=tracer_provider) if traces else None
+
+    def on_request_start(self, event: RequestEvent) -> None:
+        if self._tracer is not None:
+            event.data["otel_span"] = self._tracer.start_span(
+                f"{event.method} {event.endpoint}",
+                kind=self._trace.SpanKind.CLIENT,
+                attributes={"http.request.method": event.method, "http.route": event.endpoint},
+            )
+
+    def _record(self, event: RequestEvent) -> None:
+        attributes: Dict[str, Any] = {"http.request.method": event.method, "http.route": event.endpoint}
+        if event.status is not None:
+            attributes["http.response.status_code"] = event.status
+        if event.error is not None:
+            attributes["error.type"] = type(event.error).__name__
+        self.duration.record(event.latency, attributes)
+        self.decode.record(event.decode_time, attributes)
+        self.request_size.add(event.request_bytes, attributes)
+        self.response_size.add(event.response_bytes, attributes)
+        if event.retries:
+            self.retries.add(event.retries, attributes)
+
+        span = event.data.pop("otel_span", None)
+        if span is not None:
+            span.set_attributes(attributes)
+            if event.error is not None:
+                span.record_exception(event.error)
+                span.set_status(self._trace.Status(self._trace.StatusCode.ERROR))
+            span.end()
+
+    on_request_end = _record
+    on_request_error = _record
+
+
+__all__ = [
+    "Histogram",
+    "HistogramAggregator",
+    "OpenTelemetryHooks",
+    "PrometheusHooks",
+    "RequestEvent",
+    "RequestHooks",
+    "current_event",
+]
@@ -0,0 +1,226 @@
+"""Compact slotted record types for typed results (``LeakRadarClient(typed_results=True)``)."""
+
+import sys
+from typing import Any, Callable, Dict, FrozenSet, Iterator, Tuple, Type, TypeVar
+
+R = TypeVar("R", bound="Record")
+
+_intern = sys.intern
+
+
+class Record:
+    """
+    Base for slotted result records.
+
+    Each subclass lists its known JSON keys in ``FIELDS``; they become slots, and a
+    missing key reads as None. Keys not in ``FIELDS`` are kept in ``extra`` so no data
+    is lost, and known keys sent as null are remembered so the dict view matches the
+    JSON. String values of the low-cardinality ``INTERNED`` fields (domains, TLDs,
+    schemes, ...) are interned, so millions of records share one copy of each value.
+
+    Records built by :meth:`from_json` keep only the raw JSON bytes of the item and
+    decode them on first attribute access; records that are never inspected (or are
+    filtered on one field and dropped) cost little more than their bytes.
+
+    Records also answer the read-only part of the dict protocol (``record["url"]``,
+    ``.get()``, ``.keys()``, ``to_dict()``), so code written against plain dicts keeps working.
+    """
+
+    __slots__ = ("_raw", "_loads", "_nulls", "extra")
+
+    FIELDS: Tuple[str, ...] = ()
+    INTERNED: FrozenSet[str] = frozenset()
+    _field_set: FrozenSet[str] = frozenset()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._field_set = frozenset(cls.FIELDS)
+
+    @classmethod
+    def from_dict(cls: Type[R], data: Dict[str, Any]) -> R:
+        """Build a record from a decoded JSON object."""
+        record = cls.__new__(cls)
+        record._raw = None
+        record._populate(data)
+        return record
+
+    @classmethod
+    def from_json(cls: Type[R], raw: bytes, loads: Callable[[bytes], Any]) -> R:
+        """Build a record that decodes ``raw`` with ``loads`` on first access."""
+        record = cls.__new__(cls)
+        record._raw = raw
+        record._loads = loads
+        return record
+
+    def _populate(self, data: Dict[str, Any]) -> None:
+        interned = self.INTERNED
+        fields = self._field_set
+        nulls = []
+        for name in self.FIELDS:
+            value = data.get(name)
+            if value is None:
+                if name in data:
+                    nulls.append(name)
+            elif value.__class__ is str and name in interned:
+                value = _intern(value)
+            setattr(self, name, value)
+        self._nulls = frozenset(nulls) if nulls else None
+        self.extra = {key: value for key, value in data.items() if key not in fields} or None
+
+    def _load(self) -> None:
+        raw = self._raw
+        self._raw = None
+        data = self._loads(raw)
+        del self._loads
+        self._populate(data if isinstance(data, dict) else {})
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for unset slots, i.e. before a lazy record has been decoded.
+        if name == "_raw" or (name not in self._field_set and name not in ("extra", "_nulls")) or self._raw is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        self._load()
+        return getattr(self, name)
+
+    @property
+    def loaded(self) -> bool:
+        """False while the raw JSON of a lazy record has not been decoded yet."""
+        return self._raw is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The record as a plain dict (known fields absent from the JSON are omitted)."""
+        if self._raw is not None:
+            self._load()
+        nulls = self._nulls or ()
+        data = {name: getattr(self, name) for name in self.FIELDS}
+        data = {key: value for key, value in data.items() if value is not None or key in nulls}
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._field_set:
+            value = getattr(self, key)
+            if value is not None or (self._nulls and key in self._nulls):
+                return value
+        elif self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self[key]  # type: ignore[index]
+        except KeyError:
+            return False
+        return True
+
+    def keys(self) -> Iterator[str]:
+        return iter(self.to_dict())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Record):
+            return type(self) is type(other) and self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return self.to_dict()
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self._raw = None
+        self._populate(state)
+
+    def __repr__(self) -> str:
+        if self._raw is not None:
+            return f"<{type(self).__name__} (not decoded, {len(self._raw)} bytes)>"
+        key = next((getattr(self, name) for name in ("id", "url", "entry_path") if name in self._field_set), None)
+        return f"<{type(self).__name__} {key!r}>"
+
+
+class Leak(Record):
+    """A leak row from advanced/email search, unlocks, unlocked leaks and notification runs."""
+
+    FIELDS = (
+        "id",
+        "url",
+        "url_scheme",
+        "url_host",
+        "url_domain",
+        "url_tld",
+        "url_port",
+        "username",
+        "password",
+        "password_strength",
+        "is_email",
+        "email_domain",
+        "email_host",
+        "email_tld",
+        "added_at",
+        "unlocked",
+        "unlocked_at",
+        "list_id",
+        "comment",
+    )
+    INTERNED = frozenset(
+        {"url_scheme", "url_host", "url_domain", "url_tld", "password_strength", "email_domain", "email_host", "email_tld"}
+    )
+    __slots__ = FIELDS
+
+
+class DomainRow(Leak):
+    """A row of a domain report listing (employees, customers, third parties, subdomains, URLs)."""
+
+    FIELDS = Leak.FIELDS + ("subdomain", "count")
+    INTERNED = Leak.INTERNED | {"subdomain"}
+    __slots__ = ("subdomain", "count")
+
+
+class RawHit(Record):
+    """A raw search hit."""
+
+    FIELDS = (
+        "container_id",
+        "entry_path",
+        "file_name",
+        "ext",
+        "category",
+        "offset",
+        "size",
+        "snippet",
+        "sha256_original",
+    )
+    # Paths and digests are near-unique per hit, so interning them would only grow the intern table.
+    INTERNED = frozenset({"file_name", "ext", "category"})
+    __slots__ = FIELDS
+
+
+class ExportEntry(Record):
+    """An entry of list_exports."""
+
+    FIELDS = (
+        "id",
+        "type",
+        "status",
+        "format",
+        "filename",
+        "url",
+        "size",
+        "total",
+        "created_at",
+        "completed_at",
+        "expires_at",
+        "error",
+    )
+    INTERNED = frozenset({"type", "status", "format"})
+    __slots__ = FIELDS
+
+
+__all__ = ["DomainRow", "ExportEntry", "Leak", "RawHit", "Record"]
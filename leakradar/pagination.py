@@ -0,0 +1,270 @@
+"""Page iteration helpers for paginated LeakRadar endpoints."""
+
+import asyncio
+import math
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional
+
+PageFetcher = Callable[..., Awaitable[Any]]
+"""Coroutine function called as ``fetch(page=..., page_size=...)`` returning one page."""
+
+
+def page_items(result: Any) -> List[Any]:
+    """Extract the list of items from a paginated response (``items`` or a bare list)."""
+    if isinstance(result, list):
+        return result
+    if isinstance(result, dict):
+        items = result.get("items")
+        if isinstance(items, list):
+            return items
+    return []
+
+
+def served_page_size(result: Any) -> Optional[int]:
+    """
+    The page size the server actually used: the echoed ``page_size``, else the item
+    count of the page. Servers may cap the requested size, so the request is never used.
+    """
+    if isinstance(result, dict):
+        size = result.get("page_size")
+        if isinstance(size, int) and size > 0:
+            return size
+    items = page_items(result)
+    return len(items) or None
+
+
+def page_count(result: Any, page_size: Optional[int] = None) -> Optional[int]:
+    """
+    Return the number of pages advertised by a response, or None when unknown.
+
+    :param page_size: Page size served for the first page (see :func:`served_page_size`);
+        used only when the response does not echo ``page_size``. Defaults to the item
+        count of ``result``, which is right for any page but the last.
+    """
+    if not isinstance(result, dict):
+        return None
+    for key in ("pages", "total_pages"):
+        pages = result.get(key)
+        if isinstance(pages, int):
+            return pages
+    total = result.get("total")
+    if not isinstance(total, int):
+        return None
+    size = result.get("page_size")
+    if not isinstance(size, int) or size <= 0:
+        size = page_size or len(page_items(result))
+    if size <= 0:
+        return None
+    return max(1, math.ceil(total / size))
+
+
+def _is_last_page(result: Any, page: int, page_size: Optional[int], last_page: Optional[int]) -> bool:
+    """
+    ``page_size`` is the size served for the first page, None while reading the first page:
+    a first page shorter than requested may just be capped, so it never ends iteration alone.
+    """
+    items = page_items(result)
+    if not items:
+        return True
+    if last_page is not None and page >= last_page:
+        return True
+    count = page_count(result, page_size)
+    if count is not None:
+        return page >= count
+    echoed = result.get("page_size") if isinstance(result, dict) else None
+    size = echoed if isinstance(echoed, int) and echoed > 0 else page_size
+    return size is not None and len(items) < size
+
+
+async def _drain(tasks: Deque["asyncio.Future[Any]"]) -> None:
+    """Cancel outstanding page fetches and swallow their outcome."""
+    for task in tasks:
+        task.cancel()
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
+    tasks.clear()
+
+
+async def _iter_sequential(
+    fetch: PageFetcher,
+    page: int,
+    page_size: int,
+    prefetch: int,
+    last_page: Optional[int],
+    served: Optional[int] = None,
+) -> AsyncIterator[Any]:
+    pending: Deque["asyncio.Future[Any]"] = deque()
+    next_page = page
+    known_count: Optional[int] = None
+
+    def schedule() -> None:
+        nonlocal next_page
+        pending.append(asyncio.ensure_future(fetch(page=next_page, page_size=page_size)))
+        next_page += 1
+
+    current = page
+    try:
+        while True:
+            if not pending:
+                schedule()
+            result = await pending.popleft()
+            done = _is_last_page(result, current, served, last_page)
+            if served is None:
+                served = served_page_size(result)
+            if not done:
+                known_count = page_count(result, served) or known_count
+                while (
+                    len(pending) < prefetch
+                    and (known_count is None or next_page <= known_count)
+                    and (last_page is None or next_page <= last_page)
+                ):
+                    schedule()
+            yield result
+            if done:
+                return
+            current += 1
+    finally:
+        await _drain(pending)
+
+
+async def _iter_fan_out(
+    fetch: PageFetcher,
+    pages: range,
+    page_size: int,
+    concurrency: int,
+    ordered: bool,
+) -> AsyncIterator[Any]:
+    """Fetch a known range of pages with at most ``concurrency`` requests in flight."""
+    remaining = iter(pages)
+    in_flight: Dict["asyncio.Future[Any]", int] = {}
+
+    def top_up() -> None:
+        while len(in_flight) < concurrency:
+            number = next(remaining, None)
+            if number is None:
+                return
+            in_flight[asyncio.ensure_future(fetch(page=number, page_size=page_size))] = number
+
+    try:
+        if ordered:
+            # Sliding window: never run more than ``concurrency`` pages ahead of the
+            # next page to deliver, so the reorder buffer stays bounded.
+            window: Deque["asyncio.Future[Any]"] = deque()
+            top_up()
+            window.extend(in_flight)
+            while window:
+                task = window.popleft()
+                result = await task
+                del in_flight[task]
+                before = set(in_flight)
+                top_up()
+                window.extend(t for t in in_flight if t not in before)
+                yield result
+        else:
+            top_up()
+            while in_flight:
+                done, _ = await asyncio.wait(list(in_flight), return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=in_flight.__getitem__):
+                    del in_flight[task]
+                    result = task.result()
+                    top_up()
+                    yield result
+    finally:
+        await _drain(deque(in_flight))
+
+
+async def iter_pages(
+    fetch: PageFetcher,
+    *,
+    page: int = 1,
+    page_size: int = 100,
+    prefetch: int = 1,
+    max_pages: Optional[int] = None,
+    concurrency: int = 1,
+    ordered: bool = True,
+) -> AsyncIterator[Any]:
+    """
+    Yield successive pages, fetching up to ``prefetch`` pages ahead in the background.
+
+    While the caller processes page N, page N+1 (and further, up to ``prefetch``) is
+    already in flight. Iteration stops on an empty page, once the advertised ``total``
+    is reached, or on a short page when the response carries no total. Page counts and
+    short pages are judged against the page size the server served (echoed
+    ``page_size`` or the first page's length), since servers may cap the requested size.
+
+    With ``concurrency`` > 1 the first page is fetched alone; once it reports a total,
+    the remaining pages are independent and are fetched ``concurrency`` at a time.
+    ``ordered=True`` delivers them in page order, ``ordered=False`` as they complete.
+    When the total is unknown, pages are read ahead ``concurrency`` deep instead.
+
+    :param fetch: Coroutine function called as ``fetch(page=..., page_size=...)``.
+    :param page: First page to fetch (1-based).
+    :param page_size: Requested page size.
+    :param prefetch: Number of pages to keep in flight ahead of the consumer (0 disables).
+    :param max_pages: Stop after this many pages.
+    :param concurrency: Maximum number of page requests in flight at once.
+    :param ordered: Deliver fanned-out pages in page order rather than completion order.
+    """
+    last_page = page + max_pages - 1 if max_pages is not None else None
+    if concurrency <= 1:
+        sequential = _iter_sequential(fetch, page, page_size, prefetch, last_page)
+        try:
+            async for result in sequential:
+                yield result
+        finally:
+            await sequential.aclose()
+        return
+
+    first = await fetch(page=page, page_size=page_size)
+    yield first
+    if _is_last_page(first, page, None, last_page):
+        return
+
+    count = page_count(first)
+    if count is None:
+        rest = _iter_sequential(fetch, page + 1, page_size, concurrency, last_page, served_page_size(first))
+    else:
+        if last_page is not None:
+            count = min(count, last_page)
+        rest = _iter_fan_out(fetch, range(page + 1, count + 1), page_size, concurrency, ordered)
+    try:
+        async for result in rest:
+            yield result
+    finally:
+        await rest.aclose()
+
+
+async def iter_items(
+    fetch: PageFetcher,
+    *,
+    page: int = 1,
+    page_size: int = 100,
+    prefetch: int = 1,
+    max_pages: Optional[int] = None,
+    concurrency: int = 1,
+    ordered: bool = True,
+    convert: Optional[Callable[[Any], Any]] = None,
+) -> AsyncIterator[Any]:
+    """
+    Yield the individual items of every page produced by :func:`iter_pages`.
+
+    :param convert: Optional callable applied to each item (e.g. a record constructor).
+    """
+    pages = iter_pages(
+        fetch,
+        page=page,
+        page_size=page_size,
+        prefetch=prefetch,
+        max_pages=max_pages,
+        concurrency=concurrency,
+        ordered=ordered,
+    )
+    try:
+        async for result in pages:
+            for item in page_items(result):
+                yield item if convert is None else convert(item)
+    finally:
+        await pages.aclose()
+
+
+__all__ = ["PageFetcher", "iter_items", "iter_pages", "page_count", "page_items", "served_page_size"]
@@ -0,0 +1,187 @@
+"""Bulk k-anonymity password checks on top of the password range endpoint."""
+
+import asyncio
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence
+
+from ._concurrency import map_unordered
+from .errors import PasswordRangeTruncatedError
+from .pagination import page_items
+
+if TYPE_CHECKING:
+    from .client import LeakRadarClient
+
+PREFIX_LENGTH = 5
+
+
+def sha1_hex(password: str) -> str:
+    """Upper-case SHA-1 hex digest of a UTF-8 password."""
+    return hashlib.sha1(password.encode("utf-8")).hexdigest().upper()
+
+
+def _sha1_batch(passwords: Sequence[str]) -> List[str]:
+    # Module-level so it can be pickled into a ProcessPoolExecutor.
+    return [sha1_hex(p) for p in passwords]
+
+
+async def hash_passwords(
+    passwords: Sequence[str],
+    executor: Optional[Executor] = None,
+    chunk_size: int = 10_000,
+) -> List[str]:
+    """
+    SHA-1 hash a batch of passwords without stalling the event loop.
+
+    With an executor (e.g. a ProcessPoolExecutor) chunks are hashed in parallel workers;
+    otherwise they are hashed inline, yielding to the loop between chunks.
+    """
+    chunks = [passwords[i:i + chunk_size] for i in range(0, len(passwords), chunk_size)]
+    if executor is None:
+        hashed: List[str] = []
+        for chunk in chunks:
+            hashed.extend(_sha1_batch(chunk))
+            await asyncio.sleep(0)
+        return hashed
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(*(loop.run_in_executor(executor, _sha1_batch, chunk) for chunk in chunks))
+    return [h for chunk in results for h in chunk]
+
+
+def _parse_range(prefix: str, response: Any) -> Dict[str, int]:
+    """
+    Map each hash suffix of a range response to its count.
+
+    The endpoint answers ``{"items": [{"hash": ..., "count": ...}], "total": ...}``;
+    ``hash`` is the 35-character suffix with ``suffix_only`` and the full digest without.
+    """
+    suffixes: Dict[str, int] = {}
+    for entry in page_items(response):
+        value = str(entry.get("hash") or "").upper()
+        if len(value) == 40:
+            if not value.startswith(prefix):
+                continue
+            value = value[PREFIX_LENGTH:]
+        if value:
+            suffixes[value] = int(entry.get("count") or 1)
+    return suffixes
+
+
+def _range_total(response: Any, returned: int, limit: int) -> Optional[int]:
+    """
+    Number of hashes the prefix has when ``response`` is truncated, else None.
+
+    Without a ``total``, a response filling ``limit`` is assumed truncated.
+    """
+    total = response.get("total") if isinstance(response, dict) else None
+    if isinstance(total, int):
+        return total if total > returned else None
+    return limit + 1 if returned >= limit else None
+
+
+class PasswordChecker:
+    """
+    Check large batches of passwords against LeakRadar with k-anonymity.
+
+    Hashes are grouped by their 5-character SHA-1 prefix so every prefix is queried
+    once, range calls run concurrently, and matching is a local dictionary lookup.
+    Suffix sets are cached per prefix (LRU), so reusing one checker across batches
+    avoids repeating range calls.
+
+    :param client: LeakRadarClient used for password_range calls.
+    :param concurrency: Maximum range calls in flight.
+    :param limit: ``limit`` passed to password_range (server-capped); ranges longer than
+        this are re-requested with the advertised total.
+    :param executor: Optional executor (e.g. ProcessPoolExecutor) for hashing large batches.
+    :param max_cached_prefixes: Number of prefix suffix sets kept in memory.
+    """
+
+    def __init__(
+        self,
+        client: "LeakRadarClient",
+        concurrency: int = 8,
+        limit: int = 1000,
+        executor: Optional[Executor] = None,
+        max_cached_prefixes: int = 100_000,
+    ):
+        self.client = client
+        self.concurrency = concurrency
+        self.limit = limit
+        self.executor = executor
+        self.max_cached_prefixes = max_cached_prefixes
+        self._ranges: "OrderedDict[str, Dict[str, int]]" = OrderedDict()
+
+    async def _fetch_range(self, prefix: str) -> Dict[str, int]:
+        """
+        Fetch every suffix of ``prefix``. A truncated response is re-requested once with
+        ``limit`` raised to the advertised total; if that is still short (server cap),
+        PasswordRangeTruncatedError is raised rather than reporting missing hashes as 0.
+        """
+        limit = self.limit
+        response = await self.client.password_range(prefix, limit=limit, suffix_only=True)
+        returned = len(page_items(response))
+        total = _range_total(response, returned, limit)
+        if total is not None and total > limit:
+            limit = total
+            response = await self.client.password_range(prefix, limit=limit, suffix_only=True)
+            returned = len(page_items(response))
+            total = _range_total(response, returned, limit)
+        if total is not None:
+            raise PasswordRangeTruncatedError(
+                200, f"Password range {prefix} truncated: {returned} of {total} hashes returned.", prefix=prefix
+            )
+        return _parse_range(prefix, response)
+
+    def _remember(self, prefix: str, suffixes: Dict[str, int]) -> None:
+        self._ranges[prefix] = suffixes
+        self._ranges.move_to_end(prefix)
+        while len(self._ranges) > self.max_cached_prefixes:
+            self._ranges.popitem(last=False)
+
+    async def check_hashes(self, sha1_hashes: Iterable[str]) -> Dict[str, int]:
+        """
+        Look up SHA-1 hex digests.
+
+        :return: Mapping of each (upper-cased) hash to its leak count; 0 means not found.
+        """
+        by_prefix: Dict[str, List[str]] = {}
+        for digest in sha1_hashes:
+            digest = digest.strip().upper()
+            if len(digest) != 40:
+                raise ValueError(f"Not a SHA-1 hex digest: {digest!r}")
+            by_prefix.setdefault(digest[:PREFIX_LENGTH], []).append(digest)
+
+        ranges: Dict[str, Dict[str, int]] = {}
+        missing = []
+        for prefix in by_prefix:
+            cached = self._ranges.get(prefix)
+            if cached is None:
+                missing.append(prefix)
+            else:
+                self._ranges.move_to_end(prefix)
+                ranges[prefix] = cached
+
+        async for prefix, suffixes in map_unordered(self._fetch_range, missing, self.concurrency):
+            self._remember(prefix, suffixes)
+            ranges[prefix] = suffixes
+
+        results: Dict[str, int] = {}
+        for prefix, digests in by_prefix.items():
+            suffixes = ranges[prefix]
+            for digest in digests:
+                results[digest] = suffixes.get(digest[PREFIX_LENGTH:], 0)
+        return results
+
+    async def check(self, passwords: Sequence[str]) -> Dict[str, int]:
+        """
+        Hash and look up plaintext passwords.
+
+        :return: Mapping of each password to its leak count; 0 means not found.
+        """
+        digests = await hash_passwords(passwords, executor=self.executor)
+        counts = await self.check_hashes(digests)
+        return {password: counts[digest] for password, digest in zip(passwords, digests)}
+
+
+__all__ = ["PasswordChecker", "hash_passwords", "sha1_hex"]
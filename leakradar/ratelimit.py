@@ -0,0 +1,218 @@
+"""Client-side token-bucket rate limiting for LeakRadar API calls."""
+
+import asyncio
+import email.utils
+import fnmatch
+import time
+from typing import Dict, Mapping, Optional, Tuple, Union
+
+RateSpec = Union[float, Tuple[float, float]]
+"""Either ``rate`` (requests per second) or ``(rate, burst)``."""
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Parse a ``Retry-After`` header (delta seconds or HTTP date) into seconds to wait."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        parsed = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if parsed is None:
+        return None
+    return max(0.0, parsed.timestamp() - (time.time() if now is None else now))
+
+
+def _parse_reset(value: Optional[str]) -> Optional[float]:
+    """Parse a rate-limit reset header, accepting delta seconds or an epoch timestamp."""
+    if not value:
+        return None
+    try:
+        reset = float(value.strip())
+    except ValueError:
+        return None
+    now = time.time()
+    # Values far larger than any sane window are absolute epoch timestamps.
+    if reset > 10 ** 9:
+        reset -= now
+    return max(0.0, reset)
+
+
+def _header(headers: Mapping[str, str], *names: str) -> Optional[str]:
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            return value
+    return None
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at ``rate`` tokens per second, holding at most ``burst``.
+
+    ``acquire`` waits (in FIFO order) until a token is available or a pause set by
+    ``pause`` has elapsed.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst is not None and burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.rate = float(rate)
+        self.burst = float(burst) if burst is not None else max(1.0, self.rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        """Tokens currently available."""
+        self._refill(time.monotonic())
+        return self._tokens
+
+    def set_rate(self, rate: float) -> None:
+        """Change the refill rate, keeping the tokens accrued so far."""
+        self._refill(time.monotonic())
+        self.rate = max(float(rate), 1e-6)
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for the next ``seconds`` seconds and drop the current balance."""
+        now = time.monotonic()
+        self._refill(now)
+        self._tokens = 0.0
+        self._paused_until = max(self._paused_until, now + seconds)
+
+    def limit_tokens(self, tokens: float) -> None:
+        """Cap the current balance, e.g. to a server-reported remaining quota."""
+        self._refill(time.monotonic())
+        self._tokens = min(self._tokens, max(0.0, tokens))
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """Take ``tokens`` from the bucket, waiting as needed. Returns the seconds waited."""
+        if tokens > self.burst:
+            raise ValueError(f"cannot acquire {tokens} tokens from a bucket holding at most {self.burst}")
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                elif self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                else:
+                    delay = (tokens - self._tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+
+class RateLimiter:
+    """
+    Per-endpoint-group token buckets that adapt to the server's rate-limit signals.
+
+    Endpoints are mapped to groups by the first matching glob pattern in ``groups``
+    (e.g. ``{"/search/*": 5.0, "/raw/*": (1.0, 2.0)}``); everything else shares the
+    default bucket. On a 429 the group's rate is multiplied by ``backoff_factor`` and
+    the bucket pauses for ``Retry-After`` (or the rate-limit reset header); each
+    successful response then restores ``recovery`` of the configured rate.
+
+    :param rate: Default requests per second.
+    :param burst: Default bucket capacity (defaults to ``max(1, rate)``).
+    :param groups: Mapping of endpoint glob pattern to ``rate`` or ``(rate, burst)``.
+    :param backoff_factor: Multiplier applied to a group's rate on each 429.
+    :param min_rate: Floor for the adaptive rate.
+    :param recovery: Fraction of the configured rate restored per successful response.
+    """
+
+    DEFAULT_GROUP = "default"
+
+    def __init__(
+        self,
+        rate: float = 5.0,
+        burst: Optional[float] = None,
+        groups: Optional[Mapping[str, RateSpec]] = None,
+        backoff_factor: float = 0.5,
+        min_rate: float = 0.1,
+        recovery: float = 0.05,
+    ):
+        self.backoff_factor = backoff_factor
+        self.min_rate = min_rate
+        self.recovery = recovery
+        self._patterns = list((groups or {}).keys())
+        self._configured: Dict[str, float] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._add_group(self.DEFAULT_GROUP, (rate, burst) if burst is not None else rate)
+        for pattern, spec in (groups or {}).items():
+            self._add_group(pattern, spec)
+
+    def _add_group(self, name: str, spec: RateSpec) -> None:
+        if isinstance(spec, tuple):
+            rate, burst = spec
+        else:
+            rate, burst = spec, None
+        self._configured[name] = float(rate)
+        self._buckets[name] = TokenBucket(rate, burst)
+
+    def group_for(self, endpoint: str) -> str:
+        """Return the group name (its pattern) an endpoint is budgeted under."""
+        path = endpoint.split("?", 1)[0]
+        for pattern in self._patterns:
+            if fnmatch.fnmatchcase(path, pattern):
+                return pattern
+        return self.DEFAULT_GROUP
+
+    def bucket(self, endpoint: str) -> TokenBucket:
+        """Return the bucket an endpoint draws from."""
+        return self._buckets[self.group_for(endpoint)]
+
+    async def acquire(self, endpoint: str) -> float:
+        """Wait for a request slot for ``endpoint``. Returns the seconds waited."""
+        return await self.bucket(endpoint).acquire()
+
+    def observe(self, endpoint: str, status_code: int, headers: Mapping[str, str]) -> None:
+        """Feed a response's status and rate-limit headers back into the endpoint's bucket."""
+        group = self.group_for(endpoint)
+        bucket = self._buckets[group]
+        configured = self._configured[group]
+
+        retry_after = parse_retry_after(_header(headers, "retry-after"))
+        remaining = _header(headers, "x-ratelimit-remaining", "ratelimit-remaining")
+        reset = _parse_reset(_header(headers, "x-ratelimit-reset", "ratelimit-reset"))
+
+        if status_code == 429:
+            bucket.set_rate(max(self.min_rate, bucket.rate * self.backoff_factor))
+            wait = retry_after if retry_after is not None else reset
+            bucket.pause(wait if wait is not None else 1.0 / bucket.rate)
+            return
+
+        if bucket.rate < configured:
+            bucket.set_rate(min(configured, bucket.rate + configured * self.recovery))
+
+        if remaining is not None:
+            try:
+                left = float(remaining)
+            except ValueError:
+                return
+            if left <= 0 and reset is not None:
+                bucket.pause(reset)
+            else:
+                bucket.limit_tokens(left)
+
+
+__all__ = ["RateLimiter", "TokenBucket", "parse_retry_after"]
@@ -0,0 +1,92 @@
+"""Opt-in retry policy with full-jitter exponential backoff."""
+
+import random
+from typing import Iterable, Mapping, Optional
+
+import httpx
+
+from ._routes import is_read_only
+from .ratelimit import parse_retry_after
+
+# Failures where the request never reached the server: safe to replay for any method.
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+# Failures after the request may have been processed: replay only idempotent requests.
+_IN_FLIGHT_ERRORS = (httpx.ReadTimeout, httpx.ReadError, httpx.WriteTimeout, httpx.RemoteProtocolError)
+
+
+class RetryPolicy:
+    """
+    Decide whether and when a failed API call is retried.
+
+    Idempotent requests (GET/HEAD/OPTIONS/PUT/DELETE and read-only POST searches) are
+    retried on ``retry_statuses`` and on connect/read timeouts. Other requests are only
+    retried when the server cannot have acted on them: 429 responses and connection
+    failures. Delays use full jitter (``uniform(0, min(backoff_max, backoff_base * 2**n))``)
+    unless the server sends ``Retry-After``.
+
+    :param max_retries: Maximum retries per call (attempts = max_retries + 1).
+    :param backoff_base: Base delay in seconds for the first retry.
+    :param backoff_max: Upper bound for a single backoff delay.
+    :param retry_statuses: HTTP statuses considered transient.
+    :param idempotent_methods: Methods replayed on any transient failure.
+    :param respect_retry_after: Wait for ``Retry-After`` when the server provides it.
+    :param max_retry_after: Give up instead of waiting longer than this for ``Retry-After``.
+    :param budget: Total seconds a single call may spend sleeping between retries.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        retry_statuses: Iterable[int] = (429, 502, 503, 504),
+        idempotent_methods: Iterable[str] = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE"),
+        respect_retry_after: bool = True,
+        max_retry_after: float = 120.0,
+        budget: Optional[float] = 60.0,
+    ):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = frozenset(retry_statuses)
+        self.idempotent_methods = frozenset(m.upper() for m in idempotent_methods)
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+        self.budget = budget
+
+    def is_idempotent(self, method: str, endpoint: str) -> bool:
+        """Return True when replaying the request cannot duplicate a side effect."""
+        return method.upper() in self.idempotent_methods or is_read_only(method, endpoint)
+
+    def should_retry_status(self, method: str, endpoint: str, status_code: int, attempt: int) -> bool:
+        """Return True if a response with ``status_code`` on retry ``attempt`` (0-based) should be retried."""
+        if attempt >= self.max_retries or status_code not in self.retry_statuses:
+            return False
+        return status_code == 429 or self.is_idempotent(method, endpoint)
+
+    def should_retry_exception(self, method: str, endpoint: str, exc: Exception, attempt: int) -> bool:
+        """Return True if a transport error on retry ``attempt`` (0-based) should be retried."""
+        if attempt >= self.max_retries:
+            return False
+        if isinstance(exc, _NOT_SENT_ERRORS):
+            return True
+        return isinstance(exc, _IN_FLIGHT_ERRORS) and self.is_idempotent(method, endpoint)
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter backoff delay before retry ``attempt`` (0-based)."""
+        return random.uniform(0.0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def delay(self, attempt: int, headers: Optional[Mapping[str, str]] = None) -> Optional[float]:
+        """
+        Seconds to wait before retry ``attempt``, or None to give up.
+
+        Honours ``Retry-After`` when present and allowed; gives up when it exceeds ``max_retry_after``.
+        """
+        if headers is not None and self.respect_retry_after:
+            retry_after = parse_retry_after(headers.get("retry-after"))
+            if retry_after is not None:
+                return retry_after if retry_after <= self.max_retry_after else None
+        return self.backoff(attempt)
+
+
+__all__ = ["RetryPolicy"]
@@ -0,0 +1,291 @@
+"""Incremental sync of notification runs and their leaks, resumable from a checkpoint file."""
+
+import asyncio
+import functools
+import inspect
+import json
+import os
+import tempfile
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from ._concurrency import map_unordered
+from .pagination import page_count, page_items, served_page_size
+
+if TYPE_CHECKING:
+    from .client import LeakRadarClient
+
+RunSink = Callable[[int, List[Any]], Any]
+
+# Run statuses meaning more leaks may still be added to the run.
+_OPEN_STATUSES = frozenset({"pending", "queued", "running", "in_progress", "processing"})
+
+
+async def _in_thread(func: Callable[..., Any], *args: Any) -> Any:
+    return await asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args))
+
+
+def write_json_atomic(path: str, data: Any) -> None:
+    """Write ``data`` as JSON to ``path`` through a temporary file and ``os.replace``."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(data, fh, separators=(",", ":"))
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class RunCheckpoint:
+    """
+    Sync state of NotificationRunSync, persisted as one JSON file.
+
+    ``last_run_id`` is the highest run ID discovered so far. ``runs`` holds the runs
+    not fully ingested yet, as ``{run_id: {"page": next page, "seen": items of that page
+    already delivered, "size": page size served, once known}}``; a run leaves it once
+    its last page has been delivered. The file is rewritten atomically after every
+    delivered page.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.last_run_id: Optional[int] = None
+        self.runs: Dict[int, Dict[str, int]] = {}
+        self.load()
+
+    def load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as fh:
+                data = json.load(fh)
+        except FileNotFoundError:
+            return
+        self.last_run_id = data.get("last_run_id")
+        self.runs = {int(run_id): progress for run_id, progress in (data.get("runs") or {}).items()}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """The JSON document :meth:`save` writes, detached from the live state."""
+        return {"last_run_id": self.last_run_id, "runs": {str(run_id): dict(progress) for run_id, progress in self.runs.items()}}
+
+    def save(self) -> None:
+        write_json_atomic(self.path, self.snapshot())
+
+
+class RunSyncReport:
+    """Outcome of one NotificationRunSync poll."""
+
+    __slots__ = ("new_runs", "runs_synced", "leaks", "requests", "errors")
+
+    def __init__(self):
+        self.new_runs = 0
+        self.runs_synced = 0
+        self.leaks = 0
+        self.requests = 0
+        self.errors: Dict[int, BaseException] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"<RunSyncReport new_runs={self.new_runs} runs_synced={self.runs_synced} leaks={self.leaks} "
+            f"requests={self.requests} errors={len(self.errors)}>"
+        )
+
+
+class NotificationRunSync:
+    """
+    Deliver the leaks of new notification runs, each leak once, across polls and restarts.
+
+    Every :meth:`poll` reads the run listing from page 1 only until it reaches a run
+    at or below the checkpointed ``last_run_id``, then fetches the leak pages of the
+    new runs and of runs left unfinished by earlier polls, ``concurrency`` runs at a
+    time. Each page of leaks goes to ``sink(run_id, leaks)`` (sync or async) and the
+    checkpoint is saved right after, so an interrupted poll resumes at the next
+    undelivered page; at most the page in flight is delivered twice.
+
+    A run whose status is still open (pending/running) keeps its place in the
+    checkpoint after its pages run out, so leaks added to it later are picked up by
+    the next poll. The listing is read past the checkpoint until every unfinished run
+    has been seen, so its status is current; a run missing from the listing counts as
+    open. The run listing is assumed to be ordered newest (highest ID) first. Page
+    ends are judged from the response (``total``, echoed ``page_size``), since the
+    server may serve fewer items per page than requested.
+
+    :param client: LeakRadarClient.
+    :param checkpoint: Path of a RunCheckpoint, or a RunCheckpoint.
+    :param sink: Callback receiving each page of leaks.
+    :param page_size: Leaks per page request.
+    :param concurrency: Runs whose leaks are fetched at once.
+    :param runs_page_size: Runs per listing request.
+    :param backfill: On the first poll (no checkpoint), ingest the existing runs;
+        False only records the newest run ID so that later polls deliver new runs.
+    :param search: Forwarded to notification_run_leaks.
+    :param is_email: Forwarded to notification_run_leaks.
+    """
+
+    def __init__(
+        self,
+        client: "LeakRadarClient",
+        checkpoint: Any,
+        sink: RunSink,
+        page_size: int = 100,
+        concurrency: int = 4,
+        runs_page_size: int = 20,
+        backfill: bool = True,
+        search: Optional[str] = None,
+        is_email: Optional[bool] = None,
+    ):
+        self.client = client
+        self.checkpoint = RunCheckpoint(checkpoint) if isinstance(checkpoint, str) else checkpoint
+        self.sink = sink
+        self.page_size = page_size
+        self.concurrency = concurrency
+        self.runs_page_size = runs_page_size
+        self.backfill = backfill
+        self.search = search
+        self.is_email = is_email
+        self._save_lock: Optional[asyncio.Lock] = None
+
+    async def _save(self) -> None:
+        """
+        Save the checkpoint in the executor (the write fsyncs). The state is snapshotted
+        under a lock on the loop, so a slower, older write never replaces a newer one.
+        """
+        if self._save_lock is None:
+            self._save_lock = asyncio.Lock()
+        async with self._save_lock:
+            await _in_thread(write_json_atomic, self.checkpoint.path, self.checkpoint.snapshot())
+
+    async def _new_runs(self, report: RunSyncReport) -> Tuple[List[int], Dict[int, Any]]:
+        """
+        Return the IDs of runs above the checkpoint, and every run seen while listing (for
+        status). Past the checkpoint, listing goes on until the runs left unfinished by
+        earlier polls have been seen or passed.
+        """
+        last = self.checkpoint.last_run_id
+        unfinished = set(self.checkpoint.runs)
+        new: List[int] = []
+        seen: Dict[int, Any] = {}
+        served: Optional[int] = None
+        page = 1
+        while True:
+            result = await self.client.list_notification_runs(page=page, page_size=self.runs_page_size)
+            report.requests += 1
+            runs = [run for run in page_items(result) if isinstance(run, dict) and run.get("id") is not None]
+            reached = False
+            for run in runs:
+                run_id = int(run["id"])
+                seen[run_id] = run
+                if last is not None and run_id <= last:
+                    reached = True
+                else:
+                    new.append(run_id)
+            if last is None and not self.backfill:
+                reached = True
+            if served is None:
+                served = served_page_size(result)
+            pages = page_count(result, served)
+            if not runs or (pages is not None and page >= pages) or (pages is None and len(runs) < (served or 0)):
+                return new, seen
+            if reached:
+                missing = unfinished.difference(seen)
+                if not missing or min(int(run["id"]) for run in runs) < min(missing):
+                    return new, seen
+            page += 1
+
+    @staticmethod
+    def _is_open(run: Any) -> bool:
+        """True unless the run is known to be closed; a run absent from the listing may still grow."""
+        if not isinstance(run, dict):
+            return True
+        status = run.get("status")
+        return isinstance(status, str) and status.lower() in _OPEN_STATUSES
+
+    def _page_end(self, result: Any, items: List[Any], page: int, progress: Dict[str, int]) -> Tuple[bool, bool]:
+        """
+        Return ``(full, last)`` for a page of run leaks: whether the page holds all the
+        items it ever will, and whether it is the run's last page for now.
+
+        The served page size comes from the echoed ``page_size``, the checkpoint, or a
+        first page shorter than the advertised total; the requested size is the last resort.
+        """
+        size = progress.get("size")
+        echoed = result.get("page_size") if isinstance(result, dict) else None
+        total = result.get("total") if isinstance(result, dict) else None
+        if isinstance(echoed, int) and echoed > 0:
+            size = echoed
+        elif size is None and page == 1 and isinstance(total, int) and total > len(items):
+            size = len(items)
+        if size is not None:
+            progress["size"] = size
+        else:
+            size = self.page_size
+        pages = page_count(result, size)
+        if pages is None:
+            full = len(items) >= size
+            return full, not full
+        last = page >= pages
+        return not last or len(items) >= size, last
+
+    async def _sync_run(self, run_id: int, run: Any, report: RunSyncReport) -> None:
+        checkpoint = self.checkpoint
+        progress = checkpoint.runs[run_id]
+        while True:
+            page = progress["page"]
+            result = await self.client.notification_run_leaks(
+                run_id, page=page, page_size=self.page_size, search=self.search, is_email=self.is_email
+            )
+            report.requests += 1
+            items = page_items(result)
+            fresh = items[progress["seen"]:]
+            if fresh:
+                delivered = self.sink(run_id, fresh)
+                if inspect.isawaitable(delivered):
+                    await delivered
+                report.leaks += len(fresh)
+
+            full, last_page = self._page_end(result, items, page, progress)
+            if full:
+                progress["page"], progress["seen"] = page + 1, 0
+            else:
+                progress["seen"] = len(items)
+            if last_page and not self._is_open(run):
+                del checkpoint.runs[run_id]
+            if fresh or full or run_id not in checkpoint.runs:
+                await self._save()
+            if last_page:
+                return
+
+    async def poll(self) -> RunSyncReport:
+        """Discover new runs and deliver every undelivered leak page. Failed runs are retried next poll."""
+        report = RunSyncReport()
+        checkpoint = self.checkpoint
+        first = checkpoint.last_run_id is None
+        new, seen = await self._new_runs(report)
+        if first and not self.backfill:
+            new = []
+        if new or first:
+            report.new_runs = len(new)
+            for run_id in new:
+                checkpoint.runs.setdefault(run_id, {"page": 1, "seen": 0})
+            highest = max(seen, default=None)
+            if highest is not None:
+                checkpoint.last_run_id = max(highest, checkpoint.last_run_id or highest)
+            await self._save()
+
+        async def sync(run_id: int) -> None:
+            await self._sync_run(run_id, seen.get(run_id), report)
+
+        pending = sorted(checkpoint.runs)
+        async for run_id, outcome in map_unordered(sync, pending, self.concurrency, return_exceptions=True):
+            if isinstance(outcome, BaseException):
+                report.errors[run_id] = outcome
+            else:
+                report.runs_synced += 1
+        return report
+
+
+__all__ = ["NotificationRunSync", "RunCheckpoint", "RunSyncReport", "write_json_atomic"]
@@ -0,0 +1,142 @@
+"""Incremental extraction of list elements from a JSON byte stream."""
+
+import json
+import re
+from typing import Any, Callable, List, Optional, Tuple
+
+_STRUCTURAL = re.compile(rb'["\[\]{},]')
+# Unrolled form of (?:[^"\\]|\\.)*": consumes plain runs in one step instead of per character.
+_STRING_TAIL = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+_WHITESPACE = b" \t\r\n"
+_SEPARATORS = re.compile(r"[ \t\r\n,]*")
+_SPACES = re.compile(r"[ \t\r\n]*")
+_CLOSERS = re.compile(rb'[\]}",]')
+_DECODER = json.JSONDecoder()
+
+
+class JSONItemScanner:
+    """
+    Split a streamed JSON document into the raw bytes of its list elements.
+
+    Elements are taken from the top-level array, or from the array stored under
+    ``key`` when the document is an object (``{"items": [...], "total": ...}``).
+    Only the element currently being received is buffered, so memory stays bounded
+    by the largest element rather than the whole body. Other fields are skipped.
+
+    Element boundaries are found by the C JSON scanner run over a latin-1 view of the
+    buffer (one character per byte, so offsets are byte offsets), not by a Python
+    loop over every token. That parse doubles as the decoded value of ASCII
+    elements, which :meth:`feed_items` returns without decoding them again.
+
+    Feed chunks with :meth:`feed`; each call returns the complete elements found so
+    far as ``bytes`` ready for a JSON decoder.
+    """
+
+    def __init__(self, key: str = "items"):
+        self._key = key.encode("utf-8")
+        self._buf = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._in_array = False
+        self._finished = False
+        self._last_key: Optional[bytes] = None
+        # Buffered bytes after which an incomplete element is retried even if no byte that
+        # could end it has arrived; bounds retries on very large elements.
+        self._need = 0
+
+    @property
+    def finished(self) -> bool:
+        """True once the element array has been closed."""
+        return self._finished
+
+    def _find_array(self) -> bool:
+        """Advance through the document head to the opening bracket of the element array."""
+        buf = self._buf
+        pos = self._pos
+        while True:
+            match = _STRUCTURAL.search(buf, pos)
+            if match is None:
+                self._pos = len(buf)
+                return False
+            pos = match.start()
+            char = buf[pos]
+            if char == 0x22:  # "
+                tail = _STRING_TAIL.match(buf, pos + 1)
+                if tail is None:
+                    self._pos = pos  # string continues in the next chunk
+                    return False
+                if self._depth == 1:
+                    self._last_key = bytes(buf[pos + 1:tail.end() - 1])
+                pos = tail.end()
+                continue
+            if char == 0x5B and (self._depth == 0 or (self._depth == 1 and self._last_key == self._key)):
+                self._pos = pos + 1
+                self._in_array = True
+                return True
+            if char in (0x5B, 0x7B):  # [ {
+                self._depth += 1
+            elif char in (0x5D, 0x7D):  # ] }
+                self._depth -= 1
+            pos += 1
+
+    def _scan(self, chunk: bytes) -> List[Tuple[bytes, Any]]:
+        """Consume ``chunk``; return ``(raw bytes, latin-1 decoded value)`` per completed element."""
+        out: List[Tuple[bytes, Any]] = []
+        if self._finished:
+            return out
+        buf = self._buf
+        buf += chunk
+        if not self._in_array and not self._find_array():
+            if self._pos:
+                del buf[:self._pos]
+                self._pos = 0
+            return out
+
+        text = buf.decode("latin-1")
+        size = len(text)
+        pos = self._pos
+        if self._need and size - pos < self._need and _CLOSERS.search(chunk) is None:
+            return out
+        while True:
+            pos = _SEPARATORS.match(text, pos).end()
+            if pos >= size:
+                break
+            if text[pos] == "]":
+                self._finished = True
+                pos += 1
+                break
+            try:
+                value, end = _DECODER.raw_decode(text, pos)
+            except ValueError:
+                # Incomplete element: retry once twice as many bytes are buffered.
+                self._need = 2 * (size - pos)
+                break
+            after = _SPACES.match(text, end).end()
+            if after >= size or (after == end and text[after] not in ",]" and text[pos] not in '"[{tfn'):
+                # A number may continue in the next chunk ("2" then ".5"); wait for the separator.
+                self._need = size - pos + 1
+                break
+            if text[after] not in ",]":
+                raise ValueError(f"Malformed JSON list: unexpected {text[after]!r} after an element")
+            out.append((bytes(buf[pos:end]), value))
+            self._need = 0
+            pos = end
+
+        del buf[:pos]
+        self._pos = 0
+        return out
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        """Consume ``chunk`` and return the raw bytes of every element completed by it."""
+        return [raw for raw, _ in self._scan(chunk)]
+
+    def feed_items(self, chunk: bytes, loads: Callable[[bytes], Any]) -> List[Any]:
+        """
+        Consume ``chunk`` and return every element completed by it, decoded.
+
+        ASCII elements reuse the boundary parse; others are decoded from their bytes with ``loads``.
+        """
+        return [value if raw.isascii() else loads(raw) for raw, value in self._scan(chunk)]
+
+
+__all__ = ["JSONItemScanner"]
@@ -0,0 +1,391 @@
+"""Multi-domain report sweeps: cheap locked-exists and light-report checks before full reports."""
+
+import asyncio
+import functools
+import inspect
+import json
+import os
+import re
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, Iterable, List, Optional
+
+from ._concurrency import map_unordered
+from .bulk import chunked, exists_results, normalize_domain, unique
+from .errors import ForbiddenError, PaymentRequiredError, UnauthorizedError
+from .runs import write_json_atomic
+
+if TYPE_CHECKING:
+    from .client import LeakRadarClient
+
+SweepSink = Callable[["SweepResult"], Any]
+
+# Errors no other domain can recover from (credits, auth): the sweep stops.
+_FATAL = (PaymentRequiredError, UnauthorizedError, ForbiddenError)
+_DONE = object()
+# Last path segment of a light-report count field (see report_counts).
+_COUNT_FIELD = re.compile(r"(?:^|_)(?:count|total)$|^(?:employees|customers|third_parties|subdomains|urls|emails|leaks)$")
+
+
+def _signature(value: Any) -> str:
+    """Canonical JSON of a locked-exists result, for equality checks across sweeps."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _has_leaks(value: Any) -> bool:
+    """True when a locked-exists result reports any locked leak (true flag or positive count)."""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return value > 0
+    if isinstance(value, dict):
+        return any(_has_leaks(item) for item in value.values())
+    return False
+
+
+def report_counts(report: Any, prefix: str = "", depth: int = 3) -> Dict[str, float]:
+    """
+    Flatten the count fields of a (light) domain report into ``{"dotted.path": number}``.
+
+    A count field is a numeric value whose key ends in ``count`` or ``total``
+    (``employees_count``, ``employees.count``, ``total``) or names a leak category
+    (``employees``, ``customers``, ``third_parties``, ``subdomains``, ``urls``,
+    ``emails``, ``leaks``, e.g. under ``counts``). Timestamps, scores and other numbers
+    are left out, so they never make a domain look changed.
+    """
+    counts: Dict[str, float] = {}
+    if depth <= 0 or not isinstance(report, dict):
+        return counts
+    for key, value in report.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, bool):
+            continue
+        if isinstance(value, (int, float)):
+            if _COUNT_FIELD.search(str(key)):
+                counts[path] = value
+        elif isinstance(value, dict):
+            counts.update(report_counts(value, path + ".", depth - 1))
+    return counts
+
+
+def counts_match(previous: Any, current: Dict[str, float], tolerance: float = 0.0) -> bool:
+    """
+    True when two :func:`report_counts` results hold the same count fields, each within
+    ``tolerance`` (relative to the larger value). Fields of ``previous`` that are not
+    count fields (snapshots written by older versions) are ignored.
+    """
+    if not isinstance(previous, dict):
+        return False
+    previous = {path: value for path, value in previous.items() if _COUNT_FIELD.search(path.rsplit(".", 1)[-1])}
+    if previous.keys() != current.keys():
+        return False
+    return all(abs(value - previous[path]) <= tolerance * max(abs(value), abs(previous[path])) for path, value in current.items())
+
+
+class SweepSnapshot:
+    """
+    Per-domain state of the previous sweep, persisted as one JSON file.
+
+    Each domain maps to ``{"exists": signature of its locked-exists result, "counts":
+    count fields of its light report (see :func:`report_counts`), "checked_at": epoch}``.
+    The file is rewritten atomically.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.domains: Dict[str, Dict[str, Any]] = {}
+        self.load()
+
+    def load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as fh:
+                self.domains = json.load(fh)
+        except FileNotFoundError:
+            self.domains = {}
+
+    def save(self) -> None:
+        write_json_atomic(self.path, self.domains)
+
+    async def save_async(self) -> None:
+        """:meth:`save` in the default executor; entries are replaced, never mutated, so a shallow copy is enough."""
+        domains = dict(self.domains)
+        await asyncio.get_running_loop().run_in_executor(None, functools.partial(write_json_atomic, self.path, domains))
+
+
+class SweepResult:
+    """
+    Outcome for one domain of a sweep.
+
+    ``stage`` is where the domain stopped: ``"no_leaks"`` (nothing locked, never seen
+    with leaks), ``"unchanged"`` (locked-exists or light counts equal to the snapshot),
+    ``"full"`` (changed; ``report`` holds the full report) or ``"error"``.
+    """
+
+    __slots__ = ("domain", "stage", "exists", "light", "report", "error")
+
+    def __init__(
+        self,
+        domain: str,
+        stage: str,
+        exists: Any = None,
+        light: Any = None,
+        report: Any = None,
+        error: Optional[BaseException] = None,
+    ):
+        self.domain = domain
+        self.stage = stage
+        self.exists = exists
+        self.light = light
+        self.report = report
+        self.error = error
+
+    @property
+    def changed(self) -> bool:
+        return self.stage == "full"
+
+    def __repr__(self) -> str:
+        return f"<SweepResult {self.domain!r} {self.stage}>"
+
+
+class SweepReport:
+    """Counts of a finished sweep, per stage, plus the number of requests of each kind."""
+
+    __slots__ = ("stages", "exists_requests", "light_requests", "full_requests", "elapsed")
+
+    def __init__(self):
+        self.stages: Dict[str, int] = {}
+        self.exists_requests = 0
+        self.light_requests = 0
+        self.full_requests = 0
+        self.elapsed = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"<SweepReport stages={self.stages} requests={self.exists_requests}/{self.light_requests}/"
+            f"{self.full_requests} elapsed={self.elapsed:.1f}s>"
+        )
+
+
+class DomainSweep:
+    """
+    Fetch domain reports for many domains, spending full-report calls only on changes.
+
+    Three stages run as a pipeline, each with its own concurrency bound, connected by
+    bounded queues (a slow stage throttles the ones before it):
+
+    1. ``domains_locked_exists`` with counts, ``chunk_size`` domains per call. A domain
+       whose result equals the snapshot is ``unchanged``; a domain with no locked leaks
+       and no snapshot entry is ``no_leaks``. If a chunk fails, its domains go on to
+       stage 2.
+    2. ``get_domain_report(domain, light=True)``. Light reports are sampled, so only
+       their count fields (:func:`report_counts`) are compared with the snapshot, each
+       within ``tolerance``; a match is ``unchanged``. The snapshot keeps the counts it
+       last recorded as changed, so slow drift adds up until it exceeds the tolerance.
+    3. ``get_domain_report(domain)`` for the rest.
+
+    Results are yielded by :meth:`sweep` (or passed to ``sink`` by :meth:`run`) in
+    completion order. The snapshot entry of a domain is updated once its result has
+    been delivered and the file is saved every ``save_every`` updates and at the end,
+    so an interrupted sweep keeps most of its progress. Payment, auth and permission
+    errors stop the sweep; other failures give an ``error`` result and leave the
+    snapshot entry as it was, so the domain is retried next time.
+
+    :param client: LeakRadarClient.
+    :param snapshot: Path of a SweepSnapshot, a SweepSnapshot, or None to keep no state
+        (every domain with locked leaks then gets a full report).
+    :param chunk_size: Domains per locked-exists call (the endpoint takes at most 100).
+    :param categories: Locked-exists categories (None for all).
+    :param exists_concurrency: Locked-exists calls in flight.
+    :param light_concurrency: Light reports in flight.
+    :param full_concurrency: Full reports in flight.
+    :param save_every: Snapshot updates between saves.
+    :param tolerance: Relative difference allowed between light-report counts and the
+        snapshot before a domain counts as changed.
+    """
+
+    def __init__(
+        self,
+        client: "LeakRadarClient",
+        snapshot: Any = None,
+        chunk_size: int = 100,
+        categories: Optional[List[str]] = None,
+        exists_concurrency: int = 4,
+        light_concurrency: int = 16,
+        full_concurrency: int = 4,
+        save_every: int = 500,
+        tolerance: float = 0.05,
+    ):
+        self.client = client
+        self.snapshot = SweepSnapshot(os.fspath(snapshot)) if isinstance(snapshot, (str, os.PathLike)) else snapshot
+        self.chunk_size = min(chunk_size, 100)
+        self.categories = categories
+        self.exists_concurrency = exists_concurrency
+        self.light_concurrency = light_concurrency
+        self.full_concurrency = full_concurrency
+        self.save_every = save_every
+        self.tolerance = tolerance
+        self.report = SweepReport()
+        self._dirty = 0
+
+    def _previous(self, domain: str) -> Optional[Dict[str, Any]]:
+        return self.snapshot.domains.get(domain) if self.snapshot is not None else None
+
+    async def _remember(self, result: SweepResult) -> None:
+        if self.snapshot is None or result.stage == "error":
+            return
+        entry = dict(self._previous(result.domain) or {})
+        if result.exists is not None:
+            entry["exists"] = _signature(result.exists)
+        if result.light is not None and (result.stage != "unchanged" or "counts" not in entry):
+            entry["counts"] = report_counts(result.light)
+        entry["checked_at"] = time.time()
+        self.snapshot.domains[result.domain] = entry
+        self._dirty += 1
+        if self._dirty >= self.save_every:
+            await self._flush()
+
+    def flush(self) -> None:
+        """Save the snapshot if it has unsaved updates."""
+        if self.snapshot is not None and self._dirty:
+            self.snapshot.save()
+            self._dirty = 0
+
+    async def _flush(self) -> None:
+        # The write fsyncs, so the sweep saves in the executor.
+        if self.snapshot is not None and self._dirty:
+            await self.snapshot.save_async()
+            self._dirty = 0
+
+    async def _exists_stage(self, domains: Iterable[str], light_queue: "asyncio.Queue[Any]", out: "asyncio.Queue[Any]") -> None:
+        report = self.report
+
+        async def check(chunk: List[str]) -> Dict[str, Any]:
+            report.exists_requests += 1
+            response = await self.client.domains_locked_exists(chunk, categories=self.categories, include_counts=True)
+            return exists_results(response, "domain", chunk)
+
+        batches = chunked(unique(domains, normalize_domain), self.chunk_size)
+        async for chunk, outcome in map_unordered(check, batches, self.exists_concurrency, return_exceptions=True):
+            if isinstance(outcome, _FATAL):
+                raise outcome
+            results = outcome if isinstance(outcome, dict) else {}
+            for domain in chunk:
+                exists = results.get(domain)
+                previous = self._previous(domain)
+                if exists is not None and previous is not None and previous.get("exists") == _signature(exists):
+                    await out.put(SweepResult(domain, "unchanged", exists=exists))
+                elif exists is not None and previous is None and not _has_leaks(exists):
+                    await out.put(SweepResult(domain, "no_leaks", exists=exists))
+                else:
+                    await light_queue.put((domain, exists))
+
+    async def _light_worker(self, light_queue: "asyncio.Queue[Any]", full_queue: "asyncio.Queue[Any]", out: "asyncio.Queue[Any]") -> None:
+        while True:
+            job = await light_queue.get()
+            if job is _DONE:
+                return
+            domain, exists = job
+            self.report.light_requests += 1
+            try:
+                light = await self.client.get_domain_report(domain, light=True)
+            except _FATAL as exc:
+                # Raised by the consumer of ``out``, which then tears the pipeline down.
+                await out.put(exc)
+                return
+            except Exception as exc:
+                await out.put(SweepResult(domain, "error", exists=exists, error=exc))
+                continue
+            previous = self._previous(domain)
+            if previous is not None and counts_match(previous.get("counts"), report_counts(light), self.tolerance):
+                await out.put(SweepResult(domain, "unchanged", exists=exists, light=light))
+            else:
+                await full_queue.put((domain, exists, light))
+
+    async def _full_worker(self, full_queue: "asyncio.Queue[Any]", out: "asyncio.Queue[Any]") -> None:
+        while True:
+            job = await full_queue.get()
+            if job is _DONE:
+                return
+            domain, exists, light = job
+            self.report.full_requests += 1
+            try:
+                report = await self.client.get_domain_report(domain)
+            except _FATAL as exc:
+                await out.put(exc)
+                return
+            except Exception as exc:
+                await out.put(SweepResult(domain, "error", exists=exists, light=light, error=exc))
+                continue
+            await out.put(SweepResult(domain, "full", exists=exists, light=light, report=report))
+
+    async def _pipeline(self, domains: Iterable[str], out: "asyncio.Queue[Any]") -> None:
+        light_queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=self.light_concurrency * 2)
+        full_queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=self.full_concurrency * 2)
+        light_workers = [
+            asyncio.ensure_future(self._light_worker(light_queue, full_queue, out)) for _ in range(max(1, self.light_concurrency))
+        ]
+        full_workers = [asyncio.ensure_future(self._full_worker(full_queue, out)) for _ in range(max(1, self.full_concurrency))]
+        try:
+            await self._exists_stage(domains, light_queue, out)
+            for _ in light_workers:
+                await light_queue.put(_DONE)
+            await asyncio.gather(*light_workers)
+            for _ in full_workers:
+                await full_queue.put(_DONE)
+            await asyncio.gather(*full_workers)
+        finally:
+            for task in light_workers + full_workers:
+                task.cancel()
+            await asyncio.gather(*light_workers, *full_workers, return_exceptions=True)
+
+    async def sweep(self, domains: Iterable[str]) -> AsyncIterator[SweepResult]:
+        """
+        Yield one SweepResult per distinct (normalised) domain, in completion order.
+
+        ``domains`` is consumed lazily. The snapshot is updated as results are consumed.
+        """
+        started = time.monotonic()
+        out: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=max(self.light_concurrency, self.full_concurrency) * 4)
+
+        async def produce() -> None:
+            # Not BaseException: on cancellation the consumer is gone, and putting into a full
+            # ``out`` would block the producer (and the consumer's gather) forever.
+            try:
+                await self._pipeline(domains, out)
+            except Exception as exc:
+                await out.put(exc)
+                raise
+            await out.put(_DONE)
+
+        producer = asyncio.ensure_future(produce())
+        try:
+            while True:
+                item = await out.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                stages = self.report.stages
+                stages[item.stage] = stages.get(item.stage, 0) + 1
+                yield item
+                await self._remember(item)
+        finally:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+            await self._flush()
+            self.report.elapsed += time.monotonic() - started
+
+    async def run(self, domains: Iterable[str], sink: Optional[SweepSink] = None) -> SweepReport:
+        """Sweep ``domains``, passing every result to ``sink`` (sync or async), and return the report."""
+        results = self.sweep(domains)
+        try:
+            async for result in results:
+                if sink is not None:
+                    delivered = sink(result)
+                    if inspect.isawaitable(delivered):
+                        await delivered
+        finally:
+            await results.aclose()
+        return self.report
+
+
+__all__ = ["DomainSweep", "SweepReport", "SweepResult", "SweepSnapshot", "counts_match", "report_counts"]
@@ -0,0 +1,121 @@
+"""Synchronous facade running LeakRadarClient on a persistent background event loop."""
+
+import asyncio
+import functools
+import inspect
+import threading
+from typing import Any, Awaitable, Callable, Iterator, TypeVar
+
+from .client import LeakRadarClient
+
+T = TypeVar("T")
+
+
+class LeakRadarSyncClient:
+    """
+    Blocking client for synchronous code (Celery tasks, Django views, scripts).
+
+    One event loop runs in a daemon thread for the lifetime of the object, so the
+    underlying LeakRadarClient keeps its connection pools (and TLS sessions) alive
+    across calls. Every public LeakRadarClient method is mirrored with the same
+    arguments: coroutine methods block until their result is ready, and ``iter_*`` /
+    ``stream_*`` / ``wait_for_tasks`` return ordinary iterators. The object can be
+    shared by many threads at once.
+
+    Constructor arguments are passed to LeakRadarClient.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="leakradar-sync", daemon=True)
+        self._thread.start()
+        self._closed = False
+
+        async def create() -> LeakRadarClient:
+            return LeakRadarClient(*args, **kwargs)
+
+        self._client = self._run(create())
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def _run(self, coro: Awaitable[T]) -> T:
+        """Run a coroutine on the background loop and block for its result."""
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("LeakRadarSyncClient cannot be called from its own event loop thread")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()  # type: ignore[arg-type]
+
+    def _iterate(self, aiterator: Any) -> Iterator[Any]:
+        """Drive an async iterator on the background loop, one item per blocking step."""
+        try:
+            while True:
+                try:
+                    yield self._run(aiterator.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            aclose = getattr(aiterator, "aclose", None)
+            if aclose is not None and not self._loop.is_closed():
+                self._run(aclose())
+
+    @property
+    def async_client(self) -> LeakRadarClient:
+        """The wrapped LeakRadarClient (only use it from coroutines run on this client's loop)."""
+        return self._client
+
+    def __getattr__(self, name: str) -> Any:
+        # Plain attributes (token, cache, rate_limiter, ...) of the wrapped client.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._client, name)
+
+    def close(self) -> None:
+        """Close the HTTP clients and stop the background loop."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._run(self._client.aclose())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+
+    def __enter__(self) -> "LeakRadarSyncClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def _mirror(name: str, method: Callable[..., Any]) -> Callable[..., Any]:
+    if inspect.iscoroutinefunction(method):
+
+        @functools.wraps(method)
+        def call(self: LeakRadarSyncClient, *args: Any, **kwargs: Any) -> Any:
+            return self._run(getattr(self._client, name)(*args, **kwargs))
+
+    else:
+
+        @functools.wraps(method)
+        def call(self: LeakRadarSyncClient, *args: Any, **kwargs: Any) -> Any:
+            result = getattr(self._client, name)(*args, **kwargs)
+            if hasattr(result, "__anext__"):
+                return self._iterate(result)
+            return result
+
+    return call
+
+
+def _install_methods() -> None:
+    for name, member in inspect.getmembers(LeakRadarClient, inspect.isfunction):
+        if name.startswith("_") or name == "aclose" or hasattr(LeakRadarSyncClient, name):
+            continue
+        setattr(LeakRadarSyncClient, name, _mirror(name, member))
+
+
+_install_methods()
+
+
+__all__ = ["LeakRadarSyncClient"]
@@ -0,0 +1,178 @@
+"""Poll many background tasks from one scheduler loop."""
+
+import asyncio
+import heapq
+import inspect
+import itertools
+import random
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+import httpx
+
+from .errors import TooManyRequestsError
+from .ratelimit import TokenBucket
+
+SUCCESS_STATES = frozenset({"success", "succeeded", "completed", "complete", "done", "finished", "ready"})
+FAILURE_STATES = frozenset({"failure", "failed", "error", "revoked", "cancelled", "canceled", "expired"})
+
+TaskRef = Union[str, Mapping[str, Any]]
+"""A task ID, or the dict returned by a ``queue_*`` call (``task_id`` or ``id`` key)."""
+
+CompletionCallback = Callable[[str, Dict[str, Any]], Any]
+
+
+def task_id_of(task: TaskRef) -> str:
+    """Extract the task ID from an ID or a queue_* response."""
+    if isinstance(task, Mapping):
+        for key in ("task_id", "id"):
+            if task.get(key) is not None:
+                return str(task[key])
+        raise ValueError(f"No task_id in {task!r}")
+    return str(task)
+
+
+def task_state(status: Any) -> str:
+    """Lower-cased state of a task status payload ("" when unknown)."""
+    if not isinstance(status, Mapping):
+        return ""
+    return str(status.get("status") or status.get("state") or "").lower()
+
+
+def is_finished(status: Any) -> bool:
+    """True when a task status payload is in a terminal (success or failure) state."""
+    state = task_state(status)
+    return state in SUCCESS_STATES or state in FAILURE_STATES
+
+
+class TaskTimeoutError(asyncio.TimeoutError):
+    """Raised when tasks are still running at the waiter's deadline."""
+
+    def __init__(self, pending: List[str]):
+        self.pending = pending
+        super().__init__(f"{len(pending)} task(s) still pending at deadline")
+
+
+class TaskWaiter:
+    """
+    Wait for many background tasks with a single scheduler loop.
+
+    Each task is polled on its own schedule, starting at ``initial_interval`` and
+    growing by ``backoff`` (with jitter) up to ``max_interval`` while it is still
+    running. All polls share one token bucket capped at ``max_polls_per_second``, and
+    at most ``concurrency`` polls are in flight. Rate-limit and transport errors just
+    push the task's next poll back; other errors propagate.
+
+    :param poll: Coroutine function returning the status payload of a task ID.
+    :param timeout: Overall deadline in seconds (None waits forever).
+    """
+
+    def __init__(
+        self,
+        poll: Callable[[str], Awaitable[Dict[str, Any]]],
+        initial_interval: float = 1.0,
+        max_interval: float = 30.0,
+        backoff: float = 1.5,
+        max_polls_per_second: float = 5.0,
+        concurrency: int = 8,
+        timeout: Optional[float] = None,
+    ):
+        self.poll = poll
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self._bucket = TokenBucket(max_polls_per_second, burst=max(1.0, max_polls_per_second))
+
+    async def iter_completed(
+        self,
+        tasks: Iterable[TaskRef],
+        on_complete: Optional[CompletionCallback] = None,
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Yield ``(task_id, final_status)`` for every task, in completion order.
+
+        :param on_complete: Optional callback (sync or async) invoked as ``on_complete(task_id, status)``.
+        :raises TaskTimeoutError: if the deadline passes with tasks still running.
+        """
+        deadline = time.monotonic() + self.timeout if self.timeout is not None else None
+        counter = itertools.count()
+        schedule: List[Tuple[float, int, str, float]] = []
+        now = time.monotonic()
+        for task in dict.fromkeys(task_id_of(t) for t in tasks):
+            heapq.heappush(schedule, (now, next(counter), task, self.initial_interval))
+        in_flight: Dict["asyncio.Future[Dict[str, Any]]", Tuple[str, float]] = {}
+
+        def reschedule(task_id: str, interval: float) -> None:
+            interval = min(self.max_interval, interval * self.backoff)
+            due = time.monotonic() + interval * random.uniform(0.8, 1.2)
+            heapq.heappush(schedule, (due, next(counter), task_id, interval))
+
+        try:
+            while schedule or in_flight:
+                now = time.monotonic()
+                if deadline is not None and now >= deadline:
+                    pending = [entry[2] for entry in schedule] + [task_id for task_id, _ in in_flight.values()]
+                    raise TaskTimeoutError(pending)
+
+                while schedule and schedule[0][0] <= now and len(in_flight) < self.concurrency:
+                    _, _, task_id, interval = heapq.heappop(schedule)
+                    await self._bucket.acquire()
+                    in_flight[asyncio.ensure_future(self.poll(task_id))] = (task_id, interval)
+
+                # While saturated a due schedule head cannot start before a poll finishes,
+                # so only the deadline bounds the wait (a zero timeout would spin).
+                saturated = len(in_flight) >= self.concurrency
+                wait = schedule[0][0] - time.monotonic() if schedule and not saturated else None
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    wait = remaining if wait is None else min(wait, remaining)
+                if wait is not None:
+                    wait = max(0.0, wait)
+                if not in_flight:
+                    await asyncio.sleep(wait or 0)
+                    continue
+
+                done, _ = await asyncio.wait(list(in_flight), timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    task_id, interval = in_flight.pop(future)
+                    try:
+                        status = future.result()
+                    except (TooManyRequestsError, httpx.TransportError):
+                        reschedule(task_id, interval)
+                        continue
+                    if not is_finished(status):
+                        reschedule(task_id, interval)
+                        continue
+                    if on_complete is not None:
+                        result = on_complete(task_id, status)
+                        if inspect.isawaitable(result):
+                            await result
+                    yield task_id, status
+        finally:
+            for future in in_flight:
+                future.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+
+    async def wait(self, task: TaskRef) -> Dict[str, Any]:
+        """Wait for a single task and return its final status."""
+        completed = self.iter_completed([task])
+        try:
+            async for _, status in completed:
+                return status
+        finally:
+            await completed.aclose()
+        raise TaskTimeoutError([task_id_of(task)])
+
+
+__all__ = [
+    "FAILURE_STATES",
+    "SUCCESS_STATES",
+    "TaskTimeoutError",
+    "TaskWaiter",
+    "is_finished",
+    "task_id_of",
+    "task_state",
+]
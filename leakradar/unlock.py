@@ -0,0 +1,376 @@
+"""Bulk unlocking: chunked, concurrent, resumable unlocks of large leak-ID sets."""
+
+import asyncio
+import functools
+import inspect
+import json
+import os
+from typing import TYPE_CHECKING, Any, Callable, Container, Dict, Iterable, List, Optional, Set, Tuple
+
+from ._concurrency import map_unordered
+from .bulk import chunked, unique
+from .errors import (
+    BadRequestError,
+    ConflictError,
+    ForbiddenError,
+    NotFoundError,
+    PaymentRequiredError,
+    UnauthorizedError,
+    ValidationError,
+)
+
+if TYPE_CHECKING:
+    from .client import LeakRadarClient
+
+SYNC_UNLOCK_LIMIT = 10_000
+"""Hard cap of the synchronous unlock endpoints."""
+
+# Errors about the request content: a smaller chunk may succeed, so the chunk is split.
+_SPLITTABLE = (BadRequestError, ValidationError, NotFoundError, ConflictError)
+# Errors no other chunk can recover from (credits, auth): the run stops.
+_FATAL = (PaymentRequiredError, UnauthorizedError, ForbiddenError)
+
+ChunkCallback = Callable[[List[str], Any], Any]
+
+
+async def _in_thread(func: Callable[..., Any], *args: Any) -> Any:
+    return await asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args))
+
+
+class _ChunkAborted(Exception):
+    """A fatal error hit part-way through a bisected chunk, with the outcome of the halves already done."""
+
+    def __init__(self, error: BaseException, ok: List[str], failed: Dict[str, str]):
+        super().__init__(str(error))
+        self.error = error
+        self.ok = ok
+        self.failed = failed
+
+
+class UnlockJournal:
+    """
+    Append-only JSON-lines record of unlock progress, used to resume an interrupted run.
+
+    Each finished chunk appends one line: ``{"ok": [...]}`` or ``{"failed": [...], "error": "..."}``.
+    A truncated last line (crash mid-write) is ignored on load.
+    """
+
+    def __init__(self, path: str, fsync: bool = False):
+        self.path = path
+        self.fsync = fsync
+
+    def load(self) -> Tuple[Set[str], Dict[str, str]]:
+        """Return the IDs already unlocked and the IDs whose last attempt failed (with the error)."""
+        done: Set[str] = set()
+        failed: Dict[str, str] = {}
+        try:
+            fh = open(self.path, encoding="utf-8")
+        except FileNotFoundError:
+            return done, failed
+        with fh:
+            for line in fh:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                for leak_id in entry.get("ok") or ():
+                    done.add(leak_id)
+                    failed.pop(leak_id, None)
+                error = entry.get("error") or ""
+                for leak_id in entry.get("failed") or ():
+                    if leak_id not in done:
+                        failed[leak_id] = error
+        return done, failed
+
+    def record(self, ok: Iterable[str] = (), failed: Iterable[str] = (), error: str = "") -> None:
+        entry: Dict[str, Any] = {}
+        ok, failed = list(ok), list(failed)
+        if ok:
+            entry["ok"] = ok
+        if failed:
+            entry["failed"] = failed
+            entry["error"] = error
+        if not entry:
+            return
+        with open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            if self.fsync:
+                fh.flush()
+                os.fsync(fh.fileno())
+
+
+class UnlockReport:
+    """Outcome of a BulkUnlocker run."""
+
+    __slots__ = ("requested", "skipped", "unlocked", "failed", "chunks", "aborted")
+
+    def __init__(self):
+        self.requested = 0
+        self.skipped = 0
+        self.unlocked = 0
+        self.failed: Dict[str, str] = {}
+        self.chunks = 0
+        self.aborted: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed and self.aborted is None
+
+    def __repr__(self) -> str:
+        return (
+            f"<UnlockReport requested={self.requested} skipped={self.skipped} unlocked={self.unlocked} "
+            f"failed={len(self.failed)} aborted={self.aborted!r}>"
+        )
+
+
+async def unlocked_ids(client: "LeakRadarClient", page_size: int = 1000, concurrency: int = 4) -> Set[str]:
+    """Collect the IDs of every leak already unlocked by the account (for ``BulkUnlocker(skip=...)``)."""
+    ids: Set[str] = set()
+    async for leak in client.iter_unlocked_leaks(page_size=page_size, concurrency=concurrency):
+        leak_id = leak.get("id") if hasattr(leak, "get") else None
+        if leak_id is not None:
+            ids.add(str(leak_id))
+    return ids
+
+
+class BulkUnlocker:
+    """
+    Unlock any number of leak IDs with unlock_specific_leaks.
+
+    IDs are consumed lazily, deduplicated, filtered against ``skip`` and the journal,
+    split into chunks of ``chunk_size`` (at most the 10,000 synchronous cap) and
+    unlocked ``concurrency`` chunks at a time. A chunk rejected as a bad request is
+    split in half until the offending IDs are isolated; other failures (transport
+    errors, 5xx after the client's RetryPolicy) mark the whole chunk as failed.
+    Payment, auth and permission errors stop the run: no new chunk starts, while
+    chunks already in flight finish and are recorded. With a ``journal`` every
+    finished chunk is recorded, so re-running with the same journal resumes where
+    the previous run stopped and retries only failed IDs.
+
+    The filter-based helpers (:meth:`unlock_advanced`, :meth:`unlock_domain`,
+    :meth:`unlock_email`) pick the synchronous endpoint when the match count fits
+    under the cap and otherwise queue an unlock task and wait for it.
+
+    :param client: LeakRadarClient.
+    :param chunk_size: IDs per unlock request.
+    :param concurrency: Unlock requests in flight.
+    :param target_list_id: Unlocked list to file the leaks under.
+    :param skip: IDs known to be unlocked already (any container, e.g. the set from :func:`unlocked_ids`).
+    :param journal: Path of an UnlockJournal, or an UnlockJournal.
+    :param on_chunk: Optional callback (sync or async) called as ``on_chunk(leak_ids, response)``.
+    """
+
+    def __init__(
+        self,
+        client: "LeakRadarClient",
+        chunk_size: int = 1000,
+        concurrency: int = 4,
+        target_list_id: Optional[int] = None,
+        skip: Optional[Container[str]] = None,
+        journal: Optional[Any] = None,
+        on_chunk: Optional[ChunkCallback] = None,
+    ):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self.client = client
+        self.chunk_size = min(chunk_size, SYNC_UNLOCK_LIMIT)
+        self.concurrency = concurrency
+        self.target_list_id = target_list_id
+        self.skip = skip
+        self.journal = UnlockJournal(journal) if isinstance(journal, str) else journal
+        self.on_chunk = on_chunk
+
+    async def _unlock_chunk(self, chunk: List[str]) -> Tuple[List[str], Dict[str, str]]:
+        """
+        Unlock one chunk, bisecting on content errors. Returns (unlocked IDs, failed ID -> error).
+
+        A fatal error inside a bisection raises _ChunkAborted carrying the halves already
+        unlocked or failed, so they are still reported and journaled.
+        """
+        try:
+            response = await self.client.unlock_specific_leaks(chunk, target_list_id=self.target_list_id)
+        except _FATAL:
+            raise
+        except _SPLITTABLE as exc:
+            if len(chunk) == 1:
+                return [], {chunk[0]: str(exc)}
+            middle = len(chunk) // 2
+            ok: List[str] = []
+            failed: Dict[str, str] = {}
+            for part in (chunk[:middle], chunk[middle:]):
+                try:
+                    part_ok, part_failed = await self._unlock_chunk(part)
+                except _FATAL as error:
+                    raise _ChunkAborted(error, ok, failed) from error
+                except _ChunkAborted as aborted:
+                    failed.update(aborted.failed)
+                    raise _ChunkAborted(aborted.error, ok + aborted.ok, failed) from aborted.error
+                ok += part_ok
+                failed.update(part_failed)
+            return ok, failed
+        except Exception as exc:
+            error = str(exc) or type(exc).__name__
+            return [], {leak_id: error for leak_id in chunk}
+
+        if self.on_chunk is not None:
+            result = self.on_chunk(chunk, response)
+            if inspect.isawaitable(result):
+                await result
+        return chunk, {}
+
+    async def run(self, leak_ids: Iterable[str]) -> UnlockReport:
+        """Unlock every ID of ``leak_ids`` (any iterable, consumed lazily) and report the outcome."""
+        report = UnlockReport()
+        done: Set[str] = set()
+        if self.journal is not None:
+            done, _ = await _in_thread(self.journal.load)
+        skip = self.skip
+
+        def pending() -> Iterable[str]:
+            for leak_id in unique(str(value).strip() for value in leak_ids):
+                report.requested += 1
+                if leak_id in done or (skip is not None and leak_id in skip):
+                    report.skipped += 1
+                    continue
+                yield leak_id
+
+        def chunks() -> Iterable[List[str]]:
+            # Checked before each chunk is read, so an aborted run stops taking new IDs.
+            batches = iter(chunked(pending(), self.chunk_size))
+            while report.aborted is None:
+                chunk = next(batches, None)
+                if chunk is None:
+                    return
+                yield chunk
+
+        # Drained rather than left on abort: chunks in flight may have been unlocked (and charged).
+        results = map_unordered(self._unlock_chunk, chunks(), self.concurrency, return_exceptions=True)
+        try:
+            async for _, outcome in results:
+                report.chunks += 1
+                if isinstance(outcome, _ChunkAborted):
+                    await self._record(report, outcome.ok, outcome.failed)
+                    outcome = outcome.error
+                if isinstance(outcome, BaseException):
+                    if report.aborted is None:
+                        report.aborted = outcome
+                    continue
+                await self._record(report, *outcome)
+        finally:
+            await results.aclose()
+        return report
+
+    async def _record(self, report: UnlockReport, ok: List[str], failed: Dict[str, str]) -> None:
+        report.unlocked += len(ok)
+        report.failed.update(failed)
+        if self.journal is not None:
+            # Appends may fsync; keep them off the event loop.
+            await _in_thread(self._journal, ok, failed)
+
+    def _journal(self, ok: List[str], failed: Dict[str, str]) -> None:
+        self.journal.record(ok=ok)
+        by_error: Dict[str, List[str]] = {}
+        for leak_id, error in failed.items():
+            by_error.setdefault(error, []).append(leak_id)
+        for error, ids in by_error.items():
+            self.journal.record(failed=ids, error=error)
+
+    async def _count(self, search: Callable[..., Any], *args: Any, **kwargs: Any) -> Optional[int]:
+        result = await search(*args, page=1, page_size=1, **kwargs)
+        total = result.get("total") if isinstance(result, dict) else None
+        return total if isinstance(total, int) else None
+
+    async def _sync_or_task(
+        self,
+        max_leaks: Optional[int],
+        count: Callable[[], Any],
+        sync: Callable[[Optional[int]], Any],
+        queue: Callable[[], Any],
+        timeout: Optional[float],
+    ) -> Dict[str, Any]:
+        # max_leaks is only a cap: above the sync limit the actual count may still fit under it.
+        expected = max_leaks
+        if expected is None or expected > SYNC_UNLOCK_LIMIT:
+            counted = await count()
+            if counted is not None:
+                expected = counted if expected is None else min(expected, counted)
+        if expected is not None and expected <= SYNC_UNLOCK_LIMIT:
+            leaks = await sync(None if max_leaks is None else min(max_leaks, SYNC_UNLOCK_LIMIT))
+            return {"mode": "sync", "expected": expected, "leaks": leaks}
+        task = await queue()
+        status = await self.client.wait_for_task(task, timeout=timeout)
+        return {"mode": "task", "expected": expected, "task": task, "status": status}
+
+    async def unlock_advanced(
+        self,
+        filters: Dict[str, Any],
+        max_leaks: Optional[int] = None,
+        list_id: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Unlock everything matching advanced filters, synchronously when it fits under the cap.
+
+        Unless ``max_leaks`` fits under the cap, the match count is read from a one-item
+        search first; an unknown count above the cap takes the task path.
+
+        :return: ``{"mode": "sync", "leaks": [...]}`` or ``{"mode": "task", "task": ..., "status": ...}``,
+            both with the ``expected`` count.
+        """
+        client = self.client
+        return await self._sync_or_task(
+            max_leaks,
+            lambda: self._count(client.search_advanced, **filters),
+            lambda limit: client.unlock_all_advanced(filters, max_leaks=limit, list_id=list_id),
+            lambda: client.queue_advanced_unlock_task(filters, max_leaks=max_leaks, list_id=list_id),
+            timeout,
+        )
+
+    async def unlock_domain(
+        self,
+        domain: str,
+        leak_type: str,
+        search: Optional[str] = None,
+        is_email: Optional[bool] = None,
+        max_leaks: Optional[int] = None,
+        list_id: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Domain counterpart of :meth:`unlock_advanced` (``leak_type``: employees, customers or third_parties)."""
+        client = self.client
+        listing = getattr(client, f"get_domain_{leak_type}", None)
+        options = {"search": search, "is_email": is_email}
+        return await self._sync_or_task(
+            max_leaks,
+            lambda: self._count(listing, domain, **options) if listing is not None else _none(),
+            lambda limit: client.unlock_domain_leaks(domain, leak_type, max_leaks=limit, list_id=list_id, **options),
+            lambda: client.queue_domain_unlock_task(domain, leak_type, max_leaks=max_leaks, list_id=list_id, **options),
+            timeout,
+        )
+
+    async def unlock_email(
+        self,
+        email: str,
+        search: Optional[str] = None,
+        is_email: Optional[bool] = None,
+        max_leaks: Optional[int] = None,
+        list_id: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Email counterpart of :meth:`unlock_advanced`."""
+        client = self.client
+        options = {"search": search, "is_email": is_email}
+        return await self._sync_or_task(
+            max_leaks,
+            lambda: self._count(client.search_email, email, **options),
+            lambda limit: client.unlock_email_leaks(email, max_leaks=limit, list_id=list_id, **options),
+            lambda: client.queue_email_unlock_task(email, max_leaks=max_leaks, list_id=list_id, **options),
+            timeout,
+        )
+
+
+async def _none() -> None:
+    return None
+
+
+__all__ = ["SYNC_UNLOCK_LIMIT", "BulkUnlocker", "UnlockJournal", "UnlockReport", "unlocked_ids"]
@@ -0,0 +1,41 @@
+import asyncio
+
+import httpx
+
+from leakradar import LeakRadarClient, UnlockedIndex
+
+
+def leak(i):
+    return {"id": f"L{i}", "username": f"user{i}@corp.com", "url_domain": "site.com", "email_domain": "corp.com"}
+
+
+def capped_handler(rows, cap):
+    """/profile/unlocked serving ``rows`` newest-first, at most ``cap`` per page whatever was asked."""
+
+    def handler(request):
+        if request.url.path != "/profile/unlocked":
+            return httpx.Response(404)
+        page = int(request.url.params["page"])
+        size = min(int(request.url.params["page_size"]), cap)
+        return httpx.Response(200, json={"items": rows[(page - 1) * size:page * size], "total": len(rows)})
+
+    return handler
+
+
+def test_delta_sync_follows_a_page_capping_server(tmp_path):
+    rows = [leak(i) for i in range(50)]
+
+    async def main():
+        client = LeakRadarClient("token", transport=httpx.MockTransport(capped_handler(rows, cap=100)))
+        index = UnlockedIndex(client, str(tmp_path / "index.db"), page_size=1000)
+        first = await index.sync()
+        assert first["mode"] == "full" and len(index) == 50
+        rows[:0] = [leak(i) for i in range(1000, 1300)]
+        second = await index.sync()
+        assert second["mode"] == "delta" and second["fetched"] == 300 and second["pages"] == 4
+        assert len(index) == 350
+        assert [item["id"] for item in await index.search(email="USER1299@corp.com")] == ["L1299"]
+        index.close()
+        await client.aclose()
+
+    asyncio.run(asyncio.wait_for(main(), timeout=10))
@@ -0,0 +1,55 @@
+import asyncio
+import json
+
+import httpx
+
+from leakradar import LeakRadarClient, NotificationRunSync, RunCheckpoint
+
+CAP = 50
+
+
+def make_client(runs, leaks):
+    """Client listing ``runs`` newest-first and serving ``leaks[run_id]``, at most CAP items per page."""
+
+    def handler(request):
+        page = int(request.url.params["page"])
+        size = min(int(request.url.params["page_size"]), CAP)
+        if request.url.path == "/notification_runs":
+            items = sorted(runs, key=lambda run: -run["id"])
+        else:
+            items = leaks[int(request.url.path.split("/")[2])]
+        return httpx.Response(200, json={"items": items[(page - 1) * size:page * size], "total": len(items)})
+
+    return LeakRadarClient("token", transport=httpx.MockTransport(handler))
+
+
+class SinkError(Exception):
+    pass
+
+
+def test_checkpoint_resumes_after_an_interrupted_poll(tmp_path):
+    runs = [{"id": 1, "status": "completed"}, {"id": 2, "status": "completed"}]
+    leaks = {1: [{"id": f"1-{i}"} for i in range(120)], 2: [{"id": f"2-{i}"} for i in range(3)]}
+    path = str(tmp_path / "checkpoint.json")
+    received = []
+    failures = [1]  # the second page of run 1 fails once
+
+    def failing_sink(run_id, page):
+        if run_id in failures and any(leak_id.startswith(f"{run_id}-") for leak_id in received):
+            failures.remove(run_id)
+            raise SinkError(run_id)
+        received.extend(leak["id"] for leak in page)
+
+    async def main():
+        client = make_client(runs, leaks)
+        first = await NotificationRunSync(client, path, failing_sink, page_size=100).poll()
+        assert list(first.errors) == [1] and first.runs_synced == 1
+        assert RunCheckpoint(path).runs == {1: {"page": 2, "seen": 0, "size": CAP}}
+        second = await NotificationRunSync(client, path, failing_sink, page_size=100).poll()
+        assert not second.errors and second.runs_synced == 1
+        await client.aclose()
+
+    asyncio.run(asyncio.wait_for(main(), timeout=10))
+    assert sorted(received) == sorted(leak["id"] for run_leaks in leaks.values() for leak in run_leaks)
+    with open(path, encoding="utf-8") as fh:
+        assert json.load(fh) == {"last_run_id": 2, "runs": {}}
@@ -0,0 +1,88 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from leakradar import LeakRadarClient
+from leakradar.sweep import DomainSweep, SweepSnapshot, counts_match, report_counts
+
+DOMAINS = [f"d{i}.com" for i in range(500)]
+
+
+def make_client(locked):
+    """Client whose locked-exists answers ``locked`` counts and whose reports echo the domain."""
+
+    def handler(request):
+        if request.url.path == "/search/domains/locked-exists":
+            domains = json.loads(request.content)["domains"]
+            return httpx.Response(200, json={"results": {d: {"employees": locked.get(d, 0)} for d in domains}})
+        domain = request.url.path.split("/")[3]
+        if request.url.params.get("light") == "true":
+            return httpx.Response(200, json={"employees_count": locked.get(domain, 0) * 10, "generated_at": 1})
+        return httpx.Response(200, json={"domain": domain})
+
+    return LeakRadarClient("token", transport=httpx.MockTransport(handler))
+
+
+def run(coro):
+    # A hang in the pipeline shows up as a TimeoutError instead of a stuck test run.
+    return asyncio.run(asyncio.wait_for(coro, timeout=10))
+
+
+def test_sweep_stages_and_snapshot(tmp_path):
+    locked = {"d1.com": 3, "d2.com": 4}
+
+    async def main():
+        client = make_client(locked)
+        path = str(tmp_path / "snapshot.json")
+        first = await DomainSweep(client, path).run(DOMAINS)
+        assert first.stages == {"no_leaks": 498, "full": 2}
+        second = await DomainSweep(client, path).run(DOMAINS)
+        assert second.stages == {"unchanged": 500}
+        assert second.light_requests == second.full_requests == 0
+        await client.aclose()
+
+    run(main())
+    assert set(SweepSnapshot(str(tmp_path / "snapshot.json")).domains) == set(DOMAINS)
+
+
+def test_early_break_closes_pipeline():
+    async def main():
+        client = make_client({})
+        sweep = DomainSweep(client, None, light_concurrency=1, full_concurrency=1)
+        results = sweep.sweep(DOMAINS)
+        async for _ in results:
+            await asyncio.sleep(0.05)  # let the producer fill the bounded result queue
+            break
+        await results.aclose()
+        await client.aclose()
+
+    run(main())
+
+
+def test_sink_error_stops_sweep():
+    class SinkError(Exception):
+        pass
+
+    async def sink(result):
+        await asyncio.sleep(0.05)  # let the producer fill the bounded result queue
+        raise SinkError(result.domain)
+
+    async def main():
+        client = make_client({})
+        sweep = DomainSweep(client, None, light_concurrency=1, full_concurrency=1)
+        with pytest.raises(SinkError):
+            await sweep.run(DOMAINS, sink)
+        await client.aclose()
+
+    run(main())
+
+
+def test_report_counts_ignore_timestamps_and_tolerate_sampling():
+    light = {"employees_count": 100, "generated_at": 1700000000, "counts": {"customers": 50}}
+    counts = report_counts(light)
+    assert counts == {"employees_count": 100, "counts.customers": 50}
+    resampled = report_counts(dict(light, employees_count=103, generated_at=1800000000))
+    assert counts_match(counts, resampled, 0.05)
+    assert not counts_match(counts, resampled, 0.0)
@@ -0,0 +1,101 @@
+import asyncio
+import json
+
+import httpx
+
+from leakradar import BulkUnlocker, LeakRadarClient, PaymentRequiredError
+from leakradar.unlock import UnlockJournal
+
+
+def make_client(handler):
+    return LeakRadarClient("token", transport=httpx.MockTransport(handler))
+
+
+def unlock_handler(unlocked, rejected=(), out_of_credits=()):
+    """
+    /unlock answers 400 for a request holding an ID of ``rejected``, 402 for one holding
+    an ID of ``out_of_credits``, and otherwise unlocks (records) every ID.
+    """
+
+    def handler(request):
+        if request.url.path != "/unlock":
+            return httpx.Response(404)
+        ids = json.loads(request.content)["leak_ids"]
+        if any(leak_id in rejected for leak_id in ids):
+            return httpx.Response(400, json={"detail": "invalid id"})
+        if any(leak_id in out_of_credits for leak_id in ids):
+            return httpx.Response(402, json={"detail": "no credits"})
+        unlocked.extend(ids)
+        return httpx.Response(200, json=[{"id": leak_id} for leak_id in ids])
+
+    return handler
+
+
+def test_bisection_isolates_rejected_ids(tmp_path):
+    unlocked = []
+    journal = str(tmp_path / "journal.jsonl")
+
+    async def main():
+        client = make_client(unlock_handler(unlocked, rejected={"x5"}))
+        report = await BulkUnlocker(client, chunk_size=8, journal=journal).run(f"x{i}" for i in range(20))
+        await client.aclose()
+        return report
+
+    report = asyncio.run(main())
+    assert report.unlocked == 19 and list(report.failed) == ["x5"] and report.aborted is None
+    done, failed = UnlockJournal(journal).load()
+    assert done == set(unlocked) and list(failed) == ["x5"]
+
+
+def test_fatal_error_mid_bisection_keeps_finished_halves(tmp_path):
+    unlocked = []
+    journal = str(tmp_path / "journal.jsonl")
+
+    async def main():
+        client = make_client(unlock_handler(unlocked, rejected={"x1"}, out_of_credits={"x2"}))
+        report = await BulkUnlocker(client, chunk_size=4, journal=journal).run(["x0", "x1", "x2", "x3"])
+        await client.aclose()
+        return report
+
+    report = asyncio.run(main())
+    assert unlocked == ["x0"]
+    assert isinstance(report.aborted, PaymentRequiredError)
+    assert report.unlocked == 1 and list(report.failed) == ["x1"]
+    done, failed = UnlockJournal(journal).load()
+    assert done == {"x0"} and list(failed) == ["x1"]
+
+
+def test_resume_skips_journaled_ids(tmp_path):
+    unlocked = []
+    journal = str(tmp_path / "journal.jsonl")
+
+    async def main():
+        client = make_client(unlock_handler(unlocked, out_of_credits={"x7"}))
+        first = await BulkUnlocker(client, chunk_size=5, concurrency=1, journal=journal).run(f"x{i}" for i in range(10))
+        unlocked.clear()
+        client = make_client(unlock_handler(unlocked))
+        second = await BulkUnlocker(client, chunk_size=5, concurrency=1, journal=journal).run(f"x{i}" for i in range(10))
+        await client.aclose()
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert first.unlocked == 5 and first.aborted is not None
+    assert second.skipped == 5 and second.unlocked == 5 and sorted(unlocked) == [f"x{i}" for i in range(5, 10)]
+
+
+def test_large_max_leaks_is_counted_before_choosing_the_task_path():
+    def handler(request):
+        if request.url.path == "/search/advanced":
+            return httpx.Response(200, json={"items": [], "total": 20})
+        if request.url.path == "/search/advanced/unlock":
+            return httpx.Response(200, json=[{"id": "x"}])
+        return httpx.Response(404)
+
+    async def main():
+        client = make_client(handler)
+        result = await BulkUnlocker(client).unlock_advanced({"url_domain": "example.com"}, max_leaks=50_000)
+        await client.aclose()
+        return result
+
+    result = asyncio.run(main())
+    assert result["mode"] == "sync" and result["expected"] == 20